@@ -1,5 +1,48 @@
-from fastapi import APIRouter
+import logging
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from app.api.v1.endpoints import candidates, cv_upload, search
+from app.core.supabase import get_supabase_client
+from app.services.candidate_service import CandidateService
+from app.services.ingestion.job_queue import start_ingestion_workers, stop_ingestion_workers
+from app.services.llm.clients import get_llm_clients
+from app.services.llm.extractor import get_information_extractor
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_llm() -> None:
+    """Build the shared OpenAI clients and extractor at startup instead of on the first upload."""
+    get_llm_clients().warm_up()
+    get_information_extractor()
+
+
+def merge_duplicate_skills() -> None:
+    """Fold skill rows stored under an alias into their canonical row; a failure only delays it to the next start."""
+    try:
+        removed = CandidateService(get_supabase_client()).merge_duplicate_skills()
+        if removed:
+            logger.info(f"Merged {removed} duplicate skill rows")
+    except Exception as e:
+        logger.warning(f"Could not merge duplicate skills: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown of the v1 API's background services; create the app
+    with ``FastAPI(lifespan=lifespan)``. The LLM clients are warmed up, skill
+    rows stored under an alias are merged, and the ingestion workers start
+    right away, so jobs queued before a restart resume without waiting for a
+    request.
+    """
+    await run_in_threadpool(warm_up_llm)
+    await run_in_threadpool(merge_duplicate_skills)
+    await run_in_threadpool(start_ingestion_workers)
+    yield
+    await run_in_threadpool(stop_ingestion_workers, 10.0)
+
 
 api_router = APIRouter()
 
@@ -19,4 +62,4 @@ api_router.include_router(
     search.router,
     prefix="/search",
     tags=["search"]
-) 
\ No newline at end of file
+)
\ No newline at end of file
@@ -1,104 +1,51 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-import os
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
-import io
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Union
 from app.core.config import settings
-# from app.db.session import get_db
-from app.services.cv_processor.processor import CVProcessor
-from app.services.llm.extractor import InformationExtractor
 from app.schemas.candidate import CandidateCreate
-from app.crud import candidate as candidate_crud
-from google.oauth2 import service_account
+from app.schemas.ingestion import BatchUploadReport, IngestionJob, IngestionJobCreated
+from app.services.ingestion.pipeline import process_cv
+from app.services.ingestion.batch import BatchIngestionPipeline
+from app.services.ingestion.job_queue import JOB_QUEUED, get_ingestion_queue, notify_workers
 
 
 router = APIRouter()
 
-SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
-def get_google_drive_service():
-    """Get Google Drive service using a Service Account."""
-    SCOPES = ['https://www.googleapis.com/auth/drive']
-    SERVICE_ACCOUNT_FILE = settings.GOOGLE_DRIVE_CREDENTIALS_FILE
-
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES
-    )
-    return build('drive', 'v3', credentials=credentials)
+async def _read_pdf_upload(file: UploadFile) -> bytes:
+    """Validate an uploaded CV and return its content."""
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are supported"
+        )
+    
+    content = await file.read()
+    if len(content) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail="File size exceeds maximum allowed size"
+        )
+    return content
 
 
 @router.post("/upload", response_model=CandidateCreate)
 async def upload_cv(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    reprocess: bool = Query(False, description="Ingest again even if this CV was uploaded before"),
+    refresh_extraction: bool = Query(False, description="Re-run LLM extraction instead of using cached results")
 ):
     """
     Upload and process a CV file to Google Drive.
     The file will be processed to extract information and create a candidate profile.
+    A CV that was already ingested (same file or same text) returns the existing candidate.
     """
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF files are supported"
-        )
+    content = await _read_pdf_upload(file)
     
     try:
-        # Read file content
-        content = await file.read()
-        if len(content) > settings.MAX_UPLOAD_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail="File size exceeds maximum allowed size"
-            )
-
-        # Upload to Google Drive
-        drive_service = get_google_drive_service()
-        file_metadata = {
-            'name': file.filename,
-            'parents': [settings.GOOGLE_DRIVE_FOLDER_ID]
-        }
-        
-        media = MediaIoBaseUpload(
-            io.BytesIO(content),
-            mimetype='application/pdf',
-            resumable=True
-        )
-        
-        uploaded_file = drive_service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id'
-        ).execute()
-        
-        file_id = uploaded_file.get('id')
-        
-        # Process the CV
-        processor = CVProcessor()
-        cv_text = processor.extract_text(content)
-        
-        # Extract information using LLM
-        extractor = InformationExtractor()
-        candidate_data = extractor.extract_information(cv_text)
-        
-        # Add Google Drive file ID to candidate data
-        candidate_data_dict = candidate_data.model_dump()
-        candidate_data_dict['cv_file_id'] = file_id
-        candidate_data = CandidateCreate(**candidate_data_dict)
-        
-        # Generate embeddings
-        embeddings = extractor.generate_embeddings(candidate_data, cv_text)
-        
-        # Create candidate profile with embeddings
-        candidate = candidate_crud.create_candidate(
-            candidate_data=candidate_data,
-            embeddings=embeddings
-        )
-        
-        return candidate
+        # Drive upload, PDF parsing, LLM extraction and embeddings all block,
+        # so run them off the event loop
+        return await run_in_threadpool(process_cv, content, file.filename, reprocess, refresh_extraction)
         
     except Exception as e:
         raise HTTPException(
@@ -106,31 +53,69 @@ async def upload_cv(
             detail=f"Error processing CV: {str(e)}"
         )
 
-@router.post("/upload/batch", response_model=List[CandidateCreate])
+@router.post("/upload/async", response_model=IngestionJobCreated, status_code=202)
+async def upload_cv_async(
+    file: UploadFile = File(...)
+):
+    """
+    Queue a CV for background ingestion and return immediately.
+    Poll /cv/jobs/{job_id} for the result.
+    """
+    content = await _read_pdf_upload(file)
+    
+    try:
+        queue = get_ingestion_queue()
+        job_id = await run_in_threadpool(queue.enqueue, content, file.filename)
+        notify_workers()
+        return IngestionJobCreated(job_id=job_id, status=JOB_QUEUED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error queueing CV: {str(e)}"
+        )
+
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+def get_ingestion_job(job_id: str):
+    """
+    Get the status of a background ingestion job, with the created candidate once it has succeeded.
+    """
+    job = get_ingestion_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/upload/batch", response_model=Union[List[CandidateCreate], BatchUploadReport])
 async def upload_multiple_cvs(
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    report: bool = Query(False, description="Always return the full report with per-stage throughput")
 ):
     """
     Upload and process multiple CV files in batch.
+    
+    Text extraction, Drive uploads, LLM calls and database writes run as
+    concurrent pipeline stages. Returns the created candidates, or a report with
+    successful_uploads, failed_uploads and stage_stats if any file failed
+    (or if report is set).
     """
-    results = []
-    errors = []
+    batch = []
+    validation_errors = []
     
     for file in files:
         try:
-            result = await upload_cv(file=file)
-            results.append(result)
-        except Exception as e:
-            errors.append({
+            batch.append((file.filename, await _read_pdf_upload(file)))
+        except HTTPException as e:
+            validation_errors.append({
                 "filename": file.filename,
-                "error": str(e)
+                "stage": "validation",
+                "error": e.detail
             })
     
-    if errors:
+    pipeline = BatchIngestionPipeline()
+    outcome = await pipeline.run(batch)
+    outcome["failed_uploads"] = validation_errors + outcome["failed_uploads"]
+    
+    if outcome["failed_uploads"] or report:
         # Return partial results with errors
-        return {
-            "successful_uploads": results,
-            "failed_uploads": errors
-        }
+        return outcome
     
-    return results 
\ No newline at end of file
+    return outcome["successful_uploads"]
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Literal, Optional, Union
 from app.core.supabase import get_supabase_client
-from app.schemas.candidate import CandidateDetail
+from app.schemas.search import CandidateSummary, ScoredCandidateDetail, SemanticSearchPage
 from app.services.search_service import SearchService
+from app.services.embedding_service import agenerate_query_embeddings
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.get("/semantic", response_model=List[CandidateDetail])
-def semantic_search(
+@router.get("/semantic", response_model=Union[List[ScoredCandidateDetail], List[CandidateSummary]])
+async def semantic_search(
     query: str,
     min_experience_years: Optional[int] = Query(None, ge=0, description="Minimum years of experience required"),
     required_skills: Optional[List[str]] = Query(None, description="List of required skills"),
@@ -17,6 +19,10 @@ def semantic_search(
     education_level: Optional[str] = None,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    experience_weight: float = Query(0.5, ge=0, le=1, description="Weight of experience vs. skills similarity"),
+    mode: Literal['semantic', 'hybrid', 'lexical'] = Query('semantic', description="Ranking: embeddings only, embeddings fused with BM25, or BM25 only"),
+    view: Literal['detail', 'summary'] = Query('detail', description="Full candidate records or list-view summaries"),
+    rerank_depth: Optional[int] = Query(None, ge=1, le=10000, description="Shortlist this many candidates by sign-bit distance, then score them exactly"),
     supabase=Depends(get_supabase_client)
 ):
     """
@@ -29,17 +35,43 @@ def semantic_search(
     - **education_level**: Education level filter
     - **limit**: Maximum number of results to return
     - **offset**: Number of results to skip
+    - **experience_weight**: Weight of experience similarity; skills get the remainder
+    - **mode**: `semantic` (default, cosine scores), `hybrid` (fused with keyword BM25, reciprocal-rank scores), or `lexical` (keyword BM25 only, no embedding call)
+    - **view**: `detail` (default) for full records, `summary` for list-view fields only
+    - **rerank_depth**: Two-stage retrieval: a fast binary prefilter keeps this many candidates for exact scoring
     """
     try:
         search_service = SearchService(supabase)
-        results = search_service.semantic_search(
+        # Embed the query without blocking the event loop, then run the Supabase work in a thread.
+        # Lexical searches and searches answered from the result cache need no embedding.
+        query_embeddings = None
+        if mode != 'lexical' and not search_service.is_search_cached(
+            query,
+            min_experience_years=min_experience_years,
+            required_skills=required_skills,
+            location=location,
+            education_level=education_level,
+            limit=limit,
+            offset=offset,
+            experience_weight=experience_weight,
+            mode=mode,
+            rerank_depth=rerank_depth
+        ):
+            query_embeddings = await agenerate_query_embeddings(query)
+        results = await run_in_threadpool(
+            search_service.semantic_search,
             query=query,
             min_experience_years=min_experience_years,
             required_skills=required_skills,
             location=location,
             education_level=education_level,
             limit=limit,
-            offset=offset
+            offset=offset,
+            experience_weight=experience_weight,
+            query_embeddings=query_embeddings,
+            mode=mode,
+            view=view,
+            rerank_depth=rerank_depth
         )
         return results
     except Exception as e:
@@ -49,7 +81,58 @@ def semantic_search(
             detail=f"Search failed: {str(e)}"
         )
 
-@router.get("/filter", response_model=List[CandidateDetail])
+@router.get("/semantic/page", response_model=SemanticSearchPage)
+def semantic_search_page(
+    query: str,
+    min_experience_years: Optional[int] = Query(None, ge=0, description="Minimum years of experience required"),
+    required_skills: Optional[List[str]] = Query(None, description="List of required skills"),
+    location: Optional[str] = None,
+    education_level: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    experience_weight: float = Query(0.5, ge=0, le=1, description="Weight of experience vs. skills similarity"),
+    mode: Literal['semantic', 'hybrid', 'lexical'] = Query('semantic', description="Ranking: embeddings only, embeddings fused with BM25, or BM25 only"),
+    view: Literal['detail', 'summary'] = Query('detail', description="Full candidate records or list-view summaries"),
+    supabase=Depends(get_supabase_client)
+):
+    """
+    Search candidates semantically, ranking the whole filtered pool before paginating.
+    
+    - **query**: Search query text
+    - **min_experience_years**: Minimum years of experience required
+    - **required_skills**: List of required skills
+    - **location**: Location filter
+    - **education_level**: Education level filter
+    - **limit**: Maximum number of results to return
+    - **cursor**: Opaque cursor from the previous page's `next_cursor`; send the same query and filters with it
+    - **experience_weight**: Weight of experience similarity; skills get the remainder
+    - **mode**: `semantic` (default, cosine scores), `hybrid` (fused with keyword BM25, reciprocal-rank scores), or `lexical` (keyword BM25 only, no embedding call)
+    - **view**: `detail` (default) for full records, `summary` for list-view fields only
+    """
+    try:
+        search_service = SearchService(supabase)
+        return search_service.semantic_search_page(
+            query=query,
+            min_experience_years=min_experience_years,
+            required_skills=required_skills,
+            location=location,
+            education_level=education_level,
+            limit=limit,
+            cursor=cursor,
+            experience_weight=experience_weight,
+            mode=mode,
+            view=view
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error performing paginated semantic search: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Search failed: {str(e)}"
+        )
+
+@router.get("/filter", response_model=Union[List[ScoredCandidateDetail], List[CandidateSummary]])
 def filter_candidates(
     min_experience_years: Optional[int] = Query(None, ge=0, description="Minimum years of experience required"),
     required_skills: Optional[List[str]] = Query(None, description="List of required skills"),
@@ -57,6 +140,8 @@ def filter_candidates(
     education_level: Optional[str] = None,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    match_all_skills: bool = Query(False, description="Require every listed skill instead of any of them"),
+    view: Literal['detail', 'summary'] = Query('detail', description="Full candidate records or list-view summaries"),
     supabase=Depends(get_supabase_client)
 ):
     """
@@ -68,6 +153,8 @@ def filter_candidates(
     - **education_level**: Education level filter
     - **limit**: Maximum number of results to return
     - **offset**: Number of results to skip
+    - **match_all_skills**: Require all of the skills rather than any of them
+    - **view**: `detail` (default) for full records, `summary` for list-view fields only
     """
     try:
         search_service = SearchService(supabase)
@@ -77,7 +164,9 @@ def filter_candidates(
             min_experience_years=min_experience_years,
             education_level=education_level,
             limit=limit,
-            offset=offset
+            offset=offset,
+            match_all_skills=match_all_skills,
+            view=view
         )
         return results
     except Exception as e:
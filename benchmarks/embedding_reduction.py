@@ -0,0 +1,73 @@
+"""
+Recall, latency and memory of the vector index with embeddings reduced by
+PCA or random projection, against full-dimensional exact search.
+
+Text embeddings have a low intrinsic dimension, so the synthetic pool is
+generated in a ``--intrinsic-dim`` latent space, embedded in ``--dim``
+dimensions and perturbed by isotropic noise. The reducer is fitted on a sample
+of the pool, as it would be offline with ``python -m app.services.embedding_reducer``:
+
+    python -m benchmarks.embedding_reduction --candidates 50000 --dim 1536 --dims 128 256 384
+"""
+import argparse
+import time
+import numpy as np
+from app.services.embedding_reducer import EmbeddingReducer
+from app.services.vector_index import CandidateVectorIndex
+
+
+def make_pool(n_candidates: int, dim: int, intrinsic_dim: int, n_clusters: int, noise: float, rng: np.random.Generator):
+    basis = np.linalg.qr(rng.normal(size=(dim, intrinsic_dim)))[0].T.astype(np.float32)
+    centers = rng.normal(size=(n_clusters, intrinsic_dim)).astype(np.float32)
+
+    def sample(labels):
+        latent = centers[labels] + rng.normal(scale=0.5, size=(len(labels), intrinsic_dim)).astype(np.float32)
+        return latent @ basis + rng.normal(scale=noise, size=(len(labels), dim)).astype(np.float32)
+
+    labels = rng.integers(0, n_clusters, n_candidates)
+    return sample, sample(labels), sample(labels)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--candidates', type=int, default=50000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--intrinsic-dim', type=int, default=96)
+    parser.add_argument('--clusters', type=int, default=500)
+    parser.add_argument('--noise', type=float, default=0.02, help='isotropic noise per dimension')
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--dims', type=int, nargs='+', default=[128, 256, 384])
+    parser.add_argument('--sample-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    sample_vectors, experience, skills = make_pool(
+        args.candidates, args.dim, args.intrinsic_dim, args.clusters, args.noise, rng
+    )
+    queries = sample_vectors(rng.integers(0, args.clusters, args.queries))
+    ids = np.arange(args.candidates)
+    sample = np.vstack([experience[:args.sample_size // 2], skills[:args.sample_size // 2]])
+
+    def run(index):
+        started = time.perf_counter()
+        found = [{cid for cid, _ in index.search(query, query, args.k, exhaustive=True)} for query in queries]
+        return found, (time.perf_counter() - started) * 1000 / args.queries
+
+    full = CandidateVectorIndex()
+    full.build(ids, experience, skills)
+    truth, full_ms = run(full)
+    print(f"{'projection':<28} {'MiB':>7} {'ms/query':>9} {f'recall@{args.k}':>10}")
+    print(f"{'none (' + str(args.dim) + ' dims)':<28} {full._engine.nbytes / 2 ** 20:>7.1f} {full_ms:>9.2f} {1.0:>10.3f}")
+
+    for dims in args.dims:
+        for reducer in (EmbeddingReducer.fit_pca(sample, dims), EmbeddingReducer.random_projection(args.dim, dims)):
+            index = CandidateVectorIndex(reducer=reducer)
+            index.build(ids, experience, skills)
+            found, elapsed_ms = run(index)
+            recall = sum(len(a & b) for a, b in zip(found, truth)) / (args.k * args.queries)
+            print(f"{index.projection_version:<28} {index._engine.nbytes / 2 ** 20:>7.1f} {elapsed_ms:>9.2f} {recall:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
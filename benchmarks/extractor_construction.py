@@ -0,0 +1,73 @@
+"""
+Per-request InformationExtractor construction (the original upload_cv path:
+new OpenAI client, LangChain embeddings model, output parser and a freshly
+rendered system prompt every time) versus the process-wide extractor.
+
+Reports wall time per request and the Python heap (tracemalloc) allocated per
+request and still held while ``--in-flight`` requests overlap. No network
+calls are made; constructing clients does not connect.
+
+    python -m benchmarks.extractor_construction --requests 200 --in-flight 8
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from langchain.output_parsers import PydanticOutputParser
+from langchain_openai import OpenAIEmbeddings
+from openai import OpenAI
+from app.core.config import settings
+from app.schemas.candidate import CandidateCreate
+from app.services.llm import extractor as extractor_module
+from app.services.llm.clients import get_llm_clients
+
+
+def legacy_extractor():
+    """What InformationExtractor.__init__ built before the client registry."""
+    return (
+        OpenAI(api_key=settings.OPENAI_API_KEY),
+        OpenAIEmbeddings(model=settings.EMBEDDING_MODEL, openai_api_key=settings.OPENAI_API_KEY),
+        PydanticOutputParser(pydantic_object=CandidateCreate),
+        extractor_module._render_system_prompt.__wrapped__(datetime.now().year)
+    )
+
+
+def measure(build, requests: int, in_flight: int):
+    held = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for _ in range(requests):
+        held.append(build())
+        # Requests complete in order; only the last in_flight ones stay alive
+        if len(held) > in_flight:
+            held.pop(0)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / requests, (current - before) / max(1, len(held)), peak - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--in-flight', type=int, default=8)
+    args = parser.parse_args()
+
+    # Imports and the shared registry are a one-off startup cost, kept out of the timings
+    get_llm_clients().warm_up()
+    extractor_module.get_information_extractor()
+    legacy_extractor()
+
+    paths = {
+        'per-request': legacy_extractor,
+        'shared': extractor_module.get_information_extractor,
+    }
+    print(f"{'path':<12} {'us/request':>11} {'KiB held/request':>17} {'peak KiB':>9}")
+    for name, build in paths.items():
+        per_request, held, peak = measure(build, args.requests, args.in_flight)
+        print(f"{name:<12} {per_request * 1e6:>11.1f} {held / 1024:>17.1f} {peak / 1024:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Full-precision versus int8-quantized ScoringEngine: recall of the top-k,
+latency, and memory of the candidate pool, plus the size of one embedding in
+each wire format.
+
+    python -m benchmarks.quantized_scoring --candidates 100000 --dim 1536
+"""
+import argparse
+import json
+import time
+import numpy as np
+from app.services.vector_scoring import (
+    ScoringEngine,
+    decode_embedding,
+    encode_embedding,
+    format_pgvector
+)
+from benchmarks.vector_index_recall import make_pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--clusters', type=int, default=500)
+    parser.add_argument('--noise', type=float, default=2.0)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers, experience, skills = make_pool(args.candidates, args.dim, args.clusters, args.noise, rng)
+    query_labels = rng.integers(0, args.clusters, args.queries)
+    queries = centers[query_labels] + rng.normal(scale=args.noise, size=(args.queries, args.dim)).astype(np.float32)
+    ids = np.arange(args.candidates)
+
+    engines = {}
+    for precision in ('float32', 'int8'):
+        engines[precision] = ScoringEngine(precision=precision)
+        engines[precision].build(ids, {'experience_embedding': experience, 'skills_embedding': skills})
+
+    results = {}
+    print(f"{'precision':<9} {'pool MiB':>9} {'ms/query':>9}")
+    for precision, engine in engines.items():
+        started = time.perf_counter()
+        results[precision] = [
+            engine.search({'experience_embedding': query, 'skills_embedding': query}, args.k)
+            for query in queries
+        ]
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.queries
+        print(f"{precision:<9} {engine.nbytes / 2 ** 20:>9.1f} {elapsed_ms:>9.2f}")
+
+    hits = sum(
+        len({cid for cid, _ in exact} & {cid for cid, _ in quantized})
+        for exact, quantized in zip(results['float32'], results['int8'])
+    )
+    score_error = max(
+        abs(exact[0][1] - quantized[0][1])
+        for exact, quantized in zip(results['float32'], results['int8'])
+    )
+    print(f"int8 recall@{args.k} vs float32: {hits / (args.k * args.queries):.3f}  max top-1 score error: {score_error:.5f}")
+
+    vector = experience[0] / np.linalg.norm(experience[0])
+    formats = {
+        'JSON list of floats': json.dumps(vector.astype(np.float64).tolist()),
+        'pgvector float32 text': format_pgvector(vector),
+        'base64 float32': encode_embedding(vector, 'float32'),
+        'base64 int8': encode_embedding(vector, 'int8'),
+    }
+    print(f"\n{'wire format':<22} {'bytes':>7}")
+    for name, text in formats.items():
+        print(f"{name:<22} {len(text):>7}")
+    error = np.abs(decode_embedding(formats['base64 int8']) - vector).max()
+    print(f"int8 round trip max abs error: {error:.6f}")
+
+
+if __name__ == '__main__':
+    main()
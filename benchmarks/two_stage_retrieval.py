@@ -0,0 +1,57 @@
+"""
+Latency and recall of two-stage retrieval (sign-bit Hamming prefilter, then
+exact re-rank of the shortlist) against exact scoring of the whole pool.
+
+    python -m benchmarks.two_stage_retrieval --candidates 100000 --dim 1536 --depths 100 500 2000
+"""
+import argparse
+import time
+import numpy as np
+from app.services.vector_scoring import ScoringEngine
+from benchmarks.vector_index_recall import make_pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--clusters', type=int, default=500)
+    parser.add_argument('--noise', type=float, default=2.0)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--depths', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--precision', choices=['float32', 'int8'], default='float32')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers, experience, skills = make_pool(args.candidates, args.dim, args.clusters, args.noise, rng)
+    labels = rng.integers(0, args.clusters, args.queries)
+    experience_queries = centers[labels] + rng.normal(scale=args.noise, size=(args.queries, args.dim)).astype(np.float32)
+    skills_queries = centers[labels] + rng.normal(scale=args.noise, size=(args.queries, args.dim)).astype(np.float32)
+    queries = [
+        {'experience_embedding': experience_query, 'skills_embedding': skills_query}
+        for experience_query, skills_query in zip(experience_queries, skills_queries)
+    ]
+
+    engine = ScoringEngine(precision=args.precision)
+    engine.build(np.arange(args.candidates), {'experience_embedding': experience, 'skills_embedding': skills})
+    print(f"{args.candidates} candidates x {args.dim} dims, {args.precision}; sign bits: "
+          f"{engine._signs[:engine.size].nbytes / 2 ** 20:.1f} MiB of {engine.nbytes / 2 ** 20:.1f} MiB")
+
+    started = time.perf_counter()
+    truth = [{cid for cid, _ in engine.search(query, args.k)} for query in queries]
+    exact_ms = (time.perf_counter() - started) * 1000 / args.queries
+    print(f"{'exact':<12} {exact_ms:>8.2f} ms/query  recall@{args.k}=1.000")
+
+    for depth in args.depths:
+        hits = 0
+        started = time.perf_counter()
+        for query, expected in zip(queries, truth):
+            found = {cid for cid, _ in engine.search(query, args.k, rerank_depth=depth)}
+            hits += len(found & expected)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.queries
+        print(f"{f'depth={depth}':<12} {elapsed_ms:>8.2f} ms/query  recall@{args.k}={hits / (args.k * args.queries):.3f}")
+
+
+if __name__ == '__main__':
+    main()
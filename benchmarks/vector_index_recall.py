@@ -0,0 +1,68 @@
+"""
+Recall and latency of CandidateVectorIndex against brute-force cosine search.
+
+Uses synthetic clustered embeddings so it runs without Supabase or OpenAI:
+
+    python -m benchmarks.vector_index_recall --candidates 100000 --dim 1536
+"""
+import argparse
+import time
+import numpy as np
+from app.services.vector_index import CandidateVectorIndex
+from app.services.vector_scoring import normalize_rows
+
+
+def make_pool(n_candidates: int, dim: int, n_clusters: int, noise: float, rng: np.random.Generator):
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n_candidates)
+    experience = centers[labels] + rng.normal(scale=noise, size=(n_candidates, dim)).astype(np.float32)
+    skills = centers[labels] + rng.normal(scale=noise, size=(n_candidates, dim)).astype(np.float32)
+    return centers, experience, skills
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--clusters', type=int, default=500)
+    parser.add_argument('--noise', type=float, default=2.0, help='spread of candidates around their cluster')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers, experience, skills = make_pool(args.candidates, args.dim, args.clusters, args.noise, rng)
+    query_labels = rng.integers(0, args.clusters, args.queries)
+    queries = centers[query_labels] + rng.normal(scale=args.noise, size=(args.queries, args.dim)).astype(np.float32)
+
+    index = CandidateVectorIndex()
+    started = time.perf_counter()
+    index.build(np.arange(args.candidates), experience, skills)
+    print(f"build: {args.candidates} candidates x {args.dim} dims in {time.perf_counter() - started:.2f}s")
+
+    exp_matrix = normalize_rows(experience)
+    skills_matrix = normalize_rows(skills)
+    normalized_queries = normalize_rows(queries)
+
+    started = time.perf_counter()
+    truth = []
+    for query in normalized_queries:
+        scores = (exp_matrix @ query + skills_matrix @ query) / 2
+        truth.append(set(np.argpartition(-scores, args.k - 1)[:args.k].tolist()))
+    brute_ms = (time.perf_counter() - started) * 1000 / args.queries
+    print(f"brute force: {brute_ms:.2f} ms/query")
+
+    for n_probe in args.n_probe:
+        hits = 0
+        started = time.perf_counter()
+        for query, expected in zip(queries, truth):
+            found = {candidate_id for candidate_id, _ in index.search(query, query, args.k, n_probe=n_probe)}
+            hits += len(found & expected)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.queries
+        recall = hits / (args.k * args.queries)
+        print(f"ivf n_probe={n_probe:<3d} recall@{args.k}={recall:.3f}  {elapsed_ms:.2f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
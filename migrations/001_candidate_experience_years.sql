@@ -0,0 +1,17 @@
+-- Materialized work experience aggregate used by min_experience_years filtering.
+-- Written by CandidateService and the CV ingestion save path for every new
+-- candidate (zero for candidates without work history); run
+-- CandidateService.backfill_experience_years() once after applying this so
+-- existing candidates are filtered too.
+
+ALTER TABLE candidates
+    ADD COLUMN IF NOT EXISTS total_experience_years real,
+    ADD COLUMN IF NOT EXISTS merged_experience_years real,
+    -- Set when a position is ongoing: merged years on day D = (D - anchor) / 365.25
+    ADD COLUMN IF NOT EXISTS experience_anchor_date date;
+
+CREATE INDEX IF NOT EXISTS candidates_merged_experience_years_idx
+    ON candidates (merged_experience_years);
+
+CREATE INDEX IF NOT EXISTS candidates_experience_anchor_date_idx
+    ON candidates (experience_anchor_date);
@@ -0,0 +1,21 @@
+-- One skills row per name. CandidateService upserts skills with
+-- on_conflict='name', which PostgREST can only do against a unique index.
+-- Duplicate rows are folded into the oldest one first, moving their
+-- candidate links over; apply 003 afterwards to drop the doubled links.
+
+BEGIN;
+
+UPDATE candidate_skills cs
+SET skill_id = keep.id
+FROM skills dup
+JOIN skills keep ON keep.name = dup.name AND keep.id < dup.id
+WHERE cs.skill_id = dup.id
+  AND NOT EXISTS (SELECT 1 FROM skills older WHERE older.name = dup.name AND older.id < keep.id);
+
+DELETE FROM skills dup
+USING skills keep
+WHERE keep.name = dup.name AND keep.id < dup.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS skills_name_key ON skills (name);
+
+COMMIT;
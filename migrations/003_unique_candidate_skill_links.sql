@@ -0,0 +1,17 @@
+-- One candidate_skills link per (candidate, skill). merge_duplicate_skills
+-- upserts links with on_conflict='candidate_id,skill_id', which PostgREST
+-- can only do against a unique index. Doubled links (e.g. left by 002) are
+-- removed first, keeping one physical row of each pair.
+
+BEGIN;
+
+DELETE FROM candidate_skills dup
+USING candidate_skills keep
+WHERE keep.candidate_id = dup.candidate_id
+  AND keep.skill_id = dup.skill_id
+  AND keep.ctid < dup.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS candidate_skills_candidate_id_skill_id_key
+    ON candidate_skills (candidate_id, skill_id);
+
+COMMIT;
@@ -0,0 +1,35 @@
+-- Store skill names in the lowercase, whitespace-collapsed form CandidateService
+-- looks them up by; rows that only differed in case or spacing ("Python",
+-- "python ") are folded into the oldest one first, moving their candidate
+-- links over. Apply after 003. Aliases ("postgres" -> "postgresql") are
+-- folded by CandidateService.merge_duplicate_skills() at API startup.
+
+BEGIN;
+
+CREATE TEMPORARY TABLE skill_names ON COMMIT DROP AS
+SELECT id,
+       lower(regexp_replace(btrim(name), '\s+', ' ', 'g')) AS canonical,
+       min(id) OVER (PARTITION BY lower(regexp_replace(btrim(name), '\s+', ' ', 'g'))) AS keep_id
+FROM skills;
+
+INSERT INTO candidate_skills (candidate_id, skill_id)
+SELECT cs.candidate_id, sn.keep_id
+FROM candidate_skills cs
+JOIN skill_names sn ON sn.id = cs.skill_id
+WHERE sn.id <> sn.keep_id
+ON CONFLICT (candidate_id, skill_id) DO NOTHING;
+
+DELETE FROM candidate_skills cs
+USING skill_names sn
+WHERE cs.skill_id = sn.id AND sn.id <> sn.keep_id;
+
+DELETE FROM skills s
+USING skill_names sn
+WHERE s.id = sn.id AND sn.id <> sn.keep_id;
+
+UPDATE skills s
+SET name = sn.canonical
+FROM skill_names sn
+WHERE s.id = sn.id AND s.name <> sn.canonical;
+
+COMMIT;
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from app.schemas.candidate import CandidateCreate
+
+
+class IngestionJobCreated(BaseModel):
+    """Returned when a CV has been queued for background ingestion."""
+    job_id: str
+    status: str
+
+
+class IngestionJob(BaseModel):
+    """Status of a background CV ingestion job."""
+    job_id: str
+    filename: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: float
+    updated_at: float
+
+
+class FailedUpload(BaseModel):
+    """A CV from a batch upload that could not be ingested, and the stage it failed in."""
+    filename: str
+    stage: str
+    error: str
+
+
+class BatchUploadReport(BaseModel):
+    """Outcome of a batch upload with per-stage throughput."""
+    successful_uploads: List[CandidateCreate]
+    failed_uploads: List[FailedUpload]
+    stage_stats: Dict[str, Dict[str, Any]]
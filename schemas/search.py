@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import List, Optional, Union
+from pydantic import BaseModel
+from app.schemas.candidate import CandidateDetail
+
+
+class ScoredCandidateDetail(CandidateDetail):
+    """A full candidate record with its ranking score (None outside ranked search)."""
+    score: Optional[float] = None
+
+
+class SkillName(BaseModel):
+    name: str
+
+
+class CandidateSummary(BaseModel):
+    """The fields a result list shows, without education, experience or CV text."""
+    id: int
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    cv_file_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    skills: List[SkillName] = []
+    score: Optional[float] = None
+
+
+class SemanticSearchPage(BaseModel):
+    """One page of a ranked semantic search, with the cursor for the next page."""
+    results: Union[List[ScoredCandidateDetail], List[CandidateSummary]]
+    next_cursor: Optional[str] = None
+    # Every candidate matching the search; only the best 1000 of them can be paged through
+    total: int
@@ -0,0 +1,177 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Persistent key/value cache backed by a single SQLite file.
+
+    The file is opened in WAL mode, so every worker process on the host can
+    read and write the same cache concurrently. Entries expire after
+    ``ttl_seconds`` (if set) and the least recently used entries are evicted
+    once the cache holds more than ``max_entries``.
+
+    Hits do not write: their access times are collected in memory and written
+    in one batch every TOUCH_FLUSH_SECONDS or before an eviction, so reads
+    never wait for SQLite's writer lock.
+    """
+
+    # Eviction scans the table, so it only runs every this many writes
+    EVICT_EVERY = 100
+    # How long access times of hits are held before they are written
+    TOUCH_FLUSH_SECONDS = 60
+
+    def __init__(
+        self,
+        path: str,
+        table: str = 'cache',
+        max_entries: int = 100000,
+        ttl_seconds: Optional[int] = None
+    ):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._touched: Dict[str, float] = {}
+        self._touched_flushed_at = time.time()
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection().execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_at ON {self.table} (accessed_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections must not be shared across threads."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None on a miss or an expired entry."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the cached values for ``keys`` that are present and fresh."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        connection = self._connection()
+        found: Dict[str, bytes] = {}
+        expired: List[str] = []
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = connection.execute(
+                f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({placeholders})",
+                batch
+            ).fetchall()
+            for key, value, created_at in rows:
+                if self._is_expired(created_at, now):
+                    expired.append(key)
+                else:
+                    found[key] = value
+
+        if expired:
+            connection.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key in expired])
+        with self._counter_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self._touched.update(dict.fromkeys(found, now))
+            flush = now - self._touched_flushed_at >= self.TOUCH_FLUSH_SECONDS
+        if flush:
+            self.flush_touches()
+        return found
+
+    def flush_touches(self) -> None:
+        """Write the access times of the hits collected since the last flush."""
+        with self._counter_lock:
+            touched, self._touched = self._touched, {}
+            self._touched_flushed_at = time.time()
+        if touched:
+            self._connection().executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in touched.items()]
+            )
+
+    def set(self, key: str, value: bytes) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+        now = time.time()
+        self._connection().executemany(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            [(key, sqlite3.Binary(value), now, now) for key, value in items.items()]
+        )
+        with self._counter_lock:
+            self._writes += len(items)
+            evict = self._writes >= self.EVICT_EVERY
+            if evict:
+                self._writes = 0
+        if evict:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._counter_lock:
+            self._touched = {}
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        self.flush_touches()
+        connection = self._connection()
+        if self.ttl_seconds is not None:
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+        connection.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def __len__(self) -> int:
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the shared entry count."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self)
+        }
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+from app.services.cache.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'embeddings.sqlite3')
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: entries are keyed by (model, sha256(text))
+    and stored as raw float32 bytes in a DiskCache.
+    """
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return f"{model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        return self.get_many(model, [text]).get(text)
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings for whichever of ``texts`` are present."""
+        return {text: vector.tolist() for text, vector in self.get_arrays(model, texts).items()}
+
+    def get_arrays(self, model: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Like get_many, but as float32 arrays straight from the stored bytes."""
+        keys = {self.make_key(model, text): text for text in texts}
+        found = self.store.get_many(keys)
+        return {
+            keys[key]: np.frombuffer(value, dtype=np.float32)
+            for key, value in found.items()
+        }
+
+    def set(self, model: str, text: str, embedding: Sequence[float]) -> None:
+        self.set_many(model, {text: embedding})
+
+    def set_many(self, model: str, embeddings: Dict[str, Sequence[float]]) -> None:
+        self.store.set_many({
+            self.make_key(model, text): np.asarray(embedding, dtype=np.float32).tobytes()
+            for text, embedding in embeddings.items()
+        })
+
+    def stats(self) -> Dict[str, float]:
+        return self.store.stats()
+
+
+class MemoryEmbeddingCache:
+    """
+    Bounded, thread-safe in-process LRU of embeddings keyed like EmbeddingCache.
+    Vectors are held as float32 arrays (6 KiB per 1536-dim vector instead of
+    ~48 KiB as a list of Python floats) and expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[int] = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # key -> (stored_at, vector), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        key = EmbeddingCache.make_key(model, text)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, model: str, text: str, embedding: Sequence[float]) -> np.ndarray:
+        """Store ``embedding`` and return it as the read-only float32 array that is cached."""
+        vector = np.array(embedding, dtype=np.float32)
+        # Callers share the cached array, so it must not be modified in place
+        vector.flags.writeable = False
+        key = EmbeddingCache.make_key(model, text)
+        with self._lock:
+            self._entries[key] = (time.time(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': sum(vector.nbytes for _, vector in self._entries.values())
+            }
+
+
+# Process-wide, so every extractor and request shares recently used embeddings
+recent_embeddings = MemoryEmbeddingCache(
+    max_entries=getattr(settings, 'EMBEDDING_MEMORY_CACHE_MAX_ENTRIES', 1024),
+    ttl_seconds=getattr(settings, 'EMBEDDING_MEMORY_CACHE_TTL_SECONDS', 3600)
+)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_configured = False
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the process-wide embedding cache, creating the default SQLite-backed one on first use.
+    Returns None when caching has been disabled with set_embedding_cache(None).
+    """
+    global _embedding_cache, _embedding_cache_configured
+    with _embedding_cache_lock:
+        if not _embedding_cache_configured:
+            try:
+                _embedding_cache = EmbeddingCache(DiskCache(
+                    getattr(settings, 'EMBEDDING_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    table='embeddings',
+                    max_entries=getattr(settings, 'EMBEDDING_CACHE_MAX_ENTRIES', 200000),
+                    ttl_seconds=getattr(settings, 'EMBEDDING_CACHE_TTL_SECONDS', None)
+                ))
+            except Exception as e:
+                # Caching is an optimization; never fail embedding generation because of it
+                logger.warning(f"Embedding cache disabled: {str(e)}")
+                _embedding_cache = None
+            _embedding_cache_configured = True
+        return _embedding_cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+    """Plug in a different embedding cache, or disable caching with None."""
+    global _embedding_cache, _embedding_cache_configured
+    with _embedding_cache_lock:
+        _embedding_cache = cache
+        _embedding_cache_configured = True
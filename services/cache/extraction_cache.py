@@ -0,0 +1,80 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.cache.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'extractions.sqlite3')
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Parsed LLM extractions keyed by (model, sha256(system prompt), sha256(chunk)).
+
+    Changing the model or the prompt (including the schema's format
+    instructions embedded in it) changes the key, so stale extractions are
+    never served; they simply age out of the DiskCache.
+    """
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, chunk: str) -> str:
+        return f"{model}:{_sha256(system_prompt)}:{_sha256(chunk)}"
+
+    def get(self, model: str, system_prompt: str, chunk: str) -> Optional[Dict[str, Any]]:
+        value = self.store.get(self.make_key(model, system_prompt, chunk))
+        return json.loads(value) if value is not None else None
+
+    def set(self, model: str, system_prompt: str, chunk: str, extraction: Dict[str, Any]) -> None:
+        value = json.dumps(extraction, default=str).encode('utf-8')
+        self.store.set(self.make_key(model, system_prompt, chunk), value)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_configured = False
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Return the process-wide extraction cache, creating the default SQLite-backed one on first use.
+    Returns None when caching has been disabled with set_extraction_cache(None).
+    """
+    global _extraction_cache, _extraction_cache_configured
+    with _extraction_cache_lock:
+        if not _extraction_cache_configured:
+            try:
+                _extraction_cache = ExtractionCache(DiskCache(
+                    getattr(settings, 'EXTRACTION_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    table='extractions',
+                    max_entries=getattr(settings, 'EXTRACTION_CACHE_MAX_ENTRIES', 50000),
+                    ttl_seconds=getattr(settings, 'EXTRACTION_CACHE_TTL_SECONDS', None)
+                ))
+            except Exception as e:
+                # Caching is an optimization; never fail extraction because of it
+                logger.warning(f"Extraction cache disabled: {str(e)}")
+                _extraction_cache = None
+            _extraction_cache_configured = True
+        return _extraction_cache
+
+
+def set_extraction_cache(cache: Optional[ExtractionCache]) -> None:
+    """Plug in a different extraction cache, or disable caching with None."""
+    global _extraction_cache, _extraction_cache_configured
+    with _extraction_cache_lock:
+        _extraction_cache = cache
+        _extraction_cache_configured = True
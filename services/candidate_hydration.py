@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from supabase import Client
+from app.schemas.search import CandidateSummary, ScoredCandidateDetail
+
+logger = logging.getLogger(__name__)
+
+VIEW_DETAIL = 'detail'
+VIEW_SUMMARY = 'summary'
+VIEWS = (VIEW_DETAIL, VIEW_SUMMARY)
+
+# Child tables embedded in a candidate detail
+DETAIL_RELATIONS = ('skills', 'education', 'work_experience', 'certifications', 'projects')
+
+SUMMARY_SELECT = 'id, full_name, email, phone, location, cv_file_id, created_at, updated_at, skills(name)'
+
+
+def _detail_select() -> str:
+    """
+    Columns CandidateDetail actually holds plus its child tables. Selecting
+    them explicitly instead of ``*`` keeps the two embedding vectors (tens of
+    kilobytes per candidate) out of every search response.
+    """
+    fields = getattr(ScoredCandidateDetail, 'model_fields', None)
+    if not fields:
+        return '*, ' + ', '.join(f'{relation}(*)' for relation in DETAIL_RELATIONS)
+    columns = [name for name in fields if name not in DETAIL_RELATIONS and name != 'score']
+    relations = [f'{relation}(*)' for relation in DETAIL_RELATIONS if relation in fields]
+    return ', '.join(columns + relations)
+
+
+class HydratedCandidateCache:
+    """
+    Bounded, thread-safe LRU of hydrated candidate rows keyed by (view, id).
+    Entries expire after ``ttl_seconds``; CandidateService drops a candidate's
+    entries when it writes to that candidate.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: int = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, view: str, candidate_ids: Iterable[int]) -> Dict[int, dict]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for candidate_id in candidate_ids:
+                entry = self._entries.get((view, candidate_id))
+                if entry is None:
+                    continue
+                if now - entry[0] > self.ttl_seconds:
+                    del self._entries[(view, candidate_id)]
+                    continue
+                self._entries.move_to_end((view, candidate_id))
+                found[candidate_id] = entry[1]
+        return found
+
+    def put_many(self, view: str, rows: Dict[int, dict]) -> None:
+        now = time.time()
+        with self._lock:
+            for candidate_id, row in rows.items():
+                self._entries[(view, candidate_id)] = (now, row)
+                self._entries.move_to_end((view, candidate_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, candidate_id: int) -> None:
+        with self._lock:
+            for view in VIEWS:
+                self._entries.pop((view, candidate_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide so popular candidates are hydrated once across searches
+hydrated_candidates = HydratedCandidateCache()
+
+
+class CandidateHydrator:
+    """
+    Turns ranked candidate ids into response models in one round trip.
+
+    Rows come back from ``in_('id', ...)`` in arbitrary order; the hydrator
+    restores rank order, attaches scores and drops ids that no longer exist.
+    The summary view selects only list-view fields.
+    """
+
+    def __init__(self, supabase: Client, cache: Optional[HydratedCandidateCache] = None):
+        self.supabase = supabase
+        self.cache = cache if cache is not None else hydrated_candidates
+
+    def hydrate(
+        self,
+        ranked: Sequence[Tuple[int, Optional[float]]],
+        view: str = VIEW_DETAIL
+    ) -> List[Union[ScoredCandidateDetail, CandidateSummary]]:
+        """
+        Hydrate (candidate_id, score) pairs, best first, into models of ``view``.
+
+        Raises:
+            ValueError: If the view is unknown
+        """
+        if view not in VIEWS:
+            raise ValueError(f"view must be one of {', '.join(VIEWS)}")
+        if not ranked:
+            return []
+
+        candidate_ids = list(dict.fromkeys(candidate_id for candidate_id, _ in ranked))
+        rows = self.cache.get_many(view, candidate_ids)
+        missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in rows]
+        if missing:
+            fetched = self._fetch(missing, view)
+            self.cache.put_many(view, fetched)
+            rows.update(fetched)
+
+        model = ScoredCandidateDetail if view == VIEW_DETAIL else CandidateSummary
+        return [
+            model(**{**rows[candidate_id], 'score': score})
+            for candidate_id, score in ranked
+            if candidate_id in rows
+        ]
+
+    def _fetch(self, candidate_ids: List[int], view: str) -> Dict[int, dict]:
+        try:
+            result = self.supabase.table('candidates')\
+                .select(_detail_select() if view == VIEW_DETAIL else SUMMARY_SELECT)\
+                .in_('id', candidate_ids)\
+                .execute()
+            return {row['id']: row for row in result.data or []}
+        except Exception as e:
+            logger.error(f"Error hydrating candidates: {str(e)}")
+            raise
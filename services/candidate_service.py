@@ -1,5 +1,8 @@
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import threading
 from supabase import Client
 from app.schemas.candidate import (
     CandidateCreate,
@@ -13,10 +16,64 @@ from app.schemas.candidate import (
     Skill
 )
 from app.services.embedding_service import generate_embeddings
+from app.services.experience import ExperienceYears, compute_experience_years
+from app.services.vector_index import get_loaded_candidate_index
+from app.services.vector_scoring import format_pgvector
+from app.services.skill_index import get_loaded_skill_index
+from app.services.skill_normalizer import canonical_skill, canonical_skills
+from app.services.lexical_index import BM25Index, get_loaded_lexical_index
+from app.services.search_cache import query_results
+from app.services.candidate_hydration import hydrated_candidates
+from app.services.ingestion.dedup import get_upload_registry
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+# PostgreSQL error code of a foreign key violation, as reported by PostgREST
+FOREIGN_KEY_VIOLATION = '23503'
+
+
+class SkillIdCache:
+    """
+    Bounded, thread-safe LRU of skill name -> id. An id stays valid until
+    merge_duplicate_skills() folds its row into another one, possibly in a
+    different worker; writes that hit a deleted id clear the cache and retry.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, names: List[str]) -> Dict[str, int]:
+        with self._lock:
+            found = {}
+            for name in names:
+                skill_id = self._entries.get(name)
+                if skill_id is not None:
+                    self._entries.move_to_end(name)
+                    found[name] = skill_id
+            return found
+
+    def put_many(self, skill_ids: Dict[str, int]) -> None:
+        with self._lock:
+            self._entries.update(skill_ids)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide so hot skills skip the lookup across requests
+skill_id_cache = SkillIdCache()
+
+# Shared pool for writing a candidate's child tables concurrently
+related_writes_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='candidate-writes')
+
+
 class CandidateService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
@@ -34,30 +91,24 @@ class CandidateService:
             
             candidate_id = result.data[0]['id']
             
-            # Handle skills
-            if candidate.skills:
-                self._handle_skills(candidate_id, candidate.skills)
-            
-            # Handle education
-            if candidate.education:
-                self._handle_education(candidate_id, candidate.education)
-            
-            # Handle work experience
-            if candidate.work_experience:
-                self._handle_work_experience(candidate_id, candidate.work_experience)
-            
-            # Handle certifications
-            if candidate.certifications:
-                self._handle_certifications(candidate_id, candidate.certifications)
-            
-            # Handle projects
-            if candidate.projects:
-                self._handle_projects(candidate_id, candidate.projects)
+            # Write skills and the four child tables concurrently, one request each
+            self._handle_related(candidate_id, candidate)
             
             # Generate embeddings if CV text is available
             if candidate_data.get('cv_text'):
                 self._generate_and_store_embeddings(candidate_id, candidate_data['cv_text'])
             
+            # Make the candidate findable by keyword search in this worker
+            lexical_index = get_loaded_lexical_index()
+            if lexical_index is not None:
+                lexical_index.upsert(
+                    candidate_id,
+                    BM25Index.document_terms(candidate_data.get('cv_text'), candidate.skills or [])
+                )
+            
+            # Cached search results may now be missing this candidate
+            query_results.invalidate()
+            
             # Return created candidate
             return self.get_candidate_by_id(candidate_id)
                 
@@ -65,6 +116,27 @@ class CandidateService:
             logger.error(f"Error creating candidate: {str(e)}")
             raise
 
+    def apply_created_candidate(self, candidate_id: int, candidate: CandidateCreate, embeddings: Dict[str, Any]) -> None:
+        """
+        Make a candidate created outside this service (by CV ingestion) searchable in this
+        worker's in-memory indexes, and drop cached search results that may now miss it.
+        """
+        try:
+            index = get_loaded_candidate_index()
+            if index is not None:
+                index.upsert(candidate_id, embeddings.get('experience_embedding'), embeddings.get('skills_embedding'))
+            skill_index = get_loaded_skill_index()
+            if skill_index is not None:
+                skill_index.add_candidate_skills(candidate_id, candidate.skills or [])
+            lexical_index = get_loaded_lexical_index()
+            if lexical_index is not None:
+                lexical_index.upsert(
+                    candidate_id,
+                    BM25Index.document_terms(getattr(candidate, 'cv_text', None), candidate.skills or [])
+                )
+        finally:
+            query_results.invalidate()
+
     def get_candidates(self, skip: int = 0, limit: int = 10) -> List[CandidateResponse]:
         """Get a list of candidates with pagination"""
         try:
@@ -119,6 +191,12 @@ class CandidateService:
             if candidate.cv_text:
                 self._generate_and_store_embeddings(candidate_id, candidate.cv_text)
             
+            if candidate.cv_text is not None or candidate.skills is not None:
+                self._refresh_lexical_document(candidate_id)
+            
+            hydrated_candidates.invalidate(candidate_id)
+            query_results.invalidate()
+            
             # Return updated candidate
             return self.get_candidate_by_id(candidate_id)
                 
@@ -142,12 +220,49 @@ class CandidateService:
                 .eq('id', candidate_id)\
                 .execute()
             
+            # Drop the candidate from this worker's in-memory indexes
+            index = get_loaded_candidate_index()
+            if index is not None:
+                index.remove(candidate_id)
+            skill_index = get_loaded_skill_index()
+            if skill_index is not None:
+                skill_index.remove_candidate(candidate_id)
+            lexical_index = get_loaded_lexical_index()
+            if lexical_index is not None:
+                lexical_index.remove(candidate_id)
+            
+            hydrated_candidates.invalidate(candidate_id)
+            query_results.invalidate()
+            
+            # A deleted candidate's CV must be ingested again if it is re-uploaded
+            registry = get_upload_registry()
+            if registry is not None:
+                registry.forget_candidate(candidate_id)
+            
             return bool(result.data)
                 
         except Exception as e:
             logger.error(f"Error deleting candidate {candidate_id}: {str(e)}")
             raise
 
+    def _refresh_lexical_document(self, candidate_id: int) -> None:
+        """Re-index a candidate's stored CV text and skills in this worker's BM25 index"""
+        lexical_index = get_loaded_lexical_index()
+        if lexical_index is None:
+            return
+        try:
+            result = self.supabase.table('candidates')\
+                .select('cv_text, skills(name)')\
+                .eq('id', candidate_id)\
+                .single()\
+                .execute()
+            if result.data:
+                skills = [skill['name'] for skill in result.data.get('skills') or []]
+                lexical_index.upsert(candidate_id, BM25Index.document_terms(result.data.get('cv_text'), skills))
+        except Exception as e:
+            logger.error(f"Error refreshing lexical index for candidate {candidate_id}: {str(e)}")
+            raise
+
     def _handle_skills(self, candidate_id: int, skills: List[str], replace: bool = False) -> None:
         """Handle skill creation and association with candidate"""
         try:
@@ -155,64 +270,238 @@ class CandidateService:
                 # Remove existing skills
                 self.supabase.table('candidate_skills').delete().eq('candidate_id', candidate_id).execute()
             
-            # Get or create skills
-            skill_ids = []
-            for skill_name in skills:
-                # Try to get existing skill
+            # Store canonical names only, so aliases ("Postgres", "PostgreSQL") share one skill row
+            skills = canonical_skills(skills)
+            
+            # Get or create skills in bulk and associate them with the candidate in a single multi-row insert
+            try:
+                self._link_skills(candidate_id, skills)
+            except Exception as e:
+                if getattr(e, 'code', None) != FOREIGN_KEY_VIOLATION:
+                    raise
+                # A cached id belonged to a skill row merged away since; resolve the names again
+                skill_id_cache.clear()
+                self._link_skills(candidate_id, skills)
+            
+            # Keep this worker's skill index in step with the new links
+            skill_index = get_loaded_skill_index()
+            if skill_index is not None:
+                if replace:
+                    skill_index.set_candidate_skills(candidate_id, skills)
+                else:
+                    skill_index.add_candidate_skills(candidate_id, skills)
+                    
+        except Exception as e:
+            logger.error(f"Error handling skills for candidate {candidate_id}: {str(e)}")
+            raise
+
+    def _link_skills(self, candidate_id: int, skills: List[str]) -> None:
+        skill_ids = self._get_or_create_skill_ids(skills)
+        if skill_ids:
+            self.supabase.table('candidate_skills')\
+                .insert([{'candidate_id': candidate_id, 'skill_id': skill_id} for skill_id in skill_ids])\
+                .execute()
+
+    def _get_or_create_skill_ids(self, skills: List[str]) -> List[int]:
+        """
+        Resolve skill names to ids with at most one lookup and one insert round trip.
+        Names already seen by this process are served from skill_id_cache.
+        """
+        names = list(dict.fromkeys(name for name in skills if name))
+        skill_ids = skill_id_cache.get_many(names)
+        missing = [name for name in names if name not in skill_ids]
+        
+        if missing:
+            result = self.supabase.table('skills')\
+                .select('id, name')\
+                .in_('name', missing)\
+                .execute()
+            found = {row['name']: row['id'] for row in result.data or []}
+            
+            to_create = [name for name in missing if name not in found]
+            if to_create:
+                # Upsert on the unique name so concurrent uploads creating the same skill don't conflict
+                result = self.supabase.table('skills')\
+                    .upsert([{'name': name} for name in to_create], on_conflict='name')\
+                    .execute()
+                found.update({row['name']: row['id'] for row in result.data or []})
+            
+            skill_id_cache.put_many(found)
+            skill_ids.update(found)
+        
+        return list(dict.fromkeys(skill_ids[name] for name in names if name in skill_ids))
+
+    def merge_duplicate_skills(self, page_size: int = 1000) -> int:
+        """
+        Fold skill rows whose names canonicalize to the same skill (e.g. rows created
+        before normalization) into the canonical row, moving candidate links over.
+        Run at API startup, after migration 004 has lowercased the stored names.
+        Returns the number of skill rows removed.
+        """
+        try:
+            # Ids cached before another worker's merge may point at deleted rows
+            skill_id_cache.clear()
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            start = 0
+            while True:
                 result = self.supabase.table('skills')\
-                    .select('id')\
-                    .eq('name', skill_name)\
-                    .single()\
+                    .select('id, name')\
+                    .order('id')\
+                    .range(start, start + page_size - 1)\
                     .execute()
+                rows = result.data or []
+                for row in rows:
+                    canonical = canonical_skill(row['name'])
+                    if canonical:
+                        groups.setdefault(canonical, []).append(row)
+                if len(rows) < page_size:
+                    break
+                start += page_size
+            
+            removed = 0
+            for canonical, rows in groups.items():
+                if len(rows) == 1 and rows[0]['name'] == canonical:
+                    continue
+                canonical_id = self._get_or_create_skill_ids([canonical])[0]
+                duplicate_ids = [row['id'] for row in rows if row['id'] != canonical_id]
+                if not duplicate_ids:
+                    continue
                 
-                if result.data:
-                    skill_ids.append(result.data['id'])
-                else:
-                    # Create new skill
-                    result = self.supabase.table('skills')\
-                        .insert({'name': skill_name})\
+                links = self.supabase.table('candidate_skills')\
+                    .select('candidate_id')\
+                    .in_('skill_id', duplicate_ids)\
+                    .execute()
+                candidate_ids = sorted({row['candidate_id'] for row in links.data or []})
+                if candidate_ids:
+                    self.supabase.table('candidate_skills')\
+                        .upsert(
+                            [{'candidate_id': candidate_id, 'skill_id': canonical_id} for candidate_id in candidate_ids],
+                            on_conflict='candidate_id,skill_id',
+                            ignore_duplicates=True
+                        )\
                         .execute()
-                    skill_ids.append(result.data[0]['id'])
+                self.supabase.table('candidate_skills').delete().in_('skill_id', duplicate_ids).execute()
+                self.supabase.table('skills').delete().in_('id', duplicate_ids).execute()
+                removed += len(duplicate_ids)
             
-            # Associate skills with candidate
-            for skill_id in skill_ids:
-                self.supabase.table('candidate_skills')\
-                    .insert({'candidate_id': candidate_id, 'skill_id': skill_id})\
-                    .execute()
-                    
+            # Cached ids of the removed rows must not be handed out again
+            skill_id_cache.clear()
+            hydrated_candidates.clear()
+            query_results.invalidate()
+            return removed
         except Exception as e:
-            logger.error(f"Error handling skills for candidate {candidate_id}: {str(e)}")
+            logger.error(f"Error merging duplicate skills: {str(e)}")
             raise
 
+    def _handle_related(self, candidate_id: int, candidate: CandidateCreate) -> None:
+        """Write skills, education, work experience, certifications and projects in parallel"""
+        writes = []
+        if candidate.skills:
+            writes.append(related_writes_pool.submit(self._handle_skills, candidate_id, candidate.skills))
+        if candidate.education:
+            writes.append(related_writes_pool.submit(self._handle_education, candidate_id, candidate.education))
+        # Always written: a candidate without work history still gets its (zero) experience aggregate
+        writes.append(related_writes_pool.submit(self._handle_work_experience, candidate_id, candidate.work_experience or []))
+        if candidate.certifications:
+            writes.append(related_writes_pool.submit(self._handle_certifications, candidate_id, candidate.certifications))
+        if candidate.projects:
+            writes.append(related_writes_pool.submit(self._handle_projects, candidate_id, candidate.projects))
+        
+        # Wait for every write before surfacing the first error
+        errors = [future.exception() for future in writes]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def _insert_related(self, table: str, candidate_id: int, records: List[Any]) -> None:
+        """Insert all child records of a candidate into ``table`` with one multi-row insert"""
+        rows = []
+        for record in records:
+            row = record.model_dump()
+            row['candidate_id'] = candidate_id
+            rows.append(row)
+        if rows:
+            self.supabase.table(table).insert(rows).execute()
+
     def _handle_education(self, candidate_id: int, education: List[EducationCreate]) -> None:
         """Handle education records creation"""
         try:
-            for edu in education:
-                edu_data = edu.model_dump()
-                edu_data['candidate_id'] = candidate_id
-                self.supabase.table('education').insert(edu_data).execute()
+            self._insert_related('education', candidate_id, education)
         except Exception as e:
             logger.error(f"Error handling education for candidate {candidate_id}: {str(e)}")
             raise
 
     def _handle_work_experience(self, candidate_id: int, experience: List[WorkExperienceCreate]) -> None:
-        """Handle work experience records creation"""
+        """Handle work experience records creation and materialize the candidate's experience years"""
         try:
-            for exp in experience:
-                exp_data = exp.model_dump()
-                exp_data['candidate_id'] = candidate_id
-                self.supabase.table('work_experience').insert(exp_data).execute()
+            self._insert_related('work_experience', candidate_id, experience)
+            # ``experience`` is the candidate's full history here, so no read-back is needed
+            self.store_experience_years(candidate_id, compute_experience_years(experience))
         except Exception as e:
             logger.error(f"Error handling work experience for candidate {candidate_id}: {str(e)}")
             raise
 
+    def store_experience_years(self, candidate_id: int, years: ExperienceYears) -> None:
+        """Write the experience aggregate used by min_experience_years filtering"""
+        self.supabase.table('candidates')\
+            .update(years.to_row())\
+            .eq('id', candidate_id)\
+            .execute()
+
+    def refresh_experience_years(self, candidate_id: int) -> ExperienceYears:
+        """Recompute a candidate's experience aggregate from its stored work experience"""
+        try:
+            result = self.supabase.table('work_experience')\
+                .select('start_date, end_date')\
+                .eq('candidate_id', candidate_id)\
+                .execute()
+            years = compute_experience_years(result.data or [])
+            self.store_experience_years(candidate_id, years)
+            return years
+        except Exception as e:
+            logger.error(f"Error refreshing experience years for candidate {candidate_id}: {str(e)}")
+            raise
+
+    def backfill_experience_years(self, page_size: int = 1000) -> int:
+        """
+        Materialize experience years for every candidate, e.g. after adding the columns.
+        Candidates without any work history get a zero aggregate.
+        Returns the number of candidates updated.
+        """
+        try:
+            histories: Dict[int, List[Dict[str, Any]]] = {}
+            start = 0
+            while True:
+                result = self.supabase.table('work_experience')\
+                    .select('candidate_id, start_date, end_date')\
+                    .order('id')\
+                    .range(start, start + page_size - 1)\
+                    .execute()
+                rows = result.data or []
+                for row in rows:
+                    histories.setdefault(row['candidate_id'], []).append(row)
+                if len(rows) < page_size:
+                    break
+                start += page_size
+            
+            for candidate_id, history in histories.items():
+                self.store_experience_years(candidate_id, compute_experience_years(history))
+            # Every candidate with a history has its columns now; the rest have no experience
+            result = self.supabase.table('candidates')\
+                .update(compute_experience_years([]).to_row())\
+                .is_('merged_experience_years', 'null')\
+                .execute()
+            hydrated_candidates.clear()
+            query_results.invalidate()
+            return len(histories) + len(result.data or [])
+        except Exception as e:
+            logger.error(f"Error backfilling experience years: {str(e)}")
+            raise
+
     def _handle_certifications(self, candidate_id: int, certifications: List[CertificationCreate]) -> None:
         """Handle certification records creation"""
         try:
-            for cert in certifications:
-                cert_data = cert.model_dump()
-                cert_data['candidate_id'] = candidate_id
-                self.supabase.table('certifications').insert(cert_data).execute()
+            self._insert_related('certifications', candidate_id, certifications)
         except Exception as e:
             logger.error(f"Error handling certifications for candidate {candidate_id}: {str(e)}")
             raise
@@ -220,10 +509,7 @@ class CandidateService:
     def _handle_projects(self, candidate_id: int, projects: List[ProjectCreate]) -> None:
         """Handle project records creation"""
         try:
-            for project in projects:
-                project_data = project.model_dump()
-                project_data['candidate_id'] = candidate_id
-                self.supabase.table('projects').insert(project_data).execute()
+            self._insert_related('projects', candidate_id, projects)
         except Exception as e:
             logger.error(f"Error handling projects for candidate {candidate_id}: {str(e)}")
             raise
@@ -234,14 +520,19 @@ class CandidateService:
             # Generate embeddings
             experience_embedding, skills_embedding = generate_embeddings(cv_text)
             
-            # Update candidate with embeddings
+            # Update candidate with embeddings, sent as float32-precision pgvector literals
             self.supabase.table('candidates')\
                 .update({
-                    'experience_embedding': experience_embedding,
-                    'skills_embedding': skills_embedding
+                    'experience_embedding': format_pgvector(experience_embedding),
+                    'skills_embedding': format_pgvector(skills_embedding)
                 })\
                 .eq('id', candidate_id)\
                 .execute()
+            
+            # Keep this worker's vector index in sync without a full reload
+            index = get_loaded_candidate_index()
+            if index is not None:
+                index.upsert(candidate_id, experience_embedding, skills_embedding)
                 
         except Exception as e:
             logger.error(f"Error generating embeddings for candidate {candidate_id}: {str(e)}")
@@ -1,22 +1,123 @@
 import fitz  # PyMuPDF
 import logging
-from typing import Optional, Union
+import mmap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
 import os
 import io
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Documents shorter than this are always extracted in-process; a process
+# pool only pays for itself on long documents.
+PARALLEL_MIN_PAGES = 32
+# Pages handed to each pool task
+PAGES_PER_TASK = 8
+
+# A file path, or the PDF content in any buffer; buffers are handed to PyMuPDF as they are
+PDFSource = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def get_page_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for page-parallel extraction, created on first use and shared afterwards."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=workers)
+        return _page_pool
+
+
+def _open_document(source: PDFSource) -> fitz.Document:
+    if isinstance(source, str):
+        return fitz.open(source)
+    if isinstance(source, mmap.mmap):
+        # PyMuPDF takes buffers but not mmap objects; a memoryview over the map is not a copy
+        source = memoryview(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _clean_page_text(text: str) -> str:
+    """Single-pass cleanup of one page: drop NUL bytes and collapse all whitespace to single spaces."""
+    return ' '.join(text.replace('\x00', '').split())
+
+
+def _extract_page_range(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    """Cleaned text of pages [start, stop); runs in a pool worker, so it opens its own document."""
+    doc = _open_document(source)
+    try:
+        return [_clean_page_text(doc[number].get_text()) for number in range(start, stop)]
+    finally:
+        doc.close()
+
+@dataclass
+class PDFInspection:
+    """What CVProcessor.inspect learned from one open of a PDF."""
+    valid: bool
+    page_count: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+class OpenedPDF:
+    """
+    A PDF opened once, for callers that validate, read metadata and extract
+    text from the same document. Use as a context manager; pages are
+    extracted lazily by ``pages()``.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+
+    def __enter__(self) -> "OpenedPDF":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.doc.close()
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {key: value for key, value in (self.doc.metadata or {}).items() if value}
+
+    def validate(self) -> None:
+        """Raise if the document cannot be read (its first page is parsed, as validate_pdf does)."""
+        if self.doc.page_count > 0:
+            self.doc[0].get_text()
+
+    def pages(self) -> Iterator[str]:
+        """Cleaned text of each page, in order."""
+        for page in self.doc:
+            yield _clean_page_text(page.get_text())
+
+    def text(self) -> str:
+        return ' '.join(page for page in self.pages() if page)
+
+
 class CVProcessor:
     def __init__(self):
         self.supported_extensions = {'.pdf'}
     
-    def extract_text(self, file_path_or_bytes: Union[str, bytes]) -> str:
+    def extract_text(self, file_path_or_bytes: PDFSource) -> str:
         """
         Extract text from a PDF file or bytes.
         
         Args:
-            file_path_or_bytes: Either a path to the PDF file or bytes content of the PDF
+            file_path_or_bytes: Either a path to the PDF file or the PDF content as
+                bytes, bytearray, memoryview or mmap
             
         Returns:
             str: Extracted text from the PDF
@@ -28,7 +129,7 @@ class CVProcessor:
         """
         if isinstance(file_path_or_bytes, str):
             return self._extract_text_from_file(file_path_or_bytes)
-        elif isinstance(file_path_or_bytes, bytes):
+        elif isinstance(file_path_or_bytes, _BUFFER_TYPES):
             return self._extract_text_from_bytes(file_path_or_bytes)
         else:
             raise ValueError("Input must be either a file path (str) or bytes")
@@ -53,11 +154,11 @@ class CVProcessor:
             logger.error(f"Error processing PDF {file_path}: {str(e)}")
             raise
     
-    def _extract_text_from_bytes(self, pdf_bytes: bytes) -> str:
+    def _extract_text_from_bytes(self, pdf_bytes: PDFSource) -> str:
         """Extract text from PDF bytes."""
         try:
             # Open the PDF from bytes
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            doc = _open_document(pdf_bytes)
             text = self._extract_text_from_doc(doc)
             doc.close()
             return text
@@ -67,39 +168,110 @@ class CVProcessor:
             raise
     
     def _extract_text_from_doc(self, doc: fitz.Document) -> str:
-        """Extract and clean text from a PyMuPDF document."""
-        text = ""
+        """Extract and clean text from a PyMuPDF document, joining the cleaned pages once."""
+        return self._join_pages(self._iter_doc_pages(doc))
+    
+    def _iter_doc_pages(self, doc: fitz.Document) -> Iterator[str]:
         for page in doc:
-            text += page.get_text()
-        
-        return self._clean_text(text)
+            yield _clean_page_text(page.get_text())
+    
+    def _join_pages(self, pages: Iterator[str]) -> str:
+        return ' '.join(page for page in pages if page)
     
-    def _clean_text(self, text: str) -> str:
+    def iter_pages(self, file_path_or_bytes: PDFSource, workers: int = 0) -> Iterator[str]:
         """
-        Clean and normalize extracted text.
+        Yield the cleaned text of each page in order, without building the whole text.
         
         Args:
-            text: Raw extracted text
+            file_path_or_bytes: Either a path to the PDF file or the PDF content as
+                bytes, bytearray, memoryview or mmap
+            workers: With 2 or more, documents of at least PARALLEL_MIN_PAGES pages are
+                extracted across a process pool, PAGES_PER_TASK pages per task
             
-        Returns:
-            str: Cleaned text
+        Raises:
+            ValueError: If input type or file format is not supported
+            FileNotFoundError: If file does not exist (when using file path)
         """
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        self._check_source(file_path_or_bytes)
         
-        # Remove special characters that might interfere with processing
-        text = text.replace('\x00', '')
-        
-        # Normalize line endings
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        doc = _open_document(file_path_or_bytes)
+        try:
+            page_count = doc.page_count
+            if workers < 2 or page_count < PARALLEL_MIN_PAGES:
+                yield from self._iter_doc_pages(doc)
+                return
+        finally:
+            doc.close()
         
-        # Remove multiple consecutive newlines
-        while '\n\n\n' in text:
-            text = text.replace('\n\n\n', '\n\n')
+        # Workers re-open the document; each task covers a contiguous page range.
+        # Views and maps cannot be pickled, so only this path takes a copy of a buffer.
+        source = file_path_or_bytes if isinstance(file_path_or_bytes, (str, bytes)) else bytes(file_path_or_bytes)
+        pool = get_page_extraction_pool(workers)
+        futures = [
+            pool.submit(_extract_page_range, source, start, min(start + PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PAGES_PER_TASK)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def extract_text_streaming(self, file_path_or_bytes: PDFSource, workers: int = 0) -> str:
+        """
+        Extract text page by page (see iter_pages) and join it once.
+        Produces the same text as extract_text; with workers >= 2, long documents
+        are extracted in parallel.
+        """
+        try:
+            return self._join_pages(self.iter_pages(file_path_or_bytes, workers=workers))
+        except Exception as e:
+            logger.error(f"Error streaming PDF text: {str(e)}")
+            raise
+    
+    def _check_source(self, file_path_or_bytes: PDFSource) -> None:
+        if isinstance(file_path_or_bytes, str):
+            if not os.path.exists(file_path_or_bytes):
+                raise FileNotFoundError(f"File not found: {file_path_or_bytes}")
+            file_ext = os.path.splitext(file_path_or_bytes)[1].lower()
+            if file_ext not in self.supported_extensions:
+                raise ValueError(f"Unsupported file format: {file_ext}")
+        elif not isinstance(file_path_or_bytes, _BUFFER_TYPES):
+            raise ValueError("Input must be either a file path (str) or bytes")
+    
+    def open(self, file_path_or_bytes: PDFSource) -> OpenedPDF:
+        """
+        Open a PDF once for validation, metadata and text (see OpenedPDF).
         
-        return text.strip()
+        Raises:
+            ValueError: If input type or file format is not supported
+            FileNotFoundError: If file does not exist (when using file path)
+            Exception: If PyMuPDF cannot open the document
+        """
+        self._check_source(file_path_or_bytes)
+        return OpenedPDF(_open_document(file_path_or_bytes))
+    
+    def inspect(self, file_path_or_bytes: PDFSource, extract_text: bool = True) -> PDFInspection:
+        """
+        Validate a PDF and read its page count, metadata and (optionally) text,
+        parsing the document only once. Never raises for unreadable PDFs:
+        they come back with valid=False and the error.
+        """
+        try:
+            with self.open(file_path_or_bytes) as pdf:
+                pdf.validate()
+                return PDFInspection(
+                    valid=True,
+                    page_count=pdf.page_count,
+                    metadata=pdf.metadata,
+                    text=pdf.text() if extract_text else None
+                )
+        except Exception as e:
+            logger.error(f"PDF inspection failed: {str(e)}")
+            return PDFInspection(valid=False, error=str(e))
     
-    def validate_pdf(self, file_path_or_bytes: Union[str, bytes]) -> bool:
+    def validate_pdf(self, file_path_or_bytes: PDFSource) -> bool:
         """
         Validate if a PDF file is readable and not corrupted.
         
@@ -109,17 +281,4 @@ class CVProcessor:
         Returns:
             bool: True if PDF is valid, False otherwise
         """
-        try:
-            if isinstance(file_path_or_bytes, str):
-                doc = fitz.open(file_path_or_bytes)
-            else:
-                doc = fitz.open(stream=file_path_or_bytes, filetype="pdf")
-                
-            # Try to read the first page
-            if doc.page_count > 0:
-                doc[0].get_text()
-            doc.close()
-            return True
-        except Exception as e:
-            logger.error(f"PDF validation failed: {str(e)}")
-            return False 
\ No newline at end of file
+        return self.inspect(file_path_or_bytes, extract_text=False).valid
@@ -0,0 +1,183 @@
+import argparse
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional
+import numpy as np
+from supabase import Client
+from app.core.config import settings
+from app.services.vector_scoring import parse_embedding
+
+logger = logging.getLogger(__name__)
+
+REDUCER_METHODS = ('pca', 'random')
+
+DEFAULT_REDUCER_PATH = os.path.join('.cache', 'embedding_reducer.npz')
+
+
+class EmbeddingReducer:
+    """
+    Linear projection of embeddings to fewer dimensions: ``(x - mean) @ components``.
+
+    The same reducer is applied to candidate and query embeddings so that
+    cosine similarity stays comparable. Its ``version`` is derived from the
+    projection itself, so an index can tell which projection produced the
+    vectors it holds and rebuild when that changes.
+    """
+
+    def __init__(self, method: str, components: np.ndarray, mean: Optional[np.ndarray] = None):
+        if method not in REDUCER_METHODS:
+            raise ValueError(f"method must be one of {', '.join(REDUCER_METHODS)}")
+        self.method = method
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        digest = hashlib.sha256(self.components.tobytes())
+        if self.mean is not None:
+            digest.update(self.mean.tobytes())
+        self.version = f"{method}-{self.input_dim}x{self.output_dim}-{digest.hexdigest()[:12]}"
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def output_dim(self) -> int:
+        return self.components.shape[1]
+
+    @classmethod
+    def fit_pca(cls, vectors: np.ndarray, dims: int) -> 'EmbeddingReducer':
+        """Keep the ``dims`` principal components of ``vectors`` (one embedding per row)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if dims > min(vectors.shape):
+            raise ValueError(f"Cannot fit {dims} components on {vectors.shape[0]} x {vectors.shape[1]} vectors")
+        mean = vectors.mean(axis=0)
+        # Eigenvectors of the covariance: d x d, independent of the sample size
+        centered = vectors - mean
+        covariance = (centered.T @ centered).astype(np.float64) / max(1, len(vectors) - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:dims]
+        return cls('pca', eigenvectors[:, order], mean)
+
+    @classmethod
+    def random_projection(cls, input_dim: int, dims: int, seed: int = 0) -> 'EmbeddingReducer':
+        """Gaussian random projection; needs no training data and roughly preserves angles."""
+        rng = np.random.default_rng(seed)
+        components = rng.normal(scale=1.0 / np.sqrt(dims), size=(input_dim, dims))
+        return cls('random', components)
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Project one vector or a matrix of row vectors.
+
+        Raises:
+            ValueError: If the vectors do not have the reducer's input dimension
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[-1] != self.input_dim:
+            raise ValueError(
+                f"Embedding has {vectors.shape[-1]} dimensions, reducer {self.version} expects {self.input_dim}"
+            )
+        projected = (vectors - self.mean if self.mean is not None else vectors) @ self.components
+        # All-zero placeholder embeddings (failed generation) must stay zero rather than become -mean
+        projected[~vectors.any(axis=-1)] = 0.0
+        return projected
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        arrays = {'method': np.array(self.method), 'components': self.components}
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        with open(path, 'wb') as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'EmbeddingReducer':
+        with np.load(path) as data:
+            mean = data['mean'] if 'mean' in data.files else None
+            return cls(str(data['method']), data['components'], mean)
+
+
+def sample_candidate_embeddings(supabase: Client, sample_size: int = 20000, page_size: int = 1000) -> np.ndarray:
+    """Up to ``sample_size`` experience and skills embeddings of existing candidates, one per row."""
+    vectors = []
+    start = 0
+    while len(vectors) < sample_size:
+        result = supabase.table('candidates')\
+            .select('experience_embedding, skills_embedding')\
+            .order('id')\
+            .range(start, start + page_size - 1)\
+            .execute()
+        rows = result.data or []
+        for row in rows:
+            for kind in ('experience_embedding', 'skills_embedding'):
+                vector = parse_embedding(row.get(kind))
+                # Zero vectors are the placeholder for failed embeddings; they carry no signal
+                if vector is not None and vector.any():
+                    vectors.append(vector)
+        if len(rows) < page_size:
+            break
+        start += page_size
+    if not vectors:
+        raise ValueError("No candidate embeddings to fit a reducer on")
+    return np.vstack(vectors[:sample_size])
+
+
+_embedding_reducer: Optional[EmbeddingReducer] = None
+_embedding_reducer_configured = False
+_embedding_reducer_lock = threading.Lock()
+
+
+def get_embedding_reducer() -> Optional[EmbeddingReducer]:
+    """
+    Return the process-wide reducer loaded from settings.EMBEDDING_REDUCER_PATH,
+    or None (full-dimensional embeddings) when no reducer is configured.
+    """
+    global _embedding_reducer, _embedding_reducer_configured
+    with _embedding_reducer_lock:
+        if not _embedding_reducer_configured:
+            path = getattr(settings, 'EMBEDDING_REDUCER_PATH', None)
+            _embedding_reducer = None
+            if path:
+                try:
+                    _embedding_reducer = EmbeddingReducer.load(path)
+                    logger.info(f"Using embedding reducer {_embedding_reducer.version}")
+                except Exception as e:
+                    # Fall back to full-dimensional search rather than failing it
+                    logger.warning(f"Embedding reducer not loaded from {path}: {str(e)}")
+            _embedding_reducer_configured = True
+        return _embedding_reducer
+
+
+def set_embedding_reducer(reducer: Optional[EmbeddingReducer]) -> None:
+    """Plug in a different reducer, or search full-dimensional embeddings with None."""
+    global _embedding_reducer, _embedding_reducer_configured
+    with _embedding_reducer_lock:
+        _embedding_reducer = reducer
+        _embedding_reducer_configured = True
+
+
+def main() -> None:
+    """Fit a reducer offline on the current candidate pool: python -m app.services.embedding_reducer --dims 256"""
+    from app.core.supabase import get_supabase_client
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--dims', type=int, default=256)
+    parser.add_argument('--method', choices=REDUCER_METHODS, default='pca')
+    parser.add_argument('--sample-size', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=getattr(settings, 'EMBEDDING_REDUCER_PATH', None) or DEFAULT_REDUCER_PATH)
+    args = parser.parse_args()
+
+    vectors = sample_candidate_embeddings(get_supabase_client(), args.sample_size)
+    if args.method == 'pca':
+        reducer = EmbeddingReducer.fit_pca(vectors, args.dims)
+    else:
+        reducer = EmbeddingReducer.random_projection(vectors.shape[1], args.dims, args.seed)
+    reducer.save(args.out)
+    print(f"Saved {reducer.version} fitted on {len(vectors)} embeddings to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
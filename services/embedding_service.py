@@ -1,17 +1,17 @@
-from typing import Tuple, List
-from openai import OpenAI
-from app.core.config import settings
+from typing import Dict, Tuple, List
+import numpy as np
+from app.services.cache.embedding_cache import get_embedding_cache
+from app.services.llm.clients import get_async_openai_client, get_openai_client
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+EMBEDDING_MODEL = "text-embedding-ada-002"
 
-def generate_embeddings(text: str) -> Tuple[List[float], List[float]]:
+def generate_embeddings(text: str) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate experience and skills embeddings for a candidate's CV text.
-    Returns a tuple of (experience_embedding, skills_embedding).
+    Returns a tuple of float32 (experience_embedding, skills_embedding) vectors.
     """
     try:
         # Split the text into experience and skills sections
@@ -19,9 +19,8 @@ def generate_embeddings(text: str) -> Tuple[List[float], List[float]]:
         experience_text = _extract_experience_text(text)
         skills_text = _extract_skills_text(text)
         
-        # Generate embeddings for both sections
-        experience_embedding = _get_embedding(experience_text)
-        skills_embedding = _get_embedding(skills_text)
+        # Generate embeddings for both sections in a single request
+        experience_embedding, skills_embedding = _get_embeddings([experience_text, skills_text])
         
         return experience_embedding, skills_embedding
         
@@ -29,19 +28,28 @@ def generate_embeddings(text: str) -> Tuple[List[float], List[float]]:
         logger.error(f"Error generating embeddings: {str(e)}")
         raise
 
-def generate_query_embeddings(query: str) -> Tuple[List[float], List[float]]:
+def generate_query_embeddings(query: str) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate embeddings for a search query, optimized for both experience and skills matching.
-    Returns a tuple of (experience_embedding, skills_embedding).
+    Returns a tuple of float32 (experience_embedding, skills_embedding) vectors.
     """
     try:
-        # For queries, we use the same text for both embeddings but with different prompts
-        experience_prompt = f"Find candidates with experience in: {query}"
-        skills_prompt = f"Find candidates with skills in: {query}"
+        # Generate embeddings for both aspects in a single request
+        experience_embedding, skills_embedding = _get_embeddings(_query_prompts(query))
         
-        # Generate embeddings for both aspects
-        experience_embedding = _get_embedding(experience_prompt)
-        skills_embedding = _get_embedding(skills_prompt)
+        return experience_embedding, skills_embedding
+        
+    except Exception as e:
+        logger.error(f"Error generating query embeddings: {str(e)}")
+        raise
+
+async def agenerate_query_embeddings(query: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Async variant of generate_query_embeddings that does not block the event loop.
+    Returns a tuple of float32 (experience_embedding, skills_embedding) vectors.
+    """
+    try:
+        experience_embedding, skills_embedding = await _aget_embeddings(_query_prompts(query))
         
         return experience_embedding, skills_embedding
         
@@ -49,18 +57,75 @@ def generate_query_embeddings(query: str) -> Tuple[List[float], List[float]]:
         logger.error(f"Error generating query embeddings: {str(e)}")
         raise
 
-def _get_embedding(text: str) -> List[float]:
-    """Get embeddings for a text using OpenAI's API"""
+def _query_prompts(query: str) -> List[str]:
+    """For queries, we use the same text for both embeddings but with different prompts"""
+    return [
+        f"Find candidates with experience in: {query}",
+        f"Find candidates with skills in: {query}"
+    ]
+
+def _get_embedding(text: str) -> np.ndarray:
+    """Get embeddings for a text using OpenAI's API, served from the embedding cache when possible"""
+    return _get_embeddings([text])[0]
+
+def _get_embeddings(texts: List[str]) -> List[np.ndarray]:
+    """
+    Get embeddings for several texts with one OpenAI request.
+    Cached texts are not sent; results come back in the order of ``texts``.
+    """
+    try:
+        embeddings, missing = _lookup_cached(texts)
+        if missing:
+            response = get_openai_client().embeddings.create(
+                input=missing,
+                model=EMBEDDING_MODEL
+            )
+            embeddings.update(_store_fetched(missing, response))
+        return [embeddings[text] for text in texts]
+    except Exception as e:
+        logger.error(f"Error getting embeddings from OpenAI: {str(e)}")
+        raise
+
+async def _aget_embeddings(texts: List[str]) -> List[np.ndarray]:
+    """Async variant of _get_embeddings"""
     try:
-        response = client.embeddings.create(
-            input=text,
-            model="text-embedding-ada-002"
-        )
-        return response.data[0].embedding
+        embeddings, missing = _lookup_cached(texts)
+        if missing:
+            response = await get_async_openai_client().embeddings.create(
+                input=missing,
+                model=EMBEDDING_MODEL
+            )
+            embeddings.update(_store_fetched(missing, response))
+        return [embeddings[text] for text in texts]
     except Exception as e:
-        logger.error(f"Error getting embedding from OpenAI: {str(e)}")
+        logger.error(f"Error getting embeddings from OpenAI: {str(e)}")
         raise
 
+def _lookup_cached(texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """Split ``texts`` into cached embeddings and the unique texts that still need a request"""
+    cache = get_embedding_cache()
+    cached = {}
+    if cache is not None:
+        try:
+            cached = cache.get_arrays(EMBEDDING_MODEL, texts)
+        except Exception as e:
+            # A failing cache read is a miss; caching must never fail a request
+            logger.warning(f"Embedding cache read failed: {str(e)}")
+    missing = list(dict.fromkeys(text for text in texts if text not in cached))
+    return cached, missing
+
+def _store_fetched(texts: List[str], response) -> Dict[str, np.ndarray]:
+    """Map an embeddings response back onto its input texts and cache the results"""
+    # The API tags every embedding with the index of its input; keep them as float32 from here on
+    fetched = {texts[item.index]: np.asarray(item.embedding, dtype=np.float32) for item in response.data}
+    cache = get_embedding_cache()
+    if cache is not None:
+        try:
+            cache.set_many(EMBEDDING_MODEL, fetched)
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+    return fetched
+
 def _extract_experience_text(text: str) -> str:
     """
     Extract the experience-related text from the CV.
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DAYS_PER_YEAR = 365.25
+
+
+@dataclass
+class ExperienceYears:
+    """
+    Per-candidate work experience aggregate, materialized on the candidates row.
+
+    total_years sums every position (overlaps counted twice); merged_years
+    merges overlapping positions first. Both are as of ``as_of``. When a
+    position is ongoing, merged years keep growing one year per year, which is
+    captured by ``anchor_date``: merged years on any later day D are
+    (D - anchor_date) / 365.25, so "at least N years" stays a range lookup.
+    """
+    total_years: float
+    merged_years: float
+    anchor_date: Optional[date]
+    as_of: date
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            'total_experience_years': round(self.total_years, 3),
+            'merged_experience_years': round(self.merged_years, 3),
+            'experience_anchor_date': self.anchor_date.isoformat() if self.anchor_date else None
+        }
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        return None
+
+
+def _intervals(work_experience: Iterable[Any], today: date) -> Tuple[List[Tuple[date, date]], bool]:
+    """Return the (start, end) of every dated position, clipped to today, and whether any is ongoing."""
+    intervals = []
+    ongoing = False
+    for record in work_experience:
+        if not isinstance(record, dict):
+            record = record.model_dump()
+        start = _to_date(record.get('start_date'))
+        end = _to_date(record.get('end_date'))
+        if start is None or start >= today:
+            continue
+        if end is None:
+            ongoing = True
+            end = today
+        end = min(end, today)
+        if end > start:
+            intervals.append((start, end))
+    return intervals, ongoing
+
+
+def compute_experience_years(work_experience: Iterable[Any], today: Optional[date] = None) -> ExperienceYears:
+    """
+    Aggregate a candidate's full work history (dicts or WorkExperienceCreate models).
+    Positions without an end date are treated as ongoing.
+    """
+    today = today or date.today()
+    intervals, ongoing = _intervals(work_experience, today)
+    intervals.sort()
+
+    total_days = sum((end - start).days for start, end in intervals)
+
+    merged: List[List[date]] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    merged_days = sum((end - start).days for start, end in merged)
+
+    anchor_date = None
+    if ongoing:
+        # Ongoing: shift the start of the open interval back by all closed experience
+        anchor_date = today - timedelta(days=merged_days)
+
+    return ExperienceYears(
+        total_years=total_days / DAYS_PER_YEAR,
+        merged_years=merged_days / DAYS_PER_YEAR,
+        anchor_date=anchor_date,
+        as_of=today
+    )
+
+
+def min_experience_filter(min_years: float, today: Optional[date] = None) -> str:
+    """
+    PostgREST ``or`` filter matching candidates with at least ``min_years`` of
+    merged experience today, using the materialized columns only.
+    """
+    today = today or date.today()
+    cutoff = today - timedelta(days=min_years * DAYS_PER_YEAR)
+    return f"merged_experience_years.gte.{min_years},experience_anchor_date.lte.{cutoff.isoformat()}"
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.ingestion.pipeline import (
+    upload_to_drive,
+    discard_drive_file,
+    extract_cv_text,
+    extract_candidate,
+    save_candidate
+)
+from app.services.ingestion.dedup import get_upload_registry
+
+logger = logging.getLogger(__name__)
+
+_text_pool: Optional[ProcessPoolExecutor] = None
+_text_pool_lock = threading.Lock()
+
+
+def get_text_extraction_pool() -> ProcessPoolExecutor:
+    """Process pool for PDF text extraction, shared by every batch in this worker."""
+    global _text_pool
+    with _text_pool_lock:
+        if _text_pool is None:
+            _text_pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return _text_pool
+
+
+class StageTimer:
+    """
+    Counts items through one pipeline stage, the wall-clock span it was active
+    and the summed per-item latency (including time queued for a worker).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.failures = 0
+        self.latency_seconds = 0.0
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+
+    async def run(self, awaitable, items: int = 1):
+        started = time.perf_counter()
+        if self.first_start is None:
+            self.first_start = started
+        try:
+            result = await awaitable
+            self.items += items
+            return result
+        except Exception:
+            self.failures += items
+            raise
+        finally:
+            ended = time.perf_counter()
+            self.latency_seconds += ended - started
+            self.last_end = ended if self.last_end is None else max(self.last_end, ended)
+
+    def summary(self) -> Dict[str, Any]:
+        span = (self.last_end - self.first_start) if self.first_start is not None else 0.0
+        return {
+            'items': self.items,
+            'failures': self.failures,
+            'wall_seconds': round(span, 3),
+            'latency_seconds': round(self.latency_seconds, 3),
+            'items_per_second': round(self.items / span, 2) if span > 0 else None
+        }
+
+
+class _StageError(Exception):
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(str(error))
+        self.stage = stage
+
+
+class BatchIngestionPipeline:
+    """
+    Staged ingestion for many CVs at once.
+
+    - PDF text extraction runs in a process pool (CPU-bound).
+    - Drive uploads, LLM extraction and candidate writes each run in their
+      own thread pool, sized by ``drive_concurrency``, ``llm_concurrency``
+      and ``db_concurrency``, so a slow stage cannot take every worker from
+      the others. A CV's Drive upload starts once its text is known not to
+      be a duplicate and overlaps with its own LLM extraction.
+    - Candidates are written one per call (the CRUD layer creates a
+      candidate and its related rows together), at most ``db_concurrency``
+      at a time.
+
+    CVs already ingested (same PDF bytes, or same extracted text) are
+    answered from the upload registry before their Drive upload or LLM call.
+    Files with identical bytes within one batch are ingested once and share
+    the result. A CV that fails after its Drive upload started has the
+    uploaded file deleted again.
+
+    One CV failing never stops the others; failures are reported per file
+    together with the stage they failed in.
+    """
+
+    def __init__(self, drive_concurrency: int = 4, llm_concurrency: int = 8, db_concurrency: int = 2):
+        self.drive_concurrency = drive_concurrency
+        self.llm_concurrency = llm_concurrency
+        self.db_concurrency = db_concurrency
+
+    async def run(self, files: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        """
+        Ingest ``files`` given as (filename, content) pairs.
+
+        Returns:
+            dict with successful_uploads, failed_uploads and per-stage stage_stats
+        """
+        loop = asyncio.get_running_loop()
+        text_pool = get_text_extraction_pool()
+        pools = {
+            'registry': ThreadPoolExecutor(max_workers=2, thread_name_prefix='cv-batch-registry'),
+            'drive_upload': ThreadPoolExecutor(max_workers=self.drive_concurrency, thread_name_prefix='cv-batch-drive'),
+            'llm_extraction': ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix='cv-batch-llm'),
+            'db_write': ThreadPoolExecutor(max_workers=self.db_concurrency, thread_name_prefix='cv-batch-db')
+        }
+        registry = get_upload_registry()
+        timers = {name: StageTimer(name) for name in ('drive_upload', 'text_extraction', 'llm_extraction', 'db_write')}
+        results: Dict[int, Any] = {}
+        errors: Dict[int, Dict[str, str]] = {}
+        duplicates = 0
+
+        async def find_existing(lookup: str, value) -> Optional[Any]:
+            """Run an upload registry lookup ('lookup_content' or 'lookup_text') off the event loop."""
+            if registry is None:
+                return None
+            try:
+                return await loop.run_in_executor(pools['registry'], getattr(registry, lookup), value)
+            except Exception as e:
+                logger.warning(f"Upload registry lookup failed: {str(e)}")
+                return None
+
+        def write_candidate(filename: str, content: bytes, cv_text: str, candidate_data, file_id: str, embeddings: dict):
+            candidate = save_candidate(candidate_data, file_id, embeddings)
+            if registry is not None:
+                try:
+                    registry.record(content, cv_text, candidate)
+                except Exception as e:
+                    logger.warning(f"Could not record {filename} in the upload registry: {str(e)}")
+            return candidate
+
+        async def prepare(position: int, filename: str, content: bytes) -> None:
+            nonlocal duplicates
+            existing = await find_existing('lookup_content', content)
+            if existing is not None:
+                results[position] = existing
+                duplicates += 1
+                return
+
+            try:
+                cv_text = await timers['text_extraction'].run(
+                    loop.run_in_executor(text_pool, extract_cv_text, content)
+                )
+            except Exception as e:
+                errors[position] = {'filename': filename, 'stage': 'text_extraction', 'error': str(e)}
+                return
+            existing = await find_existing('lookup_text', cv_text)
+            if existing is not None:
+                results[position] = existing
+                duplicates += 1
+                return
+
+            # Only a CV that is not a duplicate goes to Drive; the upload overlaps with its LLM extraction
+            drive_upload = asyncio.ensure_future(
+                timers['drive_upload'].run(loop.run_in_executor(pools['drive_upload'], upload_to_drive, content, filename))
+            )
+            try:
+                try:
+                    candidate_data, embeddings = await timers['llm_extraction'].run(
+                        loop.run_in_executor(pools['llm_extraction'], extract_candidate, cv_text)
+                    )
+                except Exception as e:
+                    raise _StageError('llm_extraction', e)
+                try:
+                    file_id = await drive_upload
+                except Exception as e:
+                    raise _StageError('drive_upload', e)
+                try:
+                    results[position] = await timers['db_write'].run(loop.run_in_executor(
+                        pools['db_write'], write_candidate, filename, content, cv_text, candidate_data, file_id, embeddings
+                    ))
+                except Exception as e:
+                    raise _StageError('db_write', e)
+            except _StageError as e:
+                errors[position] = {'filename': filename, 'stage': e.stage, 'error': str(e)}
+                # A running executor job cannot be cancelled: wait for the upload, then delete the file
+                try:
+                    file_id = await drive_upload
+                except Exception:
+                    return
+                await loop.run_in_executor(pools['drive_upload'], discard_drive_file, file_id, filename)
+
+        # Identical bytes within the batch are ingested once; the copies share the first file's outcome
+        first_positions: Dict[str, int] = {}
+        copies: Dict[int, int] = {}
+        for position, (filename, content) in enumerate(files):
+            digest = hashlib.sha256(content).hexdigest()
+            if digest in first_positions:
+                copies[position] = first_positions[digest]
+            else:
+                first_positions[digest] = position
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*[
+                prepare(position, *files[position])
+                for position in first_positions.values()
+            ])
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=False)
+
+        for position, original in copies.items():
+            if original in results:
+                results[position] = results[original]
+                duplicates += 1
+            elif original in errors:
+                errors[position] = {**errors[original], 'filename': files[position][0]}
+
+        stage_stats = {name: timer.summary() for name, timer in timers.items()}
+        stage_stats['total'] = {
+            'items': len(results),
+            'duplicates': duplicates,
+            'failures': len(errors),
+            'wall_seconds': round(time.perf_counter() - started, 3)
+        }
+        logger.info(f"Batch ingestion of {len(files)} CVs: {stage_stats}")
+
+        return {
+            'successful_uploads': [results[position] for position in sorted(results)],
+            'failed_uploads': [errors[position] for position in sorted(errors)],
+            'stage_stats': stage_stats
+        }
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, List, Optional
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.services.cache.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = os.path.join('.cache', 'uploads.sqlite3')
+
+
+def content_key(content: bytes) -> str:
+    return f"pdf:{hashlib.sha256(content).hexdigest()}"
+
+
+def text_key(cv_text: str) -> str:
+    # Extracted text is already whitespace-collapsed; casefolding also catches re-exports of the same CV
+    return f"text:{hashlib.sha256(cv_text.casefold().encode('utf-8')).hexdigest()}"
+
+
+class UploadRegistry:
+    """
+    Remembers the ingestion result of every CV by the SHA-256 of its PDF
+    bytes and of its extracted text, so a re-upload returns the existing
+    candidate without Drive, LLM or embedding calls.
+
+    Results are stored as JSON in a DiskCache shared by every worker on the host.
+    """
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    def _get(self, key: str) -> Optional[Any]:
+        value = self.store.get(key)
+        return json.loads(value) if value is not None else None
+
+    def lookup_content(self, content: bytes) -> Optional[Any]:
+        """The stored result for byte-identical PDF content, if any."""
+        return self._get(content_key(content))
+
+    def lookup_text(self, cv_text: str) -> Optional[Any]:
+        """The stored result for a PDF with the same extracted text, if any."""
+        if not cv_text:
+            return None
+        return self._get(text_key(cv_text))
+
+    def record(self, content: bytes, cv_text: Optional[str], result: Any) -> None:
+        """Store the result of ingesting ``content`` under its content and text hashes."""
+        value = json.dumps(jsonable_encoder(result)).encode('utf-8')
+        keys = [content_key(content)]
+        if cv_text:
+            keys.append(text_key(cv_text))
+        items = {key: value for key in keys}
+
+        # Remember which keys point at the candidate so deleting it can forget them
+        candidate_id = result.get('id') if isinstance(result, dict) else getattr(result, 'id', None)
+        if candidate_id is not None:
+            items[f"candidate:{candidate_id}"] = json.dumps(keys).encode('utf-8')
+        self.store.set_many(items)
+
+    def forget_candidate(self, candidate_id: int) -> None:
+        """Drop the stored results of a deleted candidate, so its CV is ingested again if re-uploaded."""
+        value = self.store.get(f"candidate:{candidate_id}")
+        if value is None:
+            return
+        keys: List[str] = json.loads(value)
+        for key in keys + [f"candidate:{candidate_id}"]:
+            self.store.delete(key)
+
+    def stats(self):
+        return self.store.stats()
+
+
+_upload_registry: Optional[UploadRegistry] = None
+_upload_registry_configured = False
+_upload_registry_lock = threading.Lock()
+
+
+def get_upload_registry() -> Optional[UploadRegistry]:
+    """
+    Return the process-wide upload registry, creating the default SQLite-backed one on first use.
+    Returns None when deduplication has been disabled with set_upload_registry(None).
+    """
+    global _upload_registry, _upload_registry_configured
+    with _upload_registry_lock:
+        if not _upload_registry_configured:
+            try:
+                _upload_registry = UploadRegistry(DiskCache(
+                    getattr(settings, 'UPLOAD_REGISTRY_PATH', DEFAULT_REGISTRY_PATH),
+                    table='uploads',
+                    max_entries=getattr(settings, 'UPLOAD_REGISTRY_MAX_ENTRIES', 500000),
+                    ttl_seconds=getattr(settings, 'UPLOAD_REGISTRY_TTL_SECONDS', None)
+                ))
+            except Exception as e:
+                # Deduplication is an optimization; never fail an upload because of it
+                logger.warning(f"Upload deduplication disabled: {str(e)}")
+                _upload_registry = None
+            _upload_registry_configured = True
+        return _upload_registry
+
+
+def set_upload_registry(registry: Optional[UploadRegistry]) -> None:
+    """Plug in a different upload registry, or disable deduplication with None."""
+    global _upload_registry, _upload_registry_configured
+    with _upload_registry_lock:
+        _upload_registry = registry
+        _upload_registry_configured = True
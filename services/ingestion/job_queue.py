@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.path.join('.cache', 'ingestion_jobs.sqlite3')
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+
+class JobQueue:
+    """
+    Durable FIFO of CV ingestion jobs stored in SQLite.
+
+    Jobs survive restarts and can be claimed by workers in any process on
+    the host: claiming is a single IMMEDIATE transaction, so a job is only
+    ever handed to one worker. The uploaded PDF is kept with the job until
+    it finishes.
+    """
+
+    def __init__(self, path: str, lease_seconds: int = 900, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(
+            "CREATE TABLE IF NOT EXISTS ingestion_jobs ("
+            "id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload BLOB, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS ingestion_jobs_status ON ingestion_jobs (status, created_at);"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def enqueue(self, content: bytes, filename: str) -> str:
+        """Store an uploaded CV and return the id of its ingestion job."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO ingestion_jobs (id, filename, status, payload, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, filename, JOB_QUEUED, sqlite3.Binary(content), now, now)
+        )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest runnable job, or None if there is none.
+        Jobs left running past their lease (e.g. by a crashed worker) are runnable
+        again; each reclaim counts as an attempt, so a job that keeps crashing its
+        worker fails once it has used max_attempts.
+        """
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                "UPDATE ingestion_jobs SET status = ?, payload = NULL, updated_at = ?, "
+                "error = COALESCE(error, 'Worker lease expired') "
+                "WHERE status = ? AND updated_at < ? AND attempts >= ?",
+                (JOB_FAILED, now, JOB_RUNNING, now - self.lease_seconds, self.max_attempts)
+            )
+            row = connection.execute(
+                "SELECT id, filename, payload, attempts FROM ingestion_jobs "
+                "WHERE status = ? OR (status = ? AND updated_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (JOB_QUEUED, JOB_RUNNING, now - self.lease_seconds)
+            ).fetchone()
+            if row is None:
+                connection.execute('COMMIT')
+                return None
+            connection.execute(
+                "UPDATE ingestion_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (JOB_RUNNING, now, row['id'])
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return {
+            'id': row['id'],
+            'filename': row['filename'],
+            'content': bytes(row['payload']),
+            'attempts': row['attempts'] + 1
+        }
+
+    def complete(self, job_id: str, result: Any) -> None:
+        self._connection().execute(
+            "UPDATE ingestion_jobs SET status = ?, result = ?, payload = NULL, error = NULL, updated_at = ? "
+            "WHERE id = ?",
+            (JOB_SUCCEEDED, json.dumps(jsonable_encoder(result)), time.time(), job_id)
+        )
+
+    def fail(self, job_id: str, error: str, attempts: int) -> None:
+        """Record a failure; the job is re-queued until it has used max_attempts."""
+        final = attempts >= self.max_attempts
+        self._connection().execute(
+            "UPDATE ingestion_jobs SET status = ?, error = ?, updated_at = ?"
+            + (", payload = NULL" if final else "")
+            + " WHERE id = ?",
+            (JOB_FAILED if final else JOB_QUEUED, error, time.time(), job_id)
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the public status of a job, or None if it does not exist."""
+        row = self._connection().execute(
+            "SELECT id, filename, status, result, error, attempts, created_at, updated_at "
+            "FROM ingestion_jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row['id'],
+            'filename': row['filename'],
+            'status': row['status'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) AS n FROM ingestion_jobs GROUP BY status"
+        ).fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+
+class IngestionWorkerPool:
+    """Background threads that claim jobs from a JobQueue and run ``handler(content, filename)`` on them."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[bytes, str], Any],
+        workers: int = 4,
+        poll_interval: float = 1.0
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'cv-ingest-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued in this process."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                logger.error(f"Error claiming ingestion job: {str(e)}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._process(job)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        try:
+            result = self.handler(job['content'], job['filename'])
+            self.queue.complete(job['id'], result)
+        except Exception as e:
+            logger.error(f"Ingestion job {job['id']} ({job['filename']}) failed: {str(e)}")
+            self.queue.fail(job['id'], str(e), job['attempts'])
+
+
+_ingestion_queue: Optional[JobQueue] = None
+_worker_pool: Optional[IngestionWorkerPool] = None
+_ingestion_lock = threading.Lock()
+
+
+def get_ingestion_queue() -> JobQueue:
+    """Return the process-wide ingestion queue, starting its worker pool if app startup has not."""
+    start_ingestion_workers()
+    return _ingestion_queue
+
+
+def start_ingestion_workers() -> None:
+    """
+    Open the process-wide ingestion queue and start its worker pool.
+    Called at app startup, so jobs queued before a restart resume without waiting for a request.
+    """
+    global _ingestion_queue, _worker_pool
+    with _ingestion_lock:
+        if _ingestion_queue is None:
+            # Imported here so the queue itself does not pull in Drive/LLM dependencies
+            from app.services.ingestion.pipeline import process_cv
+
+            _ingestion_queue = JobQueue(getattr(settings, 'INGESTION_QUEUE_PATH', DEFAULT_QUEUE_PATH))
+            _worker_pool = IngestionWorkerPool(
+                _ingestion_queue,
+                process_cv,
+                workers=getattr(settings, 'INGESTION_WORKERS', 4)
+            )
+        _worker_pool.start()
+
+
+def stop_ingestion_workers(timeout: Optional[float] = None) -> None:
+    """Stop the worker pool at shutdown; jobs still running are reclaimed once their lease expires."""
+    with _ingestion_lock:
+        if _worker_pool is not None:
+            _worker_pool.stop(timeout)
+
+
+def notify_workers() -> None:
+    if _worker_pool is not None:
+        _worker_pool.notify()
@@ -0,0 +1,172 @@
+import io
+import logging
+from typing import Tuple
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaIoBaseUpload
+from app.core.config import settings
+from app.core.supabase import get_supabase_client
+from app.services.candidate_service import CandidateService
+from app.services.cv_processor.processor import CVProcessor
+from app.services.experience import compute_experience_years
+from app.services.llm.extractor import get_information_extractor
+from app.services.ingestion.dedup import get_upload_registry
+from app.schemas.candidate import CandidateCreate
+from app.crud import candidate as candidate_crud
+
+logger = logging.getLogger(__name__)
+
+
+def get_google_drive_service():
+    """Get Google Drive service using a Service Account."""
+    SCOPES = ['https://www.googleapis.com/auth/drive']
+    SERVICE_ACCOUNT_FILE = settings.GOOGLE_DRIVE_CREDENTIALS_FILE
+
+    credentials = service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES
+    )
+    return build('drive', 'v3', credentials=credentials)
+
+
+def upload_to_drive(content: bytes, filename: str) -> str:
+    """Upload a CV to the configured Google Drive folder and return the Drive file ID."""
+    drive_service = get_google_drive_service()
+    file_metadata = {
+        'name': filename,
+        'parents': [settings.GOOGLE_DRIVE_FOLDER_ID]
+    }
+    
+    media = MediaIoBaseUpload(
+        io.BytesIO(content),
+        mimetype='application/pdf',
+        resumable=True
+    )
+    
+    uploaded_file = drive_service.files().create(
+        body=file_metadata,
+        media_body=media,
+        fields='id'
+    ).execute()
+    
+    return uploaded_file.get('id')
+
+
+def delete_from_drive(file_id: str) -> None:
+    """Delete an uploaded CV whose candidate could not be created, so it is not left orphaned in Drive."""
+    get_google_drive_service().files().delete(fileId=file_id).execute()
+
+
+def extract_cv_text(content: bytes) -> str:
+    """
+    Validate PDF bytes and extract their cleaned text, parsing the PDF once.
+    CPU-bound and picklable, so it can run in a process pool.
+    
+    Raises:
+        ValueError: If the content is not a readable PDF
+    """
+    inspection = CVProcessor().inspect(content)
+    if not inspection.valid:
+        raise ValueError(f"Invalid PDF: {inspection.error}")
+    return inspection.text
+
+
+def extract_candidate(cv_text: str, refresh_extraction: bool = False) -> Tuple[CandidateCreate, dict]:
+    """Run LLM extraction and embedding generation on CV text."""
+    extractor = get_information_extractor()
+    candidate_data = extractor.extract_information(cv_text, refresh_cache=refresh_extraction)
+    embeddings = extractor.generate_embeddings(candidate_data, cv_text)
+    return candidate_data, embeddings
+
+
+def save_candidate(candidate_data: CandidateCreate, file_id: str, embeddings: dict):
+    """
+    Attach the Drive file ID and create the candidate profile with its embeddings,
+    then materialize its experience years for min_experience_years filtering and
+    make it searchable in this worker's in-memory indexes.
+    """
+    candidate_data_dict = candidate_data.model_dump()
+    candidate_data_dict['cv_file_id'] = file_id
+    candidate_data = CandidateCreate(**candidate_data_dict)
+    
+    candidate = candidate_crud.create_candidate(
+        candidate_data=candidate_data,
+        embeddings=embeddings
+    )
+    
+    # The CRUD layer does not write the materialized columns; computed from the history in hand
+    candidate_id = candidate.get('id') if isinstance(candidate, dict) else getattr(candidate, 'id', None)
+    if candidate_id is not None:
+        candidate_service = CandidateService(get_supabase_client())
+        try:
+            candidate_service.store_experience_years(
+                candidate_id,
+                compute_experience_years(candidate_data.work_experience or [])
+            )
+        except Exception as e:
+            # The candidate is missed by min_experience_years filters until backfill_experience_years() runs
+            logger.warning(f"Could not store experience years for candidate {candidate_id}: {str(e)}")
+        try:
+            candidate_service.apply_created_candidate(candidate_id, candidate_data, embeddings)
+        except Exception as e:
+            # The candidate exists; it shows up in this worker's searches after the next index refresh
+            logger.warning(f"Could not index candidate {candidate_id}: {str(e)}")
+    return candidate
+
+
+def discard_drive_file(file_id: str, filename: str) -> None:
+    """Delete the Drive copy of a CV whose ingestion failed; a failed delete is only logged."""
+    try:
+        delete_from_drive(file_id)
+    except Exception as e:
+        logger.warning(f"Could not delete orphaned Drive file {file_id} for {filename}: {str(e)}")
+
+
+def process_cv(
+    content: bytes,
+    filename: str,
+    reprocess: bool = False,
+    refresh_extraction: bool = False
+):
+    """
+    Run the full ingestion of one CV: Drive upload, text extraction,
+    LLM extraction, embedding generation and candidate creation.
+    This is blocking; call it from a worker thread, not the event loop.
+    
+    A CV whose bytes or extracted text were ingested before returns the stored
+    result without any outbound calls, unless ``reprocess`` is set.
+    LLM extractions are cached per text chunk; ``refresh_extraction`` ignores
+    the cached ones (e.g. to pick up a model-side fix) and overwrites them.
+    
+    Returns:
+        The created (or previously created) candidate
+    """
+    registry = get_upload_registry()
+    if registry is not None and not reprocess:
+        existing = registry.lookup_content(content)
+        if existing is not None:
+            logger.info(f"Skipping ingestion of {filename}: identical PDF already ingested")
+            return existing
+    
+    cv_text = extract_cv_text(content)
+    if registry is not None and not reprocess:
+        existing = registry.lookup_text(cv_text)
+        if existing is not None:
+            logger.info(f"Skipping ingestion of {filename}: CV with the same text already ingested")
+            registry.record(content, cv_text, existing)
+            return existing
+    
+    file_id = upload_to_drive(content, filename)
+    try:
+        candidate_data, embeddings = extract_candidate(cv_text, refresh_extraction)
+        candidate = save_candidate(candidate_data, file_id, embeddings)
+    except Exception:
+        discard_drive_file(file_id, filename)
+        raise
+    
+    if registry is not None:
+        try:
+            registry.record(content, cv_text, candidate)
+        except Exception as e:
+            # The candidate exists; failing to remember it only costs a future re-ingestion
+            logger.warning(f"Could not record {filename} in the upload registry: {str(e)}")
+    return candidate
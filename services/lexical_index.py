@@ -0,0 +1,316 @@
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from supabase import Client
+from app.services.skill_normalizer import canonical_skill, canonical_skills
+
+logger = logging.getLogger(__name__)
+
+# How long a worker serves its lexical index before reloading it from Supabase.
+# Writes made through CandidateService in the same process are applied immediately.
+LEXICAL_INDEX_REFRESH_SECONDS = 600
+
+# Keeps technology names whole: "c++", "c#", "node.js", ".net"
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+_EMPTY_POSTING = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32))
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the to was were will with '
+    'i me my we our you your he she they them their this these those'.split()
+)
+
+
+# Skills are indexed whole, as one term each, apart from the words of the CV text
+SKILL_TERM_PREFIX = 'skill:'
+# Longest skill name, in words, looked for among the words of a query ("amazon web services")
+MAX_SKILL_WORDS = 3
+
+
+def _words(text: str) -> List[str]:
+    return _TOKEN.findall(unicodedata.normalize('NFKC', text or '').casefold())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of ``text`` without stopwords. Words are kept as written; no skill aliasing."""
+    return [word for word in _words(text) if word not in STOPWORDS]
+
+
+def skill_terms(skills: Iterable[str]) -> List[str]:
+    """One term per skill, under its canonical name ("K8s" -> "skill:kubernetes")."""
+    return [SKILL_TERM_PREFIX + skill for skill in canonical_skills(skills)]
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Terms of a search query: its words, plus a skill term for every run of up to
+    MAX_SKILL_WORDS words, canonicalized, so "aws" matches a candidate's
+    "amazon web services" skill.
+    """
+    words = _words(query)
+    terms = [word for word in words if word not in STOPWORDS]
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(words) - size + 1):
+            skill = canonical_skill(' '.join(words[start:start + size]))
+            if skill and skill not in STOPWORDS:
+                terms.append(SKILL_TERM_PREFIX + skill)
+    return terms
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[List[Tuple[int, float]]],
+    k: int = 60,
+    limit: Optional[int] = None
+) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked (id, score) lists by reciprocal rank: each list contributes
+    1 / (k + rank) for every id it ranks. Only ranks are used, so scores on
+    different scales (cosine, BM25) combine without calibration.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (candidate_id, _) in enumerate(ranking, start=1):
+            fused[candidate_id] = fused.get(candidate_id, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+    return ordered[:limit] if limit is not None else ordered
+
+
+class BM25Index:
+    """
+    In-memory BM25 over candidate CV text and skills.
+
+    CV text contributes its words; each skill contributes one term under its
+    canonical name, so aliases only fold together within the skills field.
+
+    Each term's posting list is kept as parallel numpy arrays (candidate id,
+    term frequency, document length), so scoring a query term is vectorized
+    over its postings and terms are summed with one bincount.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.loaded_at: Optional[float] = None
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._total_length = 0
+        self._doc_lengths: Dict[int, int] = {}
+        self._journal: Optional[List[Tuple]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    @staticmethod
+    def document_terms(cv_text: Optional[str], skills: Iterable[str] = ()) -> List[str]:
+        return tokenize(cv_text) + skill_terms(skills)
+
+    def build(self, documents: Iterable[Tuple[int, List[str]]]) -> None:
+        """Replace the index with (candidate_id, terms) documents (see document_terms)."""
+        grouped: Dict[str, List[Tuple[int, int, int]]] = {}
+        doc_terms: Dict[int, Set[str]] = {}
+        doc_lengths: Dict[int, int] = {}
+        for candidate_id, document in documents:
+            terms = Counter(document)
+            length = sum(terms.values())
+            doc_lengths[candidate_id] = length
+            doc_terms[candidate_id] = set(terms)
+            for term, tf in terms.items():
+                grouped.setdefault(term, []).append((candidate_id, tf, length))
+
+        postings = {}
+        for term, entries in grouped.items():
+            entries.sort()
+            columns = np.asarray(entries, dtype=np.int64)
+            postings[term] = (columns[:, 0], columns[:, 1].astype(np.float32), columns[:, 2].astype(np.float32))
+
+        with self._lock:
+            self._postings = postings
+            self._doc_terms = doc_terms
+            self._doc_lengths = doc_lengths
+            self._total_length = sum(doc_lengths.values())
+            self.loaded_at = time.time()
+
+    def load_from_supabase(self, supabase: Client, page_size: int = 500) -> None:
+        """Load cv_text and skills of every candidate and rebuild the index."""
+        documents = []
+        start = 0
+        while True:
+            result = supabase.table('candidates')\
+                .select('id, cv_text, skills(name)')\
+                .order('id')\
+                .range(start, start + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            for row in rows:
+                skills = [skill['name'] for skill in row.get('skills') or []]
+                documents.append((row['id'], self.document_terms(row.get('cv_text'), skills)))
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        self.build(documents)
+        logger.info(f"Loaded {len(documents)} candidates into the lexical index")
+
+    def start_journal(self) -> None:
+        """Record every following upsert and remove, so they can be replayed onto a rebuilt index."""
+        with self._lock:
+            self._journal = []
+
+    def stop_journal(self) -> None:
+        with self._lock:
+            self._journal = None
+
+    def replay_journal(self, index: 'BM25Index') -> None:
+        """Apply the writes recorded since start_journal() to ``index`` and stop recording."""
+        with self._lock:
+            for operation, args in self._journal or []:
+                getattr(index, operation)(*args)
+            self._journal = None
+
+    def upsert(self, candidate_id: int, document: List[str]) -> None:
+        """Add or replace one candidate's document (see document_terms)."""
+        terms = Counter(document)
+        length = sum(terms.values())
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('upsert', (candidate_id, list(document))))
+            self._remove(candidate_id)
+            for term, tf in terms.items():
+                ids, tfs, lengths = self._postings.get(term, _EMPTY_POSTING)
+                position = np.searchsorted(ids, candidate_id)
+                self._postings[term] = (
+                    np.insert(ids, position, candidate_id),
+                    np.insert(tfs, position, tf),
+                    np.insert(lengths, position, length)
+                )
+            self._doc_terms[candidate_id] = set(terms)
+            self._doc_lengths[candidate_id] = length
+            self._total_length += length
+
+    def remove(self, candidate_id: int) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('remove', (candidate_id,)))
+            self._remove(candidate_id)
+
+    def _remove(self, candidate_id: int) -> None:
+        for term in self._doc_terms.pop(candidate_id, set()):
+            ids, tfs, lengths = self._postings[term]
+            keep = ids != candidate_id
+            if keep.any():
+                self._postings[term] = (ids[keep], tfs[keep], lengths[keep])
+            else:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(candidate_id, 0)
+
+    def matching_ids(self, query: str, candidate_ids: Optional[Set[int]] = None) -> np.ndarray:
+        """Ids of the candidates containing any term of ``query``, restricted to candidate_ids when given."""
+        terms = set(query_terms(query))
+        with self._lock:
+            matched = [self._postings[term][0] for term in terms if term in self._postings]
+        ids = np.unique(np.concatenate(matched)) if matched else np.empty(0, dtype=np.int64)
+        if candidate_ids is not None:
+            ids = ids[np.isin(ids, np.fromiter(candidate_ids, dtype=np.int64, count=len(candidate_ids)))]
+        return ids
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        candidate_ids: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k (candidate_id, bm25 score) for ``query``, best first, ties broken by id.
+        candidate_ids restricts the ranking to that subset (e.g. from filters).
+        """
+        terms = set(query_terms(query))
+        with self._lock:
+            documents = len(self._doc_lengths)
+            if not terms or not documents:
+                return []
+            average_length = self._total_length / documents
+            postings = [self._postings[term] for term in terms if term in self._postings]
+
+        matched_ids, matched_scores = [], []
+        for ids, tfs, lengths in postings:
+            idf = math.log(1.0 + (documents - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+            matched_ids.append(ids)
+            matched_scores.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        if not matched_ids:
+            return []
+
+        unique_ids, inverse = np.unique(np.concatenate(matched_ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(matched_scores))
+        if candidate_ids is not None:
+            allowed = np.isin(unique_ids, np.fromiter(candidate_ids, dtype=np.int64, count=len(candidate_ids)))
+            unique_ids, scores = unique_ids[allowed], scores[allowed]
+
+        order = np.lexsort((unique_ids, -scores))[:k]
+        return [(int(unique_ids[i]), float(scores[i])) for i in order]
+
+
+_lexical_index: Optional[BM25Index] = None
+_lexical_index_refreshing = False
+_lexical_index_lock = threading.Lock()
+
+
+def _refresh_lexical_index(supabase: Client, stale: BM25Index) -> None:
+    """Build a fresh index off the request path and swap it in once it is complete."""
+    global _lexical_index, _lexical_index_refreshing
+    try:
+        # Writes applied to the stale index while loading are replayed onto the fresh one
+        stale.start_journal()
+        fresh = BM25Index()
+        fresh.load_from_supabase(supabase)
+        # Holding the stale index's lock keeps writes out between the replay and the swap
+        with _lexical_index_lock, stale._lock:
+            stale.replay_journal(fresh)
+            if _lexical_index is stale:
+                _lexical_index = fresh
+    except Exception as e:
+        # Keep serving the stale index; the next search past the refresh interval retries
+        logger.error(f"Error refreshing the lexical index: {str(e)}")
+        stale.stop_journal()
+    finally:
+        with _lexical_index_lock:
+            _lexical_index_refreshing = False
+
+
+def get_lexical_index(supabase: Client) -> BM25Index:
+    """
+    Return the process-wide BM25 index, loading it from Supabase on first use.
+    An index older than LEXICAL_INDEX_REFRESH_SECONDS keeps being served while
+    a replacement is built in a background thread (stale-while-revalidate).
+    """
+    global _lexical_index, _lexical_index_refreshing
+    with _lexical_index_lock:
+        if _lexical_index is None or _lexical_index.loaded_at is None:
+            # Nothing to serve yet, so the first load is synchronous
+            _lexical_index = BM25Index()
+            _lexical_index.load_from_supabase(supabase)
+            return _lexical_index
+        index = _lexical_index
+        if time.time() - index.loaded_at > LEXICAL_INDEX_REFRESH_SECONDS and not _lexical_index_refreshing:
+            _lexical_index_refreshing = True
+            threading.Thread(
+                target=_refresh_lexical_index,
+                args=(supabase, index),
+                name='lexical-index-refresh',
+                daemon=True
+            ).start()
+        return index
+
+
+def get_loaded_lexical_index() -> Optional[BM25Index]:
+    """Return the process-wide BM25 index only if it has already been loaded (used to apply writes)."""
+    if _lexical_index is None or _lexical_index.loaded_at is None:
+        return None
+    return _lexical_index
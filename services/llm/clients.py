@@ -0,0 +1,130 @@
+import logging
+import threading
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from langchain_openai import OpenAIEmbeddings
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every OpenAI call in the process
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+HTTP_KEEPALIVE_SECONDS = 60.0
+HTTP_TIMEOUT_SECONDS = 120.0
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=getattr(settings, 'OPENAI_MAX_CONNECTIONS', HTTP_MAX_CONNECTIONS),
+        max_keepalive_connections=getattr(settings, 'OPENAI_MAX_KEEPALIVE_CONNECTIONS', HTTP_MAX_KEEPALIVE_CONNECTIONS),
+        keepalive_expiry=HTTP_KEEPALIVE_SECONDS
+    )
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(getattr(settings, 'OPENAI_TIMEOUT_SECONDS', HTTP_TIMEOUT_SECONDS), connect=10.0)
+
+
+class LLMClients:
+    """
+    OpenAI chat/embedding clients and the LangChain embeddings model, built
+    once per process on pooled keep-alive HTTP connections.
+
+    Every client is created lazily on first use, so importing this module
+    costs nothing; call ``warm_up()`` at startup to pay the construction
+    (and TLS handshake) cost before the first request instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[OpenAI] = None
+        self._async_openai: Optional[AsyncOpenAI] = None
+        self._embeddings: Optional[OpenAIEmbeddings] = None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(limits=_http_limits(), timeout=_http_timeout())
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(limits=_http_limits(), timeout=_http_timeout())
+            return self._async_http_client
+
+    @property
+    def openai(self) -> OpenAI:
+        http_client = self.http_client
+        with self._lock:
+            if self._openai is None:
+                self._openai = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+            return self._openai
+
+    @property
+    def async_openai(self) -> AsyncOpenAI:
+        http_client = self.async_http_client
+        with self._lock:
+            if self._async_openai is None:
+                self._async_openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+            return self._async_openai
+
+    @property
+    def embeddings(self) -> OpenAIEmbeddings:
+        http_client = self.http_client
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = OpenAIEmbeddings(
+                    model=settings.EMBEDDING_MODEL,
+                    openai_api_key=settings.OPENAI_API_KEY,
+                    http_client=http_client
+                )
+            return self._embeddings
+
+    def warm_up(self) -> None:
+        """Build every client now rather than on the first request."""
+        self.openai
+        self.async_openai
+        self.embeddings
+
+    def close(self) -> None:
+        """Close the pooled sync connections; clients are rebuilt on next use."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._async_http_client = None
+            self._openai = None
+            self._async_openai = None
+            self._embeddings = None
+
+
+_llm_clients: Optional[LLMClients] = None
+_llm_clients_lock = threading.Lock()
+
+
+def get_llm_clients() -> LLMClients:
+    """Return the process-wide client registry."""
+    global _llm_clients
+    with _llm_clients_lock:
+        if _llm_clients is None:
+            _llm_clients = LLMClients()
+        return _llm_clients
+
+
+def get_openai_client() -> OpenAI:
+    return get_llm_clients().openai
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    return get_llm_clients().async_openai
+
+
+def get_embeddings_model() -> OpenAIEmbeddings:
+    return get_llm_clients().embeddings
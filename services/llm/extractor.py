@@ -1,14 +1,19 @@
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import lru_cache
-from openai import OpenAI
+import numpy as np
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from app.core.config import settings
+from app.services.cache.embedding_cache import EmbeddingCache, MemoryEmbeddingCache, get_embedding_cache, recent_embeddings
+from app.services.cache.extraction_cache import ExtractionCache, get_extraction_cache
+from app.services.llm.clients import get_embeddings_model, get_openai_client
 from app.schemas.candidate import (
     CandidateCreate,
     EducationCreate,
@@ -19,24 +24,16 @@ from app.schemas.candidate import (
 
 logger = logging.getLogger(__name__)
 
-class InformationExtractor:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.embedding_model = self._initialize_embedding_model()
-        self.output_parser = PydanticOutputParser(pydantic_object=CandidateCreate)
-        self.system_prompt = self._create_system_prompt()
-        self._embedding_cache = {}  # Simple in-memory cache for embeddings
-    
-    def _initialize_embedding_model(self) -> OpenAIEmbeddings:
-        """Initialize the OpenAI embeddings model."""
-        return OpenAIEmbeddings(
-            model=settings.EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
-    
-    def _create_system_prompt(self) -> str:
-        """Create a highly detailed and strict system prompt for CV extraction."""
-        return f"""You are an expert-level CV parser with deep expertise in recruitment, HR standards, and structured data extraction. 
+_output_parser = PydanticOutputParser(pydantic_object=CandidateCreate)
+
+
+@lru_cache(maxsize=2)
+def _render_system_prompt(year: int) -> str:
+    """
+    Create a highly detailed and strict system prompt for CV extraction.
+    Rendering embeds the CandidateCreate JSON schema, so it is done once per year rather than per extractor.
+    """
+    return f"""You are an expert-level CV parser with deep expertise in recruitment, HR standards, and structured data extraction. 
         Your task is to convert unstructured CV/resume text into perfectly structured JSON that strictly complies with the following Pydantic schema.
 
         🔒 **STRICT COMPLIANCE REQUIRED**:
@@ -117,10 +114,10 @@ class InformationExtractor:
 
         ---
         📌 **OUTPUT REQUIREMENTS**:
-        {self.output_parser.get_format_instructions()}
+        {_output_parser.get_format_instructions()}
 
         🕒 **Context**:
-        - Current Year: {datetime.now().year}
+        - Current Year: {year}
         - This output will be strictly validated against Pydantic models
         - Incomplete or invalid data will cause pipeline failures
 
@@ -128,6 +125,42 @@ class InformationExtractor:
         1) Infer intelligently 2) Use placeholders 3) Never omit required fields
         """
 
+
+class InformationExtractor:
+    def __init__(
+        self,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        max_concurrent_chunks: int = 4,
+        chunk_timeout: Optional[float] = 120.0,
+        extraction_cache: Optional[ExtractionCache] = None,
+        memory_cache: Optional[MemoryEmbeddingCache] = None
+    ):
+        # Upper bound on LLM requests in flight for one CV, and per-request timeout in seconds
+        self.max_concurrent_chunks = max_concurrent_chunks
+        self.chunk_timeout = chunk_timeout
+        # Clients come from the process-wide registry and share one pooled HTTP session
+        self.client = get_openai_client()
+        self.embedding_model = self._initialize_embedding_model()
+        self.output_parser = _output_parser
+        # In-process tier in front of the persistent cache, shared by every extractor
+        self.memory_cache = memory_cache if memory_cache is not None else recent_embeddings
+        # Persistent cache shared with embedding_service (and other workers)
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        # Parsed chunk extractions, so re-ingesting the same text costs no LLM calls
+        self.extraction_cache = extraction_cache or get_extraction_cache()
+    
+    def _initialize_embedding_model(self) -> OpenAIEmbeddings:
+        """Return the shared OpenAI embeddings model."""
+        return get_embeddings_model()
+
+    @property
+    def system_prompt(self) -> str:
+        return self._create_system_prompt()
+
+    def _create_system_prompt(self) -> str:
+        """The extraction system prompt for the current year (rendered once and cached)."""
+        return _render_system_prompt(datetime.now().year)
+
     def _preprocess_text(self, text: str) -> str:
         """Preprocess CV text for better extraction."""
         text = ' '.join(text.split())
@@ -150,8 +183,37 @@ class InformationExtractor:
         )
         return splitter.split_text(text)
     
-    def _extract_from_chunk(self, chunk: str) -> Dict[str, Any]:
-        """Extract information from a single chunk of text."""
+    def _extract_from_chunk(
+        self,
+        chunk: str,
+        use_cache: bool = True,
+        refresh_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Extract information from a single chunk of text.
+        Results are cached by (model, system prompt, chunk); ``use_cache=False``
+        bypasses the cache entirely and ``refresh_cache`` re-extracts and overwrites it.
+        """
+        cache = self.extraction_cache if use_cache else None
+        if cache is not None and not refresh_cache:
+            try:
+                cached = cache.get(settings.OPENAI_MODEL, self.system_prompt, chunk)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                logger.warning(f"Extraction cache read failed: {str(e)}")
+
+        extraction = self._request_extraction(chunk)
+
+        if cache is not None:
+            try:
+                cache.set(settings.OPENAI_MODEL, self.system_prompt, chunk, extraction)
+            except Exception as e:
+                logger.warning(f"Extraction cache write failed: {str(e)}")
+        return extraction
+
+    def _request_extraction(self, chunk: str) -> Dict[str, Any]:
+        """Send one chunk to the LLM and parse the response."""
         messages = [
             {
                 "role": "system",
@@ -168,15 +230,16 @@ class InformationExtractor:
                 model=settings.OPENAI_MODEL,
                 messages=messages,
                 temperature=0.1,
-                max_tokens=4000
+                max_tokens=4000,
+                timeout=self.chunk_timeout
             )
             result_text = response.choices[0].message.content
             
             try:
                 # First try to parse as is
                 parsed_data = self.output_parser.parse(result_text)
-                # Convert to dict immediately to avoid Pydantic model issues
-                return parsed_data.model_dump() if hasattr(parsed_data, 'model_dump') else parsed_data
+                # Convert to a JSON-compatible dict immediately, so fresh and cached chunks merge alike
+                return parsed_data.model_dump(mode='json') if hasattr(parsed_data, 'model_dump') else parsed_data
             except Exception as parse_error:
                 logger.warning(f"Initial parse failed, attempting to clean and retry: {str(parse_error)}")
                 
@@ -184,8 +247,8 @@ class InformationExtractor:
                 cleaned_text = self._clean_llm_response(result_text)
                 try:
                     parsed_data = self.output_parser.parse(cleaned_text)
-                    # Convert to dict immediately to avoid Pydantic model issues
-                    return parsed_data.model_dump() if hasattr(parsed_data, 'model_dump') else parsed_data
+                    # Convert to a JSON-compatible dict immediately, so fresh and cached chunks merge alike
+                    return parsed_data.model_dump(mode='json') if hasattr(parsed_data, 'model_dump') else parsed_data
                 except Exception as second_parse_error:
                     logger.error(f"Failed to parse even after cleaning: {str(second_parse_error)}")
                     raise ValueError(f"Failed to parse LLM response into valid CandidateCreate format: {str(second_parse_error)}")
@@ -194,6 +257,30 @@ class InformationExtractor:
             logger.error(f"Error processing chunk: {str(e)}")
             raise
     
+    def _extract_chunks(
+        self,
+        chunks: List[str],
+        use_cache: bool = True,
+        refresh_cache: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract every chunk, running up to max_concurrent_chunks LLM requests at once.
+        Results are returned in chunk order so _combine_results merges deterministically.
+        The first failing chunk aborts the extraction and cancels chunks not yet started.
+        """
+        if len(chunks) == 1 or self.max_concurrent_chunks <= 1:
+            return [self._extract_from_chunk(chunk, use_cache, refresh_cache) for chunk in chunks]
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrent_chunks, len(chunks)),
+            thread_name_prefix='cv-extract'
+        )
+        try:
+            futures = [executor.submit(self._extract_from_chunk, chunk, use_cache, refresh_cache) for chunk in chunks]
+            return [future.result() for future in futures]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _clean_llm_response(self, text: str) -> str:
         """Clean and normalize the LLM response for better parsing."""
         try:
@@ -256,8 +343,8 @@ class InformationExtractor:
                 if exp not in combined["work_experience"]
             ])
             
-            # Merge skills (avoid duplicates)
-            combined["skills"] = list(set(combined["skills"] + result_dict["skills"]))
+            # Merge skills (avoid duplicates, keep first-seen order)
+            combined["skills"] = list(dict.fromkeys(combined["skills"] + result_dict["skills"]))
             
             # Merge projects (avoid duplicates)
             combined["projects"].extend([
@@ -286,12 +373,19 @@ class InformationExtractor:
 
         return combined
     
-    def extract_information(self, cv_text: str) -> CandidateCreate:
+    def extract_information(
+        self,
+        cv_text: str,
+        use_cache: bool = True,
+        refresh_cache: bool = False
+    ) -> CandidateCreate:
         """
         Extract structured information from CV text using OpenAI.
         
         Args:
             cv_text: Raw text extracted from CV
+            use_cache: Serve and store chunk extractions in the extraction cache
+            refresh_cache: Ignore cached extractions and overwrite them with fresh ones
             
         Returns:
             CandidateCreate: Structured candidate information
@@ -306,11 +400,8 @@ class InformationExtractor:
             # Split text if too long
             text_chunks = self._split_long_text(cv_text)
             
-            # Process each chunk
-            all_results = []
-            for chunk in text_chunks:
-                result = self._extract_from_chunk(chunk)
-                all_results.append(result)
+            # Process chunks concurrently; results stay in chunk order
+            all_results = self._extract_chunks(text_chunks, use_cache, refresh_cache)
             
             # Combine results
             candidate_dict = self._combine_results(all_results)
@@ -326,19 +417,52 @@ class InformationExtractor:
             logger.error(f"Error extracting information from CV: {str(e)}")
             raise
 
-    @lru_cache(maxsize=100)
-    def _get_embedding(self, text: str) -> List[float]:
-        """Get embedding for text with caching."""
+    def _get_embedding(self, text: str) -> np.ndarray:
+        """
+        Get a float32 embedding for text, from the in-memory cache, then the
+        persistent cache, then the API. Returns an empty array on failure.
+        """
         # Clean and normalize text first
         text = ' '.join(text.split())
         if not text:
-            return []
-            
+            return np.empty(0, dtype=np.float32)
+
+        model = settings.EMBEDDING_MODEL
+        cached = self.memory_cache.get(model, text)
+        if cached is not None:
+            return cached
+
+        embedding = None
+        if self.embedding_cache is not None:
+            try:
+                embedding = self.embedding_cache.get(model, text)
+            except Exception as e:
+                # A failing cache read is a miss, not a failed embedding
+                logger.warning(f"Embedding cache read failed: {str(e)}")
+
         try:
-            return self.embedding_model.embed_query(text)
+            if embedding is None:
+                embedding = self.embedding_model.embed_query(text)
+                if self.embedding_cache is not None and embedding:
+                    try:
+                        self.embedding_cache.set(model, text, embedding)
+                    except Exception as e:
+                        logger.warning(f"Embedding cache write failed: {str(e)}")
+
+            if not embedding:
+                return np.empty(0, dtype=np.float32)
+            return self.memory_cache.set(model, text, embedding)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
-            return []
+            return np.empty(0, dtype=np.float32)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the caches this extractor reads through."""
+        return {
+            'memory_embeddings': self.memory_cache.stats(),
+            'embeddings': self.embedding_cache.stats() if self.embedding_cache is not None else None,
+            'extractions': self.extraction_cache.stats() if self.extraction_cache is not None else None
+        }
 
     def generate_embeddings(self, candidate: CandidateCreate, cv_text: str) -> dict:
         """
@@ -377,13 +501,17 @@ class InformationExtractor:
             
             # Ensure we have valid embeddings with at least 1 dimension
             # If empty or invalid, use a fallback embedding
-            if not experience_embedding or len(experience_embedding) == 0:
+            if len(experience_embedding) == 0:
                 # Use a simple fallback embedding with 1536 dimensions (standard OpenAI embedding size)
                 experience_embedding = [0.0] * 1536
+            else:
+                experience_embedding = experience_embedding.tolist()
                 
-            if not skills_embedding or len(skills_embedding) == 0:
+            if len(skills_embedding) == 0:
                 # Use a simple fallback embedding with 1536 dimensions
                 skills_embedding = [0.0] * 1536
+            else:
+                skills_embedding = skills_embedding.tolist()
             
             return {
                 "experience_embedding": experience_embedding,
@@ -396,4 +524,27 @@ class InformationExtractor:
             return {
                 "experience_embedding": [0.0] * 1536,
                 "skills_embedding": [0.0] * 1536
-            }
\ No newline at end of file
+            }
+
+
+_information_extractor: Optional[InformationExtractor] = None
+_information_extractor_lock = threading.Lock()
+
+
+def get_information_extractor() -> InformationExtractor:
+    """
+    Return the process-wide extractor. It holds no per-request state, so
+    callers share it instead of rebuilding clients and the prompt per request.
+    """
+    global _information_extractor
+    with _information_extractor_lock:
+        if _information_extractor is None:
+            _information_extractor = InformationExtractor()
+        return _information_extractor
+
+
+def set_information_extractor(extractor: Optional[InformationExtractor]) -> None:
+    """Plug in a differently configured extractor; None rebuilds the default on next use."""
+    global _information_extractor
+    with _information_extractor_lock:
+        _information_extractor = extractor
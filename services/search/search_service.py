@@ -4,7 +4,8 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 from app.db.models import Candidate, Skill
 from app.core.config import settings
-from app.services.llm.extractor import InformationExtractor
+from app.services.llm.extractor import get_information_extractor
+from app.services.skill_normalizer import canonical_skills
 import logging
 import numpy as np
 
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 class SearchService:
     def __init__(self, db: Session):
         self.db = db
-        self.extractor = InformationExtractor()
+        self.extractor = get_information_extractor()
     
     async def semantic_search(
         self,
@@ -151,7 +152,7 @@ class SearchService:
         """Filter candidates by required skills."""
         return query.filter(
             Candidate.skills.any(
-                Skill.name.in_([skill.lower() for skill in skills])
+                Skill.name.in_(canonical_skills(skills))
             )
         )
     
@@ -0,0 +1,195 @@
+import base64
+import bisect
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RankedResult:
+    """
+    A ranking for one search, ordered by score (desc) then candidate id (asc).
+    ``complete`` is False when the ranking was cut off at a depth and more
+    candidates may follow the last entry. ``total`` is the number of
+    candidates the search matched, which may exceed the entries kept.
+    """
+
+    def __init__(
+        self,
+        search_key: str,
+        ranked: List[Tuple[int, float]],
+        complete: bool = True,
+        total: Optional[int] = None
+    ):
+        self.search_key = search_key
+        self.entries = ranked
+        self.complete = complete
+        self.total = len(ranked) if total is None else total
+        self.created_at = time.time()
+        # Sort keys used to resume after a cursor position in O(log n)
+        self._keys = [(-score, candidate_id) for candidate_id, score in ranked]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def position_after(self, score: float, candidate_id: int) -> int:
+        """Index of the first entry ranked strictly after (score, candidate_id)."""
+        return bisect.bisect_right(self._keys, (-score, candidate_id))
+
+    def page(self, start: int, limit: int) -> List[Tuple[int, float]]:
+        return self.entries[start:start + limit]
+
+    def covers(self, end: int) -> bool:
+        """Whether entries up to position ``end`` are all known."""
+        return self.complete or end <= len(self.entries)
+
+
+class RankedResultCache:
+    """
+    Server-side store of full search rankings, so that paging through a
+    result set does not embed the query or score candidates again.
+    Entries are evicted least-recently-used first and expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 900):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, RankedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, result: RankedResult) -> str:
+        """Store a ranking and return the token that identifies it."""
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._entries[token] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def get(self, token: str, search_key: str) -> Optional[RankedResult]:
+        """Return the ranking for ``token`` if it is still cached and belongs to the same search."""
+        with self._lock:
+            result = self._entries.get(token)
+            if result is None:
+                return None
+            if time.time() - result.created_at > self.ttl_seconds:
+                del self._entries[token]
+                return None
+            if result.search_key != search_key:
+                return None
+            self._entries.move_to_end(token)
+            return result
+
+
+class QueryResultCache:
+    """
+    Rankings of recent searches, keyed by the normalized query and filters
+    (see make_search_key), so a repeated search or a later page of it needs
+    neither an embedding call nor candidate scoring.
+
+    Any change to candidate data bumps ``generation`` and drops every entry.
+    A ranking computed while a write happened is never stored: callers read
+    the generation before computing and pass it back to ``put``.
+    Each worker has its own cache; writes seen only by another worker are
+    picked up once entries expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, RankedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, search_key: str) -> Optional[RankedResult]:
+        with self._lock:
+            result = self._entries.get(search_key)
+            if result is not None and time.time() - result.created_at > self.ttl_seconds:
+                del self._entries[search_key]
+                result = None
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(search_key)
+            self.hits += 1
+            return result
+
+    def peek(self, search_key: str) -> Optional[RankedResult]:
+        """Like get, but without counting a hit or miss or refreshing recency."""
+        with self._lock:
+            result = self._entries.get(search_key)
+            if result is None or time.time() - result.created_at > self.ttl_seconds:
+                return None
+            return result
+
+    def put(self, result: RankedResult, generation: int) -> bool:
+        """Store a ranking computed at ``generation``; returns False if the data changed since."""
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._entries[result.search_key] = result
+            self._entries.move_to_end(result.search_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self) -> None:
+        """Forget every cached ranking after candidate data changed."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'generation': self.generation
+            }
+
+
+def make_search_key(query: str, **filters: Any) -> str:
+    """Stable key for a search: the query plus its filters, independent of filter order."""
+    normalized: Dict[str, Any] = {'query': ' '.join(query.lower().split())}
+    for name, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(value)
+        normalized[name] = value
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def encode_cursor(token: str, score: float, candidate_id: int) -> str:
+    """Build the opaque cursor pointing just after (score, candidate_id) in a cached ranking."""
+    payload = json.dumps({'t': token, 's': score, 'i': candidate_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, float, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(payload['t']), float(payload['s']), int(payload['i'])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+# Process-wide ranking cache shared by all SearchService instances
+ranked_results = RankedResultCache()
+
+# Process-wide cache of recent search rankings, invalidated by CandidateService writes
+query_results = QueryResultCache()
@@ -1,11 +1,39 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
+import numpy as np
 from supabase import Client
-from app.schemas.candidate import CandidateResponse, CandidateDetail
+from app.schemas.search import CandidateSummary, ScoredCandidateDetail, SemanticSearchPage
+from app.services.candidate_hydration import CandidateHydrator, VIEW_DETAIL
 from app.services.embedding_service import generate_query_embeddings
+from app.services.vector_index import get_candidate_index
+from app.services.skill_index import get_skill_index, intersect_sorted
+from app.services.lexical_index import get_lexical_index, reciprocal_rank_fusion
+from app.services.experience import min_experience_filter
+from app.services.search_cache import (
+    RankedResult,
+    ranked_results,
+    query_results,
+    make_search_key,
+    encode_cursor,
+    decode_cursor
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Depth of the ranking kept server-side for cursor pagination
+RANKED_RESULTS_LIMIT = 1000
+
+# semantic: embeddings only; lexical: BM25 only (no OpenAI call); hybrid: both, fused by reciprocal rank
+SEARCH_MODES = ('semantic', 'hybrid', 'lexical')
+# How deep semantic_search ranks on a cache miss, so the following pages come from the cached ranking
+RESULT_CACHE_DEPTH = 100
+# How deep each ranker goes before hybrid fusion, so candidates found by only one of them still surface
+HYBRID_DEPTH = 200
+# Candidate ids per Supabase request when checking skill matches against the other filters
+FILTER_ID_CHUNK = 500
+# Rows per Supabase request when collecting filter matches (PostgREST caps responses at 1000 rows)
+FILTER_PAGE_SIZE = 1000
+
 class SearchService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
@@ -18,133 +46,364 @@ class SearchService:
         location: Optional[str] = None,
         education_level: Optional[str] = None,
         limit: int = 10,
-        offset: int = 0
-    ) -> List[CandidateDetail]:
+        offset: int = 0,
+        experience_weight: float = 0.5,
+        query_embeddings: Optional[Tuple[List[float], List[float]]] = None,
+        mode: str = 'semantic',
+        view: str = VIEW_DETAIL,
+        rerank_depth: Optional[int] = None
+    ) -> List[Union[ScoredCandidateDetail, CandidateSummary]]:
         """
         Perform semantic search using vector similarity on experience and skills embeddings,
         with filters compatible with Supabase schema.
+        Candidates are ranked against the in-process vector index over the whole pool
+        before the requested page is taken. The experience and skills similarities are
+        blended as experience_weight : (1 - experience_weight).
+        Scores are blended cosine similarities. Hybrid mode (opt-in) fuses the vector
+        ranking with a BM25 ranking over CV text and skills, and scores by reciprocal
+        rank instead; lexical mode uses BM25 alone and never calls OpenAI.
+        query_embeddings lets async callers embed the query themselves
+        (see agenerate_query_embeddings) instead of blocking here.
+        Results keep the ranking order and carry their score; view='summary' returns
+        CandidateSummary list items instead of full details.
+        rerank_depth switches the vector ranking to two-stage retrieval: a sign-bit
+        prefilter over the pool keeps that many candidates, which are then scored exactly.
         """
         try:
-            # Generate embeddings for the search query
-            experience_embedding, skills_embedding = generate_query_embeddings(query)
-
-            # Start with base query
-            base_query = self.supabase.table('candidates') \
-                .select('id, experience_embedding, skills_embedding')
-
-            # Filter: location
-            if location:
-                base_query = base_query.ilike('location', f'%{location}%')
-
-            # Filter: education_level (by degree field)
-            if education_level:
-                # Get candidate_ids with matching degree
-                edu_res = self.supabase.table('education') \
-                    .select('candidate_id') \
-                    .eq('degree', education_level) \
-                    .execute()
-                edu_ids = [row['candidate_id'] for row in edu_res.data or []]
-                if edu_ids:
-                    base_query = base_query.in_('id', edu_ids)
-                else:
-                    return []  # No candidates match
-
-            # Filter: required_skills (must have ALL skills)
-            if required_skills:
-                # Get skill_ids for required_skills
-                skill_res = self.supabase.table('skills') \
-                    .select('id, name') \
-                    .in_('name', required_skills) \
-                    .execute()
-                skill_ids = [row['id'] for row in skill_res.data or []]
-                if not skill_ids or len(skill_ids) < len(required_skills):
-                    return []  # Some skills not found
-                # Get candidate_ids that have all required skills
-                cand_skill_res = self.supabase.table('candidate_skills') \
-                    .select('candidate_id, skill_id') \
-                    .in_('skill_id', skill_ids) \
-                    .execute()
-                # Count skills per candidate
-                from collections import Counter
-                cand_skill_pairs = [(row['candidate_id'], row['skill_id']) for row in cand_skill_res.data or []]
-                cand_skill_count = Counter([pair[0] for pair in cand_skill_pairs])
-                # Only candidates with all required skills
-                candidate_ids = [cand_id for cand_id, count in cand_skill_count.items() if count == len(skill_ids)]
-                if not candidate_ids:
-                    return []
-                base_query = base_query.in_('id', candidate_ids)
-
-            # Filter: min_experience_years (sum years in work_experience)
-            if min_experience_years:
-                # Get candidate_ids with enough experience
-                work_exp_res = self.supabase.table('work_experience') \
-                    .select('candidate_id, start_date, end_date') \
-                    .execute()
-                from datetime import datetime
-                from collections import defaultdict
-                exp_years = defaultdict(float)
-                now = datetime.now()
-                for row in work_exp_res.data or []:
-                    start = row.get('start_date')
-                    end = row.get('end_date') or now.isoformat()
-                    try:
-                        start_dt = datetime.fromisoformat(str(start))
-                        end_dt = datetime.fromisoformat(str(end))
-                        years = (end_dt - start_dt).days / 365.25
-                        exp_years[row['candidate_id']] += max(0, years)
-                    except Exception:
-                        continue
-                qualified_ids = [cand_id for cand_id, years in exp_years.items() if years >= min_experience_years]
-                if not qualified_ids:
-                    return []
-                base_query = base_query.in_('id', qualified_ids)
-
-            # Pagination
-            base_query = base_query.range(offset, offset + limit - 1)
-
-            # Execute the query
-            result = base_query.execute()
-            if not result.data:
-                return []
-
-            # Calculate similarity scores and sort
-            candidates_with_scores = []
-            for candidate in result.data:
-                if candidate['experience_embedding'] and candidate['skills_embedding']:
-                    exp_similarity = self._cosine_similarity(
-                        experience_embedding,
-                        candidate['experience_embedding']
-                    )
-                    skills_similarity = self._cosine_similarity(
-                        skills_embedding,
-                        candidate['skills_embedding']
-                    )
-                    avg_similarity = (exp_similarity + skills_similarity) / 2
-                    candidates_with_scores.append((candidate['id'], avg_similarity))
-
-            # Sort by similarity score
-            candidates_with_scores.sort(key=lambda x: x[1], reverse=True)
+            search_key = self._semantic_search_key(
+                query,
+                min_experience_years=min_experience_years,
+                required_skills=required_skills,
+                location=location,
+                education_level=education_level,
+                experience_weight=experience_weight,
+                mode=mode,
+                rerank_depth=rerank_depth
+            )
 
-            # Get full candidate details (top N)
-            candidate_ids = [c[0] for c in candidates_with_scores[:limit]]
+            # Repeated searches and later pages are served from the cached ranking
+            ranking = query_results.get(search_key)
+            if ranking is None or not ranking.covers(offset + limit):
+                generation = query_results.generation
+                depth = max(offset + limit, RESULT_CACHE_DEPTH)
+                ranked, exact = self._rank_filtered(
+                    query,
+                    k=depth,
+                    min_experience_years=min_experience_years,
+                    required_skills=required_skills,
+                    location=location,
+                    education_level=education_level,
+                    experience_weight=experience_weight,
+                    query_embeddings=query_embeddings,
+                    mode=mode,
+                    rerank_depth=rerank_depth
+                )
+                # A short approximate (IVF or two-stage) ranking may have missed candidates,
+                # so only an exact one is known to hold every match; later pages deepen the others
+                ranking = RankedResult(search_key, ranked, complete=exact and len(ranked) < depth)
+                query_results.put(ranking, generation)
+            ranked = ranking.entries
 
-            return self._get_candidates_by_ids(candidate_ids)
+            # Hydrate the requested page in rank order
+            return CandidateHydrator(self.supabase).hydrate(ranked[offset:offset + limit], view=view)
             
         except Exception as e:
             logger.error(f"Error in semantic search: {str(e)}")
             raise
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
+    def is_search_cached(
+        self,
+        query: str,
+        min_experience_years: Optional[int] = None,
+        required_skills: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        education_level: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        experience_weight: float = 0.5,
+        mode: str = 'semantic',
+        rerank_depth: Optional[int] = None
+    ) -> bool:
+        """Whether semantic_search with these arguments would be served from the result cache."""
+        search_key = self._semantic_search_key(
+            query,
+            min_experience_years=min_experience_years,
+            required_skills=required_skills,
+            location=location,
+            education_level=education_level,
+            experience_weight=experience_weight,
+            mode=mode,
+            rerank_depth=rerank_depth
+        )
+        ranking = query_results.peek(search_key)
+        return ranking is not None and ranking.covers(offset + limit)
+
+    def _semantic_search_key(self, query: str, **filters) -> str:
+        return make_search_key(query, scope='semantic', **filters)
+
+    def semantic_search_page(
+        self,
+        query: str,
+        min_experience_years: Optional[int] = None,
+        required_skills: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        education_level: Optional[str] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        experience_weight: float = 0.5,
+        query_embeddings: Optional[Tuple[List[float], List[float]]] = None,
+        mode: str = 'semantic',
+        view: str = VIEW_DETAIL
+    ) -> SemanticSearchPage:
+        """
+        Rank-then-paginate semantic search.
+
+        The first request scores the whole filtered candidate set and caches the
+        top RANKED_RESULTS_LIMIT of it server-side; ``total`` counts every
+        candidate that matched, even past that limit. The returned cursor (ranking token + last score and id)
+        serves later pages straight from that ranking. If the ranking has been
+        evicted, it is rebuilt once and paging resumes after the cursor position.
+        A first page for a search made recently reuses its ranking from query_results.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
         try:
-            import numpy as np
-            vec1 = np.array(vec1, dtype=float)
-            vec2 = np.array(vec2, dtype=float)
+            search_key = make_search_key(
+                query,
+                scope='ranked',
+                min_experience_years=min_experience_years,
+                required_skills=required_skills,
+                location=location,
+                education_level=education_level,
+                experience_weight=experience_weight,
+                mode=mode
+            )
+
+            token, ranking, start = None, None, 0
+            if cursor:
+                token, last_score, last_id = decode_cursor(cursor)
+                ranking = ranked_results.get(token, search_key)
+
+            if ranking is None:
+                ranking = query_results.get(search_key)
+                if ranking is None:
+                    generation = query_results.generation
+                    candidate_ids = self._filter_candidate_ids(
+                        min_experience_years=min_experience_years,
+                        required_skills=required_skills,
+                        location=location,
+                        education_level=education_level
+                    )
+                    ranked, total = [], 0
+                    if candidate_ids is None or candidate_ids:
+                        ranked = self._rank(
+                            query,
+                            k=RANKED_RESULTS_LIMIT,
+                            candidate_ids=candidate_ids,
+                            experience_weight=experience_weight,
+                            query_embeddings=query_embeddings,
+                            mode=mode,
+                            exhaustive=True
+                        )
+                        total = self._match_count(query, candidate_ids, mode)
+                    ranking = RankedResult(search_key, ranked, total=total)
+                    query_results.put(ranking, generation)
+                token = ranked_results.put(ranking)
+
+            if cursor:
+                start = ranking.position_after(last_score, last_id)
+
+            page = ranking.page(start, limit)
+            next_cursor = None
+            if page and start + limit < len(ranking):
+                last_id, last_score = page[-1]
+                next_cursor = encode_cursor(token, last_score, last_id)
+
+            return SemanticSearchPage(
+                results=CandidateHydrator(self.supabase).hydrate(page, view=view),
+                next_cursor=next_cursor,
+                total=ranking.total
+            )
 
-            return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
         except Exception as e:
-            logger.error(f"Error calculating cosine similarity: {str(e)}")
-            return 0.0
+            logger.error(f"Error in paginated semantic search: {str(e)}")
+            raise
+
+    def _rank_filtered(
+        self,
+        query: str,
+        k: int,
+        min_experience_years: Optional[int] = None,
+        required_skills: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        education_level: Optional[str] = None,
+        experience_weight: float = 0.5,
+        query_embeddings: Optional[Tuple[List[float], List[float]]] = None,
+        mode: str = 'semantic',
+        exhaustive: bool = False,
+        rerank_depth: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        Apply the filters, then return the top k of the candidates that pass them,
+        and whether that ranking is exact: every candidate that passed was scored,
+        rather than only those an approximate vector search visited.
+        """
+        # Collect the ids allowed by the filters (None means no filter applied)
+        candidate_ids = self._filter_candidate_ids(
+            min_experience_years=min_experience_years,
+            required_skills=required_skills,
+            location=location,
+            education_level=education_level
+        )
+        if candidate_ids is not None and not candidate_ids:
+            return [], True
+
+        # Filtered vector searches score the filtered candidates exactly; BM25 always scores every match
+        exact = mode == 'lexical' or ((exhaustive or candidate_ids is not None) and rerank_depth is None)
+        return self._rank(
+            query,
+            k=k,
+            candidate_ids=candidate_ids,
+            experience_weight=experience_weight,
+            query_embeddings=query_embeddings,
+            mode=mode,
+            exhaustive=exhaustive,
+            rerank_depth=rerank_depth
+        ), exact
+
+    def _rank(
+        self,
+        query: str,
+        k: int,
+        candidate_ids: Optional[Set[int]] = None,
+        experience_weight: float = 0.5,
+        query_embeddings: Optional[Tuple[List[float], List[float]]] = None,
+        mode: str = 'semantic',
+        exhaustive: bool = False,
+        rerank_depth: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k (candidate_id, score) for the query under the given search mode.
+        Hybrid scores are reciprocal-rank-fusion scores, not cosine similarities.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+        weights = self._blend_weights(experience_weight)
+
+        if mode == 'lexical':
+            return get_lexical_index(self.supabase).search(query, k=k, candidate_ids=candidate_ids)
+
+        # Generate embeddings for the search query
+        experience_embedding, skills_embedding = query_embeddings or generate_query_embeddings(query)
+        depth = k if mode == 'semantic' else max(k, HYBRID_DEPTH)
+        vector_ranked = get_candidate_index(self.supabase).search(
+            experience_embedding,
+            skills_embedding,
+            k=depth,
+            candidate_ids=candidate_ids,
+            exhaustive=exhaustive,
+            weights=weights,
+            rerank_depth=rerank_depth
+        )
+        if mode == 'semantic':
+            return vector_ranked
+
+        lexical_ranked = get_lexical_index(self.supabase).search(query, k=depth, candidate_ids=candidate_ids)
+        return reciprocal_rank_fusion([vector_ranked, lexical_ranked], limit=k)
+
+    def _match_count(self, query: str, candidate_ids: Optional[Set[int]], mode: str) -> int:
+        """Number of candidates a search ranks in the given mode, before any depth cut-off."""
+        if mode == 'lexical':
+            return len(get_lexical_index(self.supabase).matching_ids(query, candidate_ids))
+        vector_ids = get_candidate_index(self.supabase).candidate_ids(candidate_ids)
+        if mode == 'semantic':
+            return len(vector_ids)
+        return len(np.union1d(vector_ids, get_lexical_index(self.supabase).matching_ids(query, candidate_ids)))
+
+    def _blend_weights(self, experience_weight: float) -> Dict[str, float]:
+        """Turn the experience weight into per-embedding blend weights."""
+        if not 0.0 <= experience_weight <= 1.0:
+            raise ValueError("experience_weight must be between 0 and 1")
+        return {
+            'experience_embedding': experience_weight,
+            'skills_embedding': 1.0 - experience_weight
+        }
+
+    def _filter_candidate_ids(
+        self,
+        min_experience_years: Optional[int] = None,
+        required_skills: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        education_level: Optional[str] = None
+    ) -> Optional[Set[int]]:
+        """
+        Resolve the semantic search filters to the set of candidate ids that pass all of them.
+        Returns None when no filter is set, so the whole pool is searched.
+        """
+        candidate_ids: Optional[Set[int]] = None
+
+        def narrow(ids) -> Set[int]:
+            ids = set(ids)
+            return ids if candidate_ids is None else candidate_ids & ids
+
+        # Filter: location
+        if location:
+            candidate_ids = narrow(self._select_all_ids(
+                lambda: self.supabase.table('candidates')
+                    .select('id')
+                    .ilike('location', f'%{location}%')
+            ))
+            if not candidate_ids:
+                return candidate_ids
+
+        # Filter: education_level (by degree field)
+        if education_level:
+            # Get candidate_ids with matching degree
+            candidate_ids = narrow(self._select_all_ids(
+                lambda: self.supabase.table('education')
+                    .select('id, candidate_id')
+                    .eq('degree', education_level),
+                column='candidate_id'
+            ))
+            if not candidate_ids:
+                return candidate_ids  # No candidates match
+
+        # Filter: required_skills (must have ALL skills), intersected in the in-memory skill index
+        if required_skills:
+            skill_ids = get_skill_index(self.supabase).candidates_with_all(required_skills)
+            candidate_ids = narrow(skill_ids.tolist())
+            if not candidate_ids:
+                return candidate_ids
+
+        # Filter: min_experience_years (materialized merged years on the candidates row)
+        if min_experience_years:
+            candidate_ids = narrow(self._select_all_ids(
+                lambda: self.supabase.table('candidates')
+                    .select('id')
+                    .or_(min_experience_filter(min_experience_years))
+            ))
+
+        return candidate_ids
+
+    def _select_all_ids(self, build_query, column: str = 'id') -> List[int]:
+        """
+        Every ``column`` value matched by the filter query ``build_query()`` returns,
+        fetched FILTER_PAGE_SIZE rows at a time in row id order.
+        """
+        ids = []
+        start = 0
+        while True:
+            result = build_query() \
+                .order('id') \
+                .range(start, start + FILTER_PAGE_SIZE - 1) \
+                .execute()
+            rows = result.data or []
+            ids.extend(row[column] for row in rows)
+            if len(rows) < FILTER_PAGE_SIZE:
+                break
+            start += FILTER_PAGE_SIZE
+        return ids
 
     def filter_candidates(
         self,
@@ -153,95 +412,127 @@ class SearchService:
         min_experience_years: Optional[int] = None,
         education_level: Optional[str] = None,
         limit: int = 10,
-        offset: int = 0
-    ) -> List[CandidateDetail]:
+        offset: int = 0,
+        match_all_skills: bool = False,
+        view: str = VIEW_DETAIL
+    ) -> List[Union[ScoredCandidateDetail, CandidateSummary]]:
         """
-        Filter candidates based on specific criteria using traditional database queries
+        Filter candidates based on specific criteria using traditional database queries.
+        Candidates match any of ``skills``, or all of them when ``match_all_skills`` is set.
         """
         try:
-            # Start with base query
-            query = self.supabase.table('candidates')\
-                .select('id')\
-                .range(offset, offset + limit - 1)
-            
-            # Apply filters
-            if location:
-                query = query.ilike('location', f'%{location}%')
-            
-            if min_experience_years:
-                # Filter by experience using a subquery
-                query = query.filter(
-                    'id',
-                    'in',
-                    self.supabase.table('work_experience')
-                    .select('candidate_id')
-                    .filter('end_date', 'is', 'null')
-                    .or_('end_date.gt.now()')
-                    .execute()
-                    .data
-                )
+            search_key = make_search_key(
+                '',
+                scope='filter',
+                skills=skills,
+                location=location,
+                min_experience_years=min_experience_years,
+                education_level=education_level,
+                match_all_skills=match_all_skills
+            )
             
-            if education_level:
-                # Filter by education level
-                query = query.filter(
-                    'id',
-                    'in',
-                    self.supabase.table('education')
-                    .select('candidate_id')
-                    .eq('degree', education_level)
-                    .execute()
-                    .data
+            # Repeated filters and later pages are served from the cached matches (in id order)
+            ranking = query_results.get(search_key)
+            if ranking is None or not ranking.covers(offset + limit):
+                generation = query_results.generation
+                depth = max(offset + limit, RESULT_CACHE_DEPTH)
+                matched_ids = self._filter_page_ids(
+                    skills=skills,
+                    location=location,
+                    min_experience_years=min_experience_years,
+                    education_level=education_level,
+                    limit=depth,
+                    offset=0,
+                    match_all_skills=match_all_skills
                 )
-            
-            if skills:
-                # Filter by skills
-                query = query.filter(
-                    'id',
-                    'in',
-                    self.supabase.table('candidate_skills')
-                    .select('candidate_id')
-                    .filter(
-                        'skill_id',
-                        'in',
-                        self.supabase.table('skills')
-                        .select('id')
-                        .in_('name', skills)
-                        .execute()
-                        .data
-                    )
-                    .execute()
-                    .data
+                ranking = RankedResult(
+                    search_key,
+                    [(candidate_id, 0.0) for candidate_id in matched_ids],
+                    complete=len(matched_ids) < depth
                 )
+                query_results.put(ranking, generation)
             
-            # Execute the query
-            result = query.execute()
-            
-            if not result.data:
-                return []
-            
-            # Get full candidate details
-            candidate_ids = [candidate['id'] for candidate in result.data]
-            return self._get_candidates_by_ids(candidate_ids)
+            # Get candidate details (filter results carry no score)
+            return CandidateHydrator(self.supabase).hydrate(
+                [(candidate_id, None) for candidate_id, _ in ranking.page(offset, limit)],
+                view=view
+            )
             
         except Exception as e:
             logger.error(f"Error in filter search: {str(e)}")
             raise
 
-    def _get_candidates_by_ids(self, candidate_ids: List[int]) -> List[CandidateDetail]:
-        """Get full candidate details for a list of candidate IDs"""
-        try:
-            if not candidate_ids:
-                return []
-                
-            result = self.supabase.table('candidates')\
-                .select('*, skills(*), education(*), work_experience(*), certifications(*), projects(*)')\
-                .in_('id', candidate_ids)\
-                .execute()
-            
-            return [CandidateDetail(**candidate) for candidate in result.data]
-        except Exception as e:
-            logger.error(f"Error getting candidates by IDs: {str(e)}")
-            raise
+    def _filter_page_ids(
+        self,
+        skills: Optional[List[str]] = None,
+        location: Optional[str] = None,
+        min_experience_years: Optional[int] = None,
+        education_level: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        match_all_skills: bool = False
+    ) -> List[int]:
+        """
+        Ids of one page of candidates matching the filters, in id order.
+        The skill and education filters are resolved to sorted id arrays and
+        intersected in memory; only those ids are sent to Supabase,
+        FILTER_ID_CHUNK at a time, to check the location and experience filters.
+        """
+        experience_condition = min_experience_filter(min_experience_years) if min_experience_years else None
+
+        def filtered_query():
+            query = self.supabase.table('candidates').select('id')
+            if location:
+                query = query.ilike('location', f'%{location}%')
+            if experience_condition:
+                # Filter by materialized experience years (indexed range lookup)
+                query = query.or_(experience_condition)
+            return query
+
+        # Sorted ids allowed by the in-memory filters (None when neither is set)
+        allowed_ids: Optional[np.ndarray] = None
+        if skills:
+            skill_index = get_skill_index(self.supabase)
+            if match_all_skills:
+                allowed_ids = skill_index.candidates_with_all(skills)
+            else:
+                allowed_ids = skill_index.candidates_with_any(skills)
+        if education_level:
+            education_ids = np.unique(np.asarray(self._select_all_ids(
+                lambda: self.supabase.table('education')
+                    .select('id, candidate_id')
+                    .eq('degree', education_level),
+                column='candidate_id'
+            ), dtype=np.int64))
+            allowed_ids = education_ids if allowed_ids is None else intersect_sorted(allowed_ids, education_ids)
+
+        if allowed_ids is None:
+            page_ids: List[int] = []
+            # Deep pages take several requests (PostgREST caps responses at FILTER_PAGE_SIZE rows)
+            for start in range(offset, offset + limit, FILTER_PAGE_SIZE):
+                end = min(start + FILTER_PAGE_SIZE, offset + limit)
+                result = filtered_query().order('id').range(start, end - 1).execute()
+                rows = result.data or []
+                page_ids.extend(candidate['id'] for candidate in rows)
+                if len(rows) < end - start:
+                    break
+            return page_ids
+        if not (location or experience_condition):
+            return allowed_ids[offset:offset + limit].tolist()
+
+        # Walk the allowed ids in order until the requested page is filled
+        matched: List[int] = []
+        for start in range(0, len(allowed_ids), FILTER_ID_CHUNK):
+            chunk = allowed_ids[start:start + FILTER_ID_CHUNK].tolist()
+            result = filtered_query().in_('id', chunk).order('id').execute()
+            matched.extend(candidate['id'] for candidate in result.data or [])
+            if len(matched) >= offset + limit:
+                break
+        return matched[offset:offset + limit]
+
+    def _get_candidates_by_ids(self, candidate_ids: List[int]) -> List[ScoredCandidateDetail]:
+        """Get full candidate details for a list of candidate IDs, in the order given"""
+        return CandidateHydrator(self.supabase).hydrate([(candidate_id, None) for candidate_id in candidate_ids])
 
     def get_all_skills(self, limit: int = 100) -> List[str]:
         """Get a list of all unique skills"""
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from supabase import Client
+from app.services.skill_normalizer import canonical_skill, canonical_skills
+
+logger = logging.getLogger(__name__)
+
+# How long a worker serves its skill index before reloading it from Supabase.
+# Writes made through CandidateService in the same process are applied immediately.
+SKILL_INDEX_REFRESH_SECONDS = 600
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def intersect_sorted(small: np.ndarray, large: np.ndarray) -> np.ndarray:
+    """Intersect two sorted, duplicate-free id arrays in O(len(small) * log(len(large)))."""
+    if len(small) == 0 or len(large) == 0:
+        return _EMPTY
+    positions = np.searchsorted(large, small)
+    positions[positions == len(large)] = 0
+    return small[large[positions] == small]
+
+
+class SkillIndex:
+    """
+    In-memory inverted index from canonical skill name to the sorted array of
+    candidate ids that have the skill (a posting list). Every name going in or
+    out is canonicalized, so aliases share one posting list.
+
+    AND filters intersect posting lists smallest-first, OR filters merge them,
+    so required-skill filtering never touches the database.
+    """
+
+    def __init__(self):
+        self.loaded_at: Optional[float] = None
+        self._postings: Dict[str, np.ndarray] = {}
+        self._candidate_skills: Dict[int, Set[str]] = {}
+        self._journal: Optional[List[Tuple]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._candidate_skills)
+
+    def build(self, pairs: Iterable[tuple]) -> None:
+        """Replace the index with (candidate_id, skill_name) pairs."""
+        grouped: Dict[str, List[int]] = {}
+        candidate_skills: Dict[int, Set[str]] = {}
+        for candidate_id, skill in pairs:
+            skill = canonical_skill(skill)
+            if not skill:
+                continue
+            grouped.setdefault(skill, []).append(candidate_id)
+            candidate_skills.setdefault(candidate_id, set()).add(skill)
+        postings = {skill: np.unique(np.asarray(ids, dtype=np.int64)) for skill, ids in grouped.items()}
+
+        with self._lock:
+            self._postings = postings
+            self._candidate_skills = candidate_skills
+            self.loaded_at = time.time()
+
+    def load_from_supabase(self, supabase: Client, page_size: int = 1000) -> None:
+        """Load all skills and candidate_skills links and rebuild the index."""
+        skill_names: Dict[int, str] = {}
+        start = 0
+        while True:
+            result = supabase.table('skills')\
+                .select('id, name')\
+                .order('id')\
+                .range(start, start + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            skill_names.update((row['id'], row['name']) for row in rows)
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        pairs = []
+        start = 0
+        while True:
+            result = supabase.table('candidate_skills')\
+                .select('candidate_id, skill_id')\
+                .order('candidate_id')\
+                .range(start, start + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            pairs.extend(
+                (row['candidate_id'], skill_names[row['skill_id']])
+                for row in rows if row['skill_id'] in skill_names
+            )
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        self.build(pairs)
+        logger.info(f"Loaded {len(pairs)} candidate skills into the skill index")
+
+    def start_journal(self) -> None:
+        """Record every following write, so it can be replayed onto a rebuilt index."""
+        with self._lock:
+            self._journal = []
+
+    def stop_journal(self) -> None:
+        with self._lock:
+            self._journal = None
+
+    def replay_journal(self, index: 'SkillIndex') -> None:
+        """Apply the writes recorded since start_journal() to ``index`` and stop recording."""
+        with self._lock:
+            for operation, args in self._journal or []:
+                getattr(index, operation)(*args)
+            self._journal = None
+
+    def _record(self, operation: str, *args) -> None:
+        if self._journal is not None:
+            self._journal.append((operation, args))
+
+    def add_candidate_skills(self, candidate_id: int, skills: Iterable[str]) -> None:
+        """Add skills to a candidate's posting lists."""
+        skills = canonical_skills(skills)
+        with self._lock:
+            self._record('add_candidate_skills', candidate_id, skills)
+            self._add(candidate_id, skills)
+
+    def set_candidate_skills(self, candidate_id: int, skills: Iterable[str]) -> None:
+        """Replace a candidate's skills."""
+        skills = canonical_skills(skills)
+        with self._lock:
+            self._record('set_candidate_skills', candidate_id, skills)
+            self._remove(candidate_id)
+            self._add(candidate_id, skills)
+
+    def remove_candidate(self, candidate_id: int) -> None:
+        with self._lock:
+            self._record('remove_candidate', candidate_id)
+            self._remove(candidate_id)
+
+    def _add(self, candidate_id: int, skills: List[str]) -> None:
+        current = self._candidate_skills.setdefault(candidate_id, set())
+        for skill in set(skills) - current:
+            posting = self._postings.get(skill, _EMPTY)
+            position = np.searchsorted(posting, candidate_id)
+            self._postings[skill] = np.insert(posting, position, candidate_id)
+            current.add(skill)
+
+    def _remove(self, candidate_id: int) -> None:
+        for skill in self._candidate_skills.pop(candidate_id, set()):
+            posting = self._postings[skill]
+            posting = posting[posting != candidate_id]
+            if len(posting):
+                self._postings[skill] = posting
+            else:
+                del self._postings[skill]
+
+    def posting(self, skill: str) -> np.ndarray:
+        return self._postings.get(canonical_skill(skill), _EMPTY)
+
+    def candidates_with_all(self, skills: Iterable[str]) -> np.ndarray:
+        """Sorted ids of candidates that have every one of ``skills``."""
+        with self._lock:
+            postings = sorted((self._postings.get(skill, _EMPTY) for skill in canonical_skills(skills)), key=len)
+        if not postings:
+            return _EMPTY
+        result = postings[0]
+        for posting in postings[1:]:
+            result = intersect_sorted(result, posting)
+            if len(result) == 0:
+                break
+        return result
+
+    def candidates_with_any(self, skills: Iterable[str]) -> np.ndarray:
+        """Sorted ids of candidates that have at least one of ``skills``."""
+        with self._lock:
+            postings = [self._postings.get(skill, _EMPTY) for skill in canonical_skills(skills)]
+        if not postings:
+            return _EMPTY
+        return np.unique(np.concatenate(postings))
+
+
+_skill_index: Optional[SkillIndex] = None
+_skill_index_refreshing = False
+_skill_index_lock = threading.Lock()
+
+
+def _refresh_skill_index(supabase: Client, stale: SkillIndex) -> None:
+    """Build a fresh index off the request path and swap it in once it is complete."""
+    global _skill_index, _skill_index_refreshing
+    try:
+        # Writes applied to the stale index while loading are replayed onto the fresh one
+        stale.start_journal()
+        fresh = SkillIndex()
+        fresh.load_from_supabase(supabase)
+        # Holding the stale index's lock keeps writes out between the replay and the swap
+        with _skill_index_lock, stale._lock:
+            stale.replay_journal(fresh)
+            if _skill_index is stale:
+                _skill_index = fresh
+    except Exception as e:
+        # Keep serving the stale index; the next search past the refresh interval retries
+        logger.error(f"Error refreshing the skill index: {str(e)}")
+        stale.stop_journal()
+    finally:
+        with _skill_index_lock:
+            _skill_index_refreshing = False
+
+
+def get_skill_index(supabase: Client) -> SkillIndex:
+    """
+    Return the process-wide skill index, loading it from Supabase on first use.
+    An index older than SKILL_INDEX_REFRESH_SECONDS keeps being served while a
+    replacement is built in a background thread (stale-while-revalidate).
+    """
+    global _skill_index, _skill_index_refreshing
+    with _skill_index_lock:
+        if _skill_index is None or _skill_index.loaded_at is None:
+            # Nothing to serve yet, so the first load is synchronous
+            _skill_index = SkillIndex()
+            _skill_index.load_from_supabase(supabase)
+            return _skill_index
+        index = _skill_index
+        if time.time() - index.loaded_at > SKILL_INDEX_REFRESH_SECONDS and not _skill_index_refreshing:
+            _skill_index_refreshing = True
+            threading.Thread(
+                target=_refresh_skill_index,
+                args=(supabase, index),
+                name='skill-index-refresh',
+                daemon=True
+            ).start()
+        return index
+
+
+def get_loaded_skill_index() -> Optional[SkillIndex]:
+    """Return the process-wide skill index only if it has already been loaded (used to apply writes)."""
+    if _skill_index is None or _skill_index.loaded_at is None:
+        return None
+    return _skill_index
@@ -0,0 +1,118 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skill name -> spellings that mean the same skill. Canonical names
+# are lowercase, matching how skills are stored and queried. Aliases that are
+# also ordinary words or ambiguous abbreviations ("go", "rest", "excel", "ai")
+# are left out, so a skill listed that way keeps its own name.
+DEFAULT_SKILL_ALIASES: Dict[str, List[str]] = {
+    'postgresql': ['postgres', 'postgre sql', 'psql', 'pgsql'],
+    'mysql': ['my sql'],
+    'microsoft sql server': ['sql server', 'mssql', 'ms sql', 'ms sql server'],
+    'mongodb': ['mongo', 'mongo db'],
+    'javascript': ['js', 'java script', 'ecmascript', 'es6'],
+    'typescript': ['type script'],
+    'python': ['python3', 'python 3'],
+    'golang': ['go lang'],
+    'c++': ['cpp', 'c plus plus'],
+    'c#': ['csharp', 'c sharp'],
+    '.net': ['dotnet', 'dot net', '.net framework', '.net core'],
+    'node.js': ['nodejs', 'node js'],
+    'react': ['react.js', 'reactjs', 'react js'],
+    'vue.js': ['vue', 'vuejs', 'vue js'],
+    'angular': ['angularjs', 'angular.js', 'angular js'],
+    'next.js': ['nextjs', 'next js'],
+    'express': ['express.js', 'expressjs'],
+    'django': ['django framework'],
+    'fastapi': ['fast api'],
+    'spring boot': ['springboot'],
+    'amazon web services': ['aws'],
+    'google cloud platform': ['gcp', 'google cloud'],
+    'microsoft azure': ['azure'],
+    'kubernetes': ['k8s'],
+    'docker': ['docker containers'],
+    'ci/cd': ['cicd', 'ci cd', 'continuous integration'],
+    'git': ['git scm'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'machine learning': ['ml'],
+    'natural language processing': ['nlp'],
+    'tensorflow': ['tensor flow'],
+    'pytorch': ['py torch'],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'pandas': ['python pandas'],
+    'numpy': ['num py'],
+    'rest api': ['restful', 'restful api', 'rest apis', 'restful apis'],
+    'graphql': ['graph ql'],
+    'object-oriented programming': ['oop', 'object oriented programming'],
+    'user experience design': ['ux', 'ux design'],
+    'user interface design': ['ui', 'ui design'],
+    'microsoft excel': ['ms excel'],
+    'agile': ['agile methodology', 'agile methodologies'],
+}
+
+_WHITESPACE = re.compile(r'\s+')
+# Separators that vary between spellings of the same name ("Node.js", "node js", "node-js").
+# '+' and '#' are kept so C, C++ and C# stay distinct.
+_SEPARATORS = re.compile(r'[\s.\-_/]+')
+
+
+def normalize_skill(name: str) -> str:
+    """Unicode-normalize, lowercase and collapse whitespace; punctuation inside the name is kept."""
+    name = unicodedata.normalize('NFKC', name)
+    name = _WHITESPACE.sub(' ', name).strip().strip(',;:').strip()
+    return name.casefold()
+
+
+def _lookup_key(normalized: str) -> str:
+    # Leading dots are significant for ".net"
+    key = _SEPARATORS.sub('', normalized)
+    return '.' + key if normalized.startswith('.') else key
+
+
+class SkillNormalizer:
+    """
+    Maps any spelling of a skill to its canonical name.
+
+    The alias map is compiled once into a hash table keyed by the
+    separator-insensitive form of every canonical name and alias, so a lookup
+    is one normalization plus one dict access. Skills without an alias are
+    canonicalized to their normalized form.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self._table: Dict[str, str] = {}
+        for canonical, spellings in (aliases or {}).items():
+            self.add_alias(canonical, canonical)
+            for spelling in spellings:
+                self.add_alias(canonical, spelling)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def add_alias(self, canonical: str, alias: str) -> None:
+        self._table[_lookup_key(normalize_skill(alias))] = normalize_skill(canonical)
+
+    def canonical(self, name: str) -> str:
+        """Canonical name of a skill, or '' for a blank name."""
+        normalized = normalize_skill(name or '')
+        if not normalized:
+            return ''
+        return self._table.get(_lookup_key(normalized), normalized)
+
+    def canonicalize(self, names: Iterable[str]) -> List[str]:
+        """Canonical names for ``names`` in first-seen order, without blanks or duplicates."""
+        canonical = (self.canonical(name) for name in names)
+        return list(dict.fromkeys(name for name in canonical if name))
+
+
+skill_normalizer = SkillNormalizer(DEFAULT_SKILL_ALIASES)
+
+
+def canonical_skill(name: str) -> str:
+    return skill_normalizer.canonical(name)
+
+
+def canonical_skills(names: Iterable[str]) -> List[str]:
+    return skill_normalizer.canonicalize(names)
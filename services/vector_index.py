@@ -0,0 +1,399 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from supabase import Client
+from app.core.config import settings
+from app.services.embedding_reducer import EmbeddingReducer, get_embedding_reducer
+from app.services.vector_scoring import (
+    EMBEDDING_KINDS,
+    ScoringEngine,
+    normalize_rows,
+    parse_embedding
+)
+
+logger = logging.getLogger(__name__)
+
+# How long a worker keeps serving its in-process index before reloading it from Supabase.
+# Writes made through CandidateService in the same process are applied immediately.
+INDEX_REFRESH_SECONDS = 600
+
+# Searches asking for at least 1 / EXHAUSTIVE_SHARE of the pool score it all instead of probing
+EXHAUSTIVE_SHARE = 4
+
+
+class IVFIndex:
+    """
+    Inverted-file index over unit-length vectors.
+
+    Vectors are partitioned with spherical k-means; a query only visits the
+    vectors stored in the ``n_probe`` lists whose centroids are closest to it.
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        train_size: int = 20000,
+        n_iter: int = 10,
+        seed: int = 0
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_size = train_size
+        self.n_iter = n_iter
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+
+    def build(self, vectors: np.ndarray) -> None:
+        """Train the centroids and assign every row of ``vectors`` (already normalized) to a list."""
+        n_rows = len(vectors)
+        if n_rows == 0:
+            self.centroids = None
+            self.lists = []
+            return
+
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(n_rows))), n_rows)
+        rng = np.random.default_rng(self.seed)
+        sample = vectors
+        if n_rows > self.train_size:
+            sample = vectors[rng.choice(n_rows, self.train_size, replace=False)]
+
+        self.centroids = self._train(sample, n_lists, rng)
+        assignments = self._assign(vectors)
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64) for i in range(n_lists)]
+
+    def add(self, position: int, vector: np.ndarray) -> None:
+        """Append a single row position to the list of its nearest centroid."""
+        if self.centroids is None:
+            return
+        list_id = int(np.argmax(self.centroids @ vector))
+        self.lists[list_id] = np.append(self.lists[list_id], np.int64(position))
+
+    def probe(self, query: np.ndarray, n_probe: Optional[int] = None) -> np.ndarray:
+        """Return the row positions stored in the lists closest to ``query``."""
+        if self.centroids is None:
+            return np.empty(0, dtype=np.int64)
+        n_probe = min(n_probe or self.n_probe, len(self.lists))
+        closest = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        return np.concatenate([self.lists[i] for i in closest])
+
+    def _train(self, sample: np.ndarray, n_lists: int, rng: np.random.Generator) -> np.ndarray:
+        """Spherical k-means: centroids are kept at unit length so assignment is a dot product."""
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind='stable')
+            counts = np.bincount(labels, minlength=n_lists)
+            non_empty = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[non_empty]
+            centroids[non_empty] = np.add.reduceat(sample[order], starts, axis=0)
+            # Re-seed empty lists with random points so every list stays usable
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+            centroids = normalize_rows(centroids)
+        return centroids
+
+    def _assign(self, vectors: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start:start + batch_size]
+            assignments[start:start + batch_size] = np.argmax(batch @ self.centroids.T, axis=1)
+        return assignments
+
+
+class CandidateVectorIndex:
+    """
+    In-process approximate nearest-neighbour index over every candidate's
+    experience and skills embeddings.
+
+    Embeddings live in a ScoringEngine; each embedding kind additionally has
+    its own IVF partitioning. A query probes both partitionings, then scores
+    the union of probed candidates exactly with the blended cosine similarity.
+    ``precision='int8'`` keeps the embeddings quantized (see ScoringEngine).
+
+    With a ``reducer`` every candidate and query embedding is projected
+    before it is stored or scored; ``projection_version`` records which
+    projection the stored vectors were produced with.
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 16,
+        precision: str = 'float32',
+        reducer: Optional[EmbeddingReducer] = None
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.precision = precision
+        self.reducer = reducer
+        self.loaded_at: Optional[float] = None
+        self._engine = ScoringEngine(EMBEDDING_KINDS, precision)
+        self._ivf: Dict[str, IVFIndex] = {}
+        self._journal: Optional[List[Tuple]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._engine)
+
+    def candidate_ids(self, candidate_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Ids of the indexed candidates, restricted to ``candidate_ids`` when given."""
+        with self._lock:
+            engine = self._engine
+            positions = engine.alive_positions() if candidate_ids is None else engine.positions_for(candidate_ids)
+            return engine.ids()[positions]
+
+    @property
+    def projection_version(self) -> Optional[str]:
+        """Version of the reducer applied to the stored vectors; None for full-dimensional ones."""
+        return self.reducer.version if self.reducer is not None else None
+
+    def _project(self, vectors: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self.reducer is None or vectors is None:
+            return vectors
+        return self.reducer.transform(vectors)
+
+    def build(self, ids: Sequence[int], experience: np.ndarray, skills: np.ndarray, projected: bool = False) -> None:
+        """
+        Replace the index contents with the given candidates. Embeddings are
+        full-dimensional unless ``projected`` says the reducer was already applied.
+        """
+        if not projected:
+            experience, skills = self._project(experience), self._project(skills)
+        engine = ScoringEngine(EMBEDDING_KINDS, self.precision)
+        engine.build(ids, {'experience_embedding': experience, 'skills_embedding': skills})
+        ivf = {}
+        for kind in EMBEDDING_KINDS:
+            ivf[kind] = IVFIndex(n_lists=self.n_lists, n_probe=self.n_probe)
+            # Partition on the (dequantized) stored vectors so lists match what is scored
+            ivf[kind].build(engine.matrix(kind))
+
+        with self._lock:
+            self._engine = engine
+            self._ivf = ivf
+            self.loaded_at = time.time()
+
+    def load_from_supabase(self, supabase: Client, page_size: int = 1000) -> None:
+        """
+        Load every candidate that has both embeddings and rebuild the index.
+        Each page is projected as it arrives, so full-dimensional vectors are never all held at once.
+        """
+        ids, experience, skills = [], [], []
+        start = 0
+        while True:
+            result = supabase.table('candidates')\
+                .select('id, experience_embedding, skills_embedding')\
+                .order('id')\
+                .range(start, start + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            page_experience, page_skills = [], []
+            for row in rows:
+                exp_vec = parse_embedding(row.get('experience_embedding'))
+                skills_vec = parse_embedding(row.get('skills_embedding'))
+                if exp_vec is None or skills_vec is None:
+                    continue
+                ids.append(row['id'])
+                page_experience.append(exp_vec)
+                page_skills.append(skills_vec)
+            if page_experience:
+                experience.append(self._project(np.vstack(page_experience)))
+                skills.append(self._project(np.vstack(page_skills)))
+            if len(rows) < page_size:
+                break
+            start += page_size
+
+        if ids:
+            self.build(ids, np.vstack(experience), np.vstack(skills), projected=True)
+        else:
+            with self._lock:
+                self._engine = ScoringEngine(EMBEDDING_KINDS, self.precision)
+                self._ivf = {}
+                self.loaded_at = time.time()
+        logger.info(f"Loaded {len(ids)} candidates into the vector index")
+
+    def start_journal(self) -> None:
+        """Record every following upsert and remove, so they can be replayed onto a rebuilt index."""
+        with self._lock:
+            self._journal = []
+
+    def stop_journal(self) -> None:
+        with self._lock:
+            self._journal = None
+
+    def replay_journal(self, index: 'CandidateVectorIndex') -> None:
+        """Apply the writes recorded since start_journal() to ``index`` and stop recording."""
+        with self._lock:
+            for operation, args in self._journal or []:
+                getattr(index, operation)(*args)
+            self._journal = None
+
+    def upsert(self, candidate_id: int, experience_embedding, skills_embedding) -> None:
+        """Add or replace a single candidate without rebuilding the index."""
+        exp_vec = parse_embedding(experience_embedding)
+        skills_vec = parse_embedding(skills_embedding)
+        if exp_vec is None or skills_vec is None:
+            return
+
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('upsert', (candidate_id, exp_vec, skills_vec)))
+            if not self._ivf:
+                self.build([candidate_id], exp_vec[None, :], skills_vec[None, :])
+                return
+            position = self._engine.upsert(
+                candidate_id,
+                {'experience_embedding': self._project(exp_vec), 'skills_embedding': self._project(skills_vec)}
+            )
+            for kind in EMBEDDING_KINDS:
+                self._ivf[kind].add(position, self._engine.row(kind, position))
+
+    def remove(self, candidate_id: int) -> None:
+        """Drop a candidate from search results; its slot is reclaimed on the next rebuild."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(('remove', (candidate_id,)))
+            self._engine.remove(candidate_id)
+
+    def search(
+        self,
+        experience_query,
+        skills_query,
+        k: int,
+        candidate_ids: Optional[Iterable[int]] = None,
+        n_probe: Optional[int] = None,
+        exhaustive: bool = False,
+        weights: Optional[Mapping[str, float]] = None,
+        rerank_depth: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return up to ``k`` (candidate_id, score) pairs, best first, ties broken by id.
+
+        When ``candidate_ids`` is given the search is restricted to those
+        candidates and they are scored exactly instead of through the IVF lists.
+        ``exhaustive`` scores the whole pool exactly, for callers that need a
+        complete ranking rather than the nearest few. ``weights`` blends the
+        experience and skills similarities (equal weights by default).
+
+        ``rerank_depth`` switches to two-stage retrieval instead of the IVF
+        probe: the pool (or ``candidate_ids``) is scanned with sign-bit Hamming
+        distance and only the rerank_depth best matches are scored exactly.
+        It is ignored for exhaustive searches.
+
+        The IVF probe is widened until the probed lists hold at least ``k``
+        candidates; when ``k`` is a large share of the pool the whole pool
+        is scored instead, which is cheaper than probing most lists.
+        """
+        if k <= 0:
+            return []
+        queries = {
+            'experience_embedding': self._project(parse_embedding(experience_query)),
+            'skills_embedding': self._project(parse_embedding(skills_query))
+        }
+
+        with self._lock:
+            engine = self._engine
+            if not len(engine):
+                return []
+            if exhaustive:
+                rerank_depth = None
+            if candidate_ids is not None:
+                positions = engine.positions_for(candidate_ids)
+            elif exhaustive or rerank_depth is not None or k * EXHAUSTIVE_SHARE >= len(engine):
+                positions = None
+            else:
+                positions = self._probe(queries, n_probe or self.n_probe, k)
+            if positions is not None and len(positions) == 0:
+                return []
+            return engine.search(queries, k, positions=positions, weights=weights, rerank_depth=rerank_depth)
+
+    def _probe(self, queries: Mapping[str, np.ndarray], n_probe: int, k: int) -> np.ndarray:
+        """Live positions in the lists closest to either query, doubling n_probe until there are at least k."""
+        unit_queries = {kind: normalize_rows(queries[kind])[0] for kind in EMBEDDING_KINDS}
+        n_lists = max(len(self._ivf[kind].lists) for kind in EMBEDDING_KINDS)
+        while True:
+            positions = np.union1d(
+                self._ivf['experience_embedding'].probe(unit_queries['experience_embedding'], n_probe),
+                self._ivf['skills_embedding'].probe(unit_queries['skills_embedding'], n_probe)
+            )
+            positions = positions[self._engine.is_alive(positions)]
+            if len(positions) >= k or n_probe >= n_lists:
+                return positions
+            n_probe *= 2
+
+
+_candidate_index: Optional[CandidateVectorIndex] = None
+_candidate_index_refreshing = False
+_candidate_index_lock = threading.Lock()
+
+
+def _new_candidate_index(reducer: Optional[EmbeddingReducer]) -> CandidateVectorIndex:
+    return CandidateVectorIndex(
+        precision=getattr(settings, 'VECTOR_INDEX_PRECISION', 'float32'),
+        reducer=reducer
+    )
+
+
+def _refresh_candidate_index(supabase: Client, stale: CandidateVectorIndex, reducer: Optional[EmbeddingReducer]) -> None:
+    """Build a fresh index off the request path and swap it in once it is complete."""
+    global _candidate_index, _candidate_index_refreshing
+    try:
+        # Writes applied to the stale index while loading are replayed onto the fresh one
+        stale.start_journal()
+        fresh = _new_candidate_index(reducer)
+        fresh.load_from_supabase(supabase)
+        # Holding the stale index's lock keeps writes out between the replay and the swap
+        with _candidate_index_lock, stale._lock:
+            stale.replay_journal(fresh)
+            if _candidate_index is stale:
+                _candidate_index = fresh
+    except Exception as e:
+        # Keep serving the stale index; the next search past the refresh interval retries
+        logger.error(f"Error refreshing the vector index: {str(e)}")
+        stale.stop_journal()
+    finally:
+        with _candidate_index_lock:
+            _candidate_index_refreshing = False
+
+
+def get_candidate_index(supabase: Client) -> CandidateVectorIndex:
+    """
+    Return the process-wide candidate index, loading it from Supabase on first use.
+
+    An index older than INDEX_REFRESH_SECONDS, or built with a different
+    embedding reducer version than the configured one, keeps being served
+    while a replacement is built in a background thread (stale-while-revalidate).
+    """
+    global _candidate_index, _candidate_index_refreshing
+    with _candidate_index_lock:
+        reducer = get_embedding_reducer()
+        version = reducer.version if reducer is not None else None
+        if _candidate_index is None or _candidate_index.loaded_at is None:
+            # Nothing to serve yet, so the first load is synchronous
+            _candidate_index = _new_candidate_index(reducer)
+            _candidate_index.load_from_supabase(supabase)
+            return _candidate_index
+        index = _candidate_index
+        stale = index.projection_version != version or time.time() - index.loaded_at > INDEX_REFRESH_SECONDS
+        if stale and not _candidate_index_refreshing:
+            _candidate_index_refreshing = True
+            threading.Thread(
+                target=_refresh_candidate_index,
+                args=(supabase, index, reducer),
+                name='vector-index-refresh',
+                daemon=True
+            ).start()
+        return index
+
+
+def get_loaded_candidate_index() -> Optional[CandidateVectorIndex]:
+    """Return the process-wide index only if it has already been loaded (used to apply writes)."""
+    if _candidate_index is None or _candidate_index.loaded_at is None:
+        return None
+    return _candidate_index
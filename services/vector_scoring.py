@@ -0,0 +1,446 @@
+import base64
+import json
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+
+EMBEDDING_KINDS = ('experience_embedding', 'skills_embedding')
+
+# Equal weights reproduce the historical (experience + skills) / 2 average
+DEFAULT_WEIGHTS = {'experience_embedding': 0.5, 'skills_embedding': 0.5}
+
+# float32 keeps full precision; int8 stores each vector as 1-byte codes plus one float32 scale
+PRECISIONS = ('float32', 'int8')
+
+# Rows scored per block on int8 matrices, bounding the float32 scratch space to a few MiB
+INT8_SCORE_BLOCK = 1024
+
+_WIRE_PREFIXES = {'float32': 'f32:', 'int8': 'i8:'}
+
+# Rows compared per block in the sign-bit prefilter
+SIGN_SCAN_BLOCK = 4096
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits of every uint64 word (np.bitwise_count on NumPy 2, SWAR bit tricks before)."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+def pack_signs(matrix: np.ndarray) -> np.ndarray:
+    """Sign bit of every component, packed into uint64 words: (n, dim) -> (n, ceil(dim / 64))."""
+    matrix = np.asarray(matrix)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    packed = np.packbits(matrix > 0, axis=1)
+    if packed.shape[1] % 8:
+        packed = np.pad(packed, ((0, 0), (0, 8 - packed.shape[1] % 8)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def hamming_distances(codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Hamming distance between every row of packed ``codes`` and the packed ``query`` row."""
+    return _popcount(np.bitwise_xor(codes, query)).sum(axis=1, dtype=np.int64)
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization: row ~= codes * scale, with
+    scale = max(|row|) / 127. Returns (codes, scales).
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    scales = np.abs(matrix).max(axis=1) / np.float32(127.0)
+    scales[scales == 0] = 1.0
+    codes = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[..., None]
+
+
+def encode_embedding(vector, precision: str = 'float32') -> str:
+    """
+    Compact text form of an embedding: base64 of the raw float32 bytes
+    ("f32:...", 8 KiB for 1536 dims) or of a float32 scale followed by int8
+    codes ("i8:...", 2 KiB), instead of ~30 KiB of JSON floats.
+    """
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    if precision == 'float32':
+        payload = vector.tobytes()
+    elif precision == 'int8':
+        codes, scales = quantize_int8(vector)
+        payload = scales.tobytes() + codes.tobytes()
+    else:
+        raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}")
+    return _WIRE_PREFIXES[precision] + base64.b64encode(payload).decode('ascii')
+
+
+def decode_embedding(value: str) -> np.ndarray:
+    """Inverse of encode_embedding; int8 payloads are dequantized to float32."""
+    if value.startswith(_WIRE_PREFIXES['float32']):
+        return np.frombuffer(base64.b64decode(value[len(_WIRE_PREFIXES['float32']):], validate=True), dtype=np.float32).copy()
+    if value.startswith(_WIRE_PREFIXES['int8']):
+        payload = base64.b64decode(value[len(_WIRE_PREFIXES['int8']):], validate=True)
+        if len(payload) < 5:
+            raise ValueError("Truncated int8 embedding")
+        scale = np.frombuffer(payload[:4], dtype=np.float32)
+        return dequantize_int8(np.frombuffer(payload[4:], dtype=np.int8), scale)[0]
+    raise ValueError("Not an encoded embedding")
+
+
+def format_pgvector(vector) -> str:
+    """
+    pgvector text literal with float32 precision ("[0.0123457,...]"), about
+    half the size of the JSON of the same values as Python floats.
+    """
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    return '[' + ','.join(f'{value:.7g}' for value in vector.tolist()) + ']'
+
+
+def parse_embedding(value) -> Optional[np.ndarray]:
+    """
+    Parse an embedding as returned by Supabase into a float32 vector.
+    pgvector columns come back from PostgREST as text ("[0.1,0.2,...]"), JSON columns as lists;
+    strings produced by encode_embedding and numpy arrays are accepted too.
+    """
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            value = decode_embedding(value) if value[:1] in ('f', 'i') else json.loads(value)
+        vector = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if vector.ndim != 1 or vector.size == 0:
+        return None
+    return vector
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a contiguous float32 copy of the matrix with every row scaled to unit length."""
+    matrix = np.array(matrix, dtype=np.float32, ndmin=2, copy=True)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k(ids: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """Pick the ``k`` best (id, score) pairs with argpartition, ordered by score desc then id."""
+    if k <= 0 or len(scores) == 0:
+        return []
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.lexsort((ids[top], -scores[top]))]
+    return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+class ScoringEngine:
+    """
+    Brute-force cosine scoring over pre-normalized float32 candidate embeddings.
+
+    Every embedding kind is a unit-length float32 matrix. The kinds are laid
+    out side by side in one contiguous row-major buffer, so a weighted blend of
+    all kinds is a single matrix-vector product against the concatenation of
+    the weighted, normalized query vectors.
+
+    With ``precision='int8'`` the buffer holds int8 codes with one float32
+    scale per row and kind (a quarter of the memory). Scores are computed
+    from the codes block by block and multiplied by the scales, without
+    materializing the float32 matrix.
+
+    Every row also keeps the sign bits of its vectors (dim / 8 bytes per
+    kind). ``search(..., rerank_depth=n)`` first shortlists the ``n`` rows
+    closest in Hamming distance, then scores only those exactly.
+    """
+
+    def __init__(self, kinds: Sequence[str] = EMBEDDING_KINDS, precision: str = 'float32'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}")
+        self.kinds = tuple(kinds)
+        self.precision = precision
+        self._matrix = np.empty((0, 0), dtype=self._dtype)
+        self._scales = np.empty((0, len(self.kinds)), dtype=np.float32)
+        self._slices: Dict[str, slice] = {}
+        self._signs = np.empty((0, 0), dtype=np.uint64)
+        self._sign_slices: Dict[str, slice] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._positions: Dict[int, int] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def size(self) -> int:
+        """Number of occupied rows, including removed candidates not yet compacted."""
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vectors (codes, scales and sign bits) of the occupied rows."""
+        return self._matrix[:self._size].nbytes + self._scales[:self._size].nbytes + self._signs[:self._size].nbytes
+
+    @property
+    def _dtype(self):
+        return np.int8 if self.precision == 'int8' else np.float32
+
+    def matrix(self, kind: str) -> np.ndarray:
+        """
+        Read-only normalized matrix for one embedding kind: a view at float32
+        precision, a dequantized copy at int8.
+        """
+        view = self._matrix[:self._size, self._slices[kind]]
+        if self.precision == 'int8':
+            view = dequantize_int8(view, self._scales[:self._size, self.kinds.index(kind)])
+        view.flags.writeable = False
+        return view
+
+    def row(self, kind: str, position: int) -> np.ndarray:
+        """The normalized float32 vector of one kind at a row position."""
+        vector = self._matrix[position, self._slices[kind]]
+        if self.precision == 'int8':
+            return dequantize_int8(vector[None, :], self._scales[position:position + 1, self.kinds.index(kind)])[0]
+        return vector.copy()
+
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    def alive_positions(self) -> np.ndarray:
+        return np.flatnonzero(self._alive[:self._size])
+
+    def is_alive(self, positions: np.ndarray) -> np.ndarray:
+        return self._alive[positions]
+
+    def positions_for(self, candidate_ids: Iterable[int]) -> np.ndarray:
+        """Row positions of the given candidates; unknown ids are skipped."""
+        with self._lock:
+            return np.fromiter(
+                (self._positions[cid] for cid in candidate_ids if cid in self._positions),
+                dtype=np.int64
+            )
+
+    def build(self, ids: Sequence[int], embeddings: Mapping[str, np.ndarray]) -> None:
+        """Replace the contents with ``ids`` and one (n, dim) matrix per kind."""
+        ids = np.asarray(ids, dtype=np.int64)
+        blocks = [normalize_rows(embeddings[kind]) for kind in self.kinds]
+        slices, start = {}, 0
+        for kind, block in zip(self.kinds, blocks):
+            slices[kind] = slice(start, start + block.shape[1])
+            start += block.shape[1]
+        sign_blocks = [pack_signs(block) for block in blocks]
+        sign_slices, start = {}, 0
+        for kind, block in zip(self.kinds, sign_blocks):
+            sign_slices[kind] = slice(start, start + block.shape[1])
+            start += block.shape[1]
+        signs = np.ascontiguousarray(np.hstack(sign_blocks)[:len(ids)])
+        if self.precision == 'int8':
+            quantized = [quantize_int8(block) for block in blocks]
+            blocks = [codes for codes, _ in quantized]
+            scales = np.column_stack([row_scales for _, row_scales in quantized])[:len(ids)]
+        else:
+            scales = np.ones((len(ids), len(self.kinds)), dtype=np.float32)
+        matrix = np.ascontiguousarray(np.hstack(blocks)[:len(ids)])
+
+        with self._lock:
+            self._matrix = matrix
+            self._scales = np.ascontiguousarray(scales, dtype=np.float32)
+            self._slices = slices
+            self._signs = signs
+            self._sign_slices = sign_slices
+            self._ids = ids.copy()
+            self._alive = np.ones(len(ids), dtype=bool)
+            self._positions = {int(cid): pos for pos, cid in enumerate(ids)}
+            self._size = len(ids)
+
+    def upsert(self, candidate_id: int, embeddings: Mapping[str, np.ndarray]) -> int:
+        """Append (or replace) one candidate and return its row position."""
+        with self._lock:
+            if not self._slices:
+                self.build([candidate_id], {kind: embeddings[kind][None, :] for kind in self.kinds})
+                return 0
+            self.remove(candidate_id)
+            self._reserve(self._size + 1)
+            position = self._size
+            for column, kind in enumerate(self.kinds):
+                vector = normalize_rows(embeddings[kind])
+                if self.precision == 'int8':
+                    codes, scales = quantize_int8(vector)
+                    self._matrix[position, self._slices[kind]] = codes[0]
+                    self._scales[position, column] = scales[0]
+                else:
+                    self._matrix[position, self._slices[kind]] = vector[0]
+                self._signs[position, self._sign_slices[kind]] = pack_signs(vector)[0]
+            self._ids[position] = candidate_id
+            self._alive[position] = True
+            self._positions[int(candidate_id)] = position
+            self._size += 1
+            return position
+
+    def remove(self, candidate_id: int) -> None:
+        """Exclude a candidate from scoring; its row is reclaimed on the next build."""
+        with self._lock:
+            position = self._positions.pop(int(candidate_id), None)
+            if position is not None:
+                self._alive[position] = False
+
+    def query_vector(
+        self,
+        queries: Mapping[str, np.ndarray],
+        weights: Optional[Mapping[str, float]] = None
+    ) -> np.ndarray:
+        """Concatenate the normalized queries, each scaled by its blend weight (weights sum to 1)."""
+        weights = dict(weights or DEFAULT_WEIGHTS)
+        total = sum(weights.get(kind, 0.0) for kind in self.kinds)
+        if total <= 0:
+            raise ValueError("At least one embedding weight must be positive")
+        return np.concatenate([
+            normalize_rows(queries[kind])[0] * np.float32(weights.get(kind, 0.0) / total)
+            for kind in self.kinds
+        ])
+
+    def score(
+        self,
+        queries: Mapping[str, np.ndarray],
+        positions: Optional[np.ndarray] = None,
+        weights: Optional[Mapping[str, float]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Blended cosine scores for the candidates at ``positions`` (all live rows by default).
+        Returns (candidate_ids, scores).
+        """
+        query = self.query_vector(queries, weights)
+        with self._lock:
+            if positions is None:
+                positions = self.alive_positions()
+                if len(positions) == self._size:
+                    return self._ids[:self._size].copy(), self._score_rows(
+                        self._matrix[:self._size], self._scales[:self._size], query
+                    )
+            return self._ids[positions], self._score_rows(self._matrix[positions], self._scales[positions], query)
+
+    def _score_rows(self, matrix: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if self.precision == 'float32':
+            return matrix @ query
+        # Per kind, score = scale * (codes . query). Blocks are widened into one reused,
+        # cache-sized float32 buffer so scratch memory stays bounded and BLAS does the dot products
+        scores = np.empty(len(matrix), dtype=np.float32)
+        buffer = np.empty((min(len(matrix), INT8_SCORE_BLOCK), matrix.shape[1]), dtype=np.float32)
+        for start in range(0, len(matrix), INT8_SCORE_BLOCK):
+            codes = matrix[start:start + INT8_SCORE_BLOCK]
+            block = buffer[:len(codes)]
+            np.copyto(block, codes, casting='unsafe')
+            block_scales = scales[start:start + INT8_SCORE_BLOCK]
+            total = np.zeros(len(block), dtype=np.float32)
+            for column, kind in enumerate(self.kinds):
+                part = self._slices[kind]
+                total += (block[:, part] @ query[part]) * block_scales[:, column]
+            scores[start:start + INT8_SCORE_BLOCK] = total
+        return scores
+
+    def prefilter(
+        self,
+        queries: Mapping[str, np.ndarray],
+        n: int,
+        positions: Optional[np.ndarray] = None,
+        weights: Optional[Mapping[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Row positions of the ``n`` candidates among ``positions`` (all live rows by
+        default) whose sign bits best match the query's. Each kind contributes
+        weight * (1 - 2 * hamming / dim), a linear stand-in for its cosine.
+        """
+        weights = dict(weights or DEFAULT_WEIGHTS)
+        total = sum(weights.get(kind, 0.0) for kind in self.kinds)
+        if total <= 0:
+            raise ValueError("At least one embedding weight must be positive")
+        query_signs = {kind: pack_signs(queries[kind])[0] for kind in self.kinds}
+
+        with self._lock:
+            if positions is None:
+                # Scan the occupied rows in place rather than gathering them, then drop removed ones
+                positions = self.alive_positions()
+                if len(positions) <= n:
+                    return positions
+                scores = self._sign_scores(self._signs[:self._size], query_signs, weights, total)
+                scores = scores[positions]
+            else:
+                if len(positions) <= n:
+                    return positions
+                scores = self._sign_scores(self._signs[positions], query_signs, weights, total)
+        return positions[np.argpartition(-scores, n - 1)[:n]]
+
+    def _sign_scores(
+        self,
+        signs: np.ndarray,
+        query_signs: Mapping[str, np.ndarray],
+        weights: Mapping[str, float],
+        total: float
+    ) -> np.ndarray:
+        scores = np.zeros(len(signs), dtype=np.float32)
+        for kind in self.kinds:
+            weight = weights.get(kind, 0.0) / total
+            if weight <= 0:
+                continue
+            part = self._sign_slices[kind]
+            dim = self._slices[kind].stop - self._slices[kind].start
+            for start in range(0, len(signs), SIGN_SCAN_BLOCK):
+                distances = hamming_distances(signs[start:start + SIGN_SCAN_BLOCK, part], query_signs[kind])
+                scores[start:start + SIGN_SCAN_BLOCK] += np.float32(weight) * (1.0 - 2.0 * distances / dim).astype(np.float32)
+        return scores
+
+    def search(
+        self,
+        queries: Mapping[str, np.ndarray],
+        k: int,
+        positions: Optional[np.ndarray] = None,
+        weights: Optional[Mapping[str, float]] = None,
+        rerank_depth: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Top ``k`` (candidate_id, score) pairs among ``positions`` (all live rows by default).
+        With ``rerank_depth`` only the rerank_depth (at least k) rows shortlisted by
+        prefilter are scored exactly.
+        """
+        if not self._positions:
+            return []
+        if rerank_depth is not None:
+            positions = self.prefilter(queries, max(rerank_depth, k), positions, weights)
+        ids, scores = self.score(queries, positions, weights)
+        return top_k(ids, scores, k)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the backing arrays geometrically so single inserts stay amortized O(dim)."""
+        current = len(self._ids)
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, current * 2, 16)
+        matrix = np.zeros((new_capacity, self._matrix.shape[1]), dtype=self._dtype)
+        matrix[:current] = self._matrix
+        self._matrix = matrix
+        scales = np.ones((new_capacity, len(self.kinds)), dtype=np.float32)
+        scales[:current] = self._scales
+        self._scales = scales
+        signs = np.zeros((new_capacity, self._signs.shape[1]), dtype=np.uint64)
+        signs[:current] = self._signs
+        self._signs = signs
+        self._ids = np.resize(self._ids, new_capacity)
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:current] = self._alive
+        self._alive = alive
@@ -0,0 +1,94 @@
+import threading
+import types
+import pytest
+import app.services.lexical_index as lexical_index
+import app.services.skill_index as skill_index
+import app.services.vector_index as vector_index
+from app.services.candidate_hydration import hydrated_candidates
+from app.services.embedding_reducer import set_embedding_reducer
+from app.services.search_cache import query_results
+
+# PostgREST returns at most this many rows per request, whatever range is asked for
+MAX_ROWS = 1000
+
+
+class FakeQuery:
+    """The subset of the PostgREST query builder the services use, over in-memory rows."""
+
+    def __init__(self, client: 'FakeSupabase', table: str):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.order_by = []
+        self.window = (0, MAX_ROWS - 1)
+
+    def select(self, columns: str = '*') -> 'FakeQuery':
+        return self
+
+    def eq(self, column: str, value) -> 'FakeQuery':
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column: str, values) -> 'FakeQuery':
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def ilike(self, column: str, pattern: str) -> 'FakeQuery':
+        needle = pattern.strip('%').lower()
+        self.filters.append(lambda row: needle in (row.get(column) or '').lower())
+        return self
+
+    def order(self, column: str, desc: bool = False) -> 'FakeQuery':
+        self.order_by.append(column)
+        return self
+
+    def range(self, start: int, end: int) -> 'FakeQuery':
+        self.window = (start, end)
+        return self
+
+    def limit(self, count: int) -> 'FakeQuery':
+        self.window = (0, count - 1)
+        return self
+
+    def execute(self):
+        self.client.requests.append(self.table)
+        rows = [row for row in self.client.tables.get(self.table, []) if all(f(row) for f in self.filters)]
+        for column in reversed(self.order_by):
+            rows.sort(key=lambda row: row[column])
+        start, end = self.window
+        end = min(end, start + MAX_ROWS - 1)
+        return types.SimpleNamespace(data=[dict(row) for row in rows[start:end + 1]])
+
+
+class FakeSupabase:
+    def __init__(self, **tables):
+        self.tables = tables
+        self.requests = []
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+class BlockingSupabase(FakeSupabase):
+    """Holds every request until ``release`` is set, to observe a refresh in flight."""
+
+    def __init__(self, **tables):
+        super().__init__(**tables)
+        self.release = threading.Event()
+        self.release.set()
+
+    def table(self, name: str):
+        self.release.wait(5)
+        return super().table(name)
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    """Every test loads its own indexes and starts with empty result caches."""
+    monkeypatch.setattr(vector_index, '_candidate_index', None)
+    monkeypatch.setattr(skill_index, '_skill_index', None)
+    monkeypatch.setattr(lexical_index, '_lexical_index', None)
+    set_embedding_reducer(None)
+    query_results.invalidate()
+    hydrated_candidates.clear()
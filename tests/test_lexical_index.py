@@ -0,0 +1,35 @@
+import threading
+from app.services.lexical_index import LEXICAL_INDEX_REFRESH_SECONDS, BM25Index, get_lexical_index
+from conftest import BlockingSupabase
+
+
+def join_refresh() -> None:
+    for thread in threading.enumerate():
+        if thread.name == 'lexical-index-refresh':
+            thread.join(5)
+
+
+def test_stale_index_is_served_while_refreshing_and_keeps_writes():
+    supabase = BlockingSupabase(candidates=[
+        {'id': 1, 'cv_text': 'python developer'},
+        {'id': 2, 'cv_text': 'java developer'}
+    ])
+    first = get_lexical_index(supabase)
+    assert first.matching_ids('python').tolist() == [1]
+
+    first.loaded_at -= LEXICAL_INDEX_REFRESH_SECONDS + 1
+    supabase.release.clear()
+    assert get_lexical_index(supabase) is first
+
+    # Writes made during the refresh land on the stale index and are replayed onto the fresh one
+    first.upsert(3, BM25Index.document_terms('python engineer'))
+    first.upsert(2, BM25Index.document_terms('go developer'))
+    first.remove(1)
+    supabase.release.set()
+    join_refresh()
+
+    fresh = get_lexical_index(supabase)
+    assert fresh is not first
+    assert fresh.matching_ids('python').tolist() == [3]
+    assert fresh.matching_ids('java').tolist() == []
+    assert len(fresh) == 2
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from app.services.search_service import RANKED_RESULTS_LIMIT, SearchService
+from app.services.candidate_hydration import VIEW_SUMMARY
+from conftest import MAX_ROWS, FakeSupabase
+
+DIMS = 8
+
+
+@pytest.fixture
+def supabase() -> FakeSupabase:
+    """2500 candidates: 1800 in Berlin, 1200 of them with a Master's degree."""
+    rng = np.random.default_rng(0)
+    candidates, education = [], []
+    for candidate_id in range(1, 2501):
+        candidates.append({
+            'id': candidate_id,
+            'full_name': f'Candidate {candidate_id}',
+            'location': 'Berlin' if candidate_id <= 1800 else 'Paris',
+            'cv_text': 'python developer' if candidate_id % 2 else 'java developer',
+            'experience_embedding': rng.normal(size=DIMS).tolist(),
+            'skills_embedding': rng.normal(size=DIMS).tolist()
+        })
+        if candidate_id <= 1200:
+            education.append({'id': candidate_id, 'candidate_id': candidate_id, 'degree': 'Master'})
+    return FakeSupabase(candidates=candidates, education=education)
+
+
+def query_embeddings():
+    rng = np.random.default_rng(1)
+    return rng.normal(size=DIMS).tolist(), rng.normal(size=DIMS).tolist()
+
+
+def test_filters_read_every_page_of_matches(supabase):
+    candidate_ids = SearchService(supabase)._filter_candidate_ids(location='berlin')
+
+    assert len(candidate_ids) == 1800 > MAX_ROWS
+
+    candidate_ids = SearchService(supabase)._filter_candidate_ids(location='berlin', education_level='Master')
+
+    assert candidate_ids == set(range(1, 1201))
+
+
+def test_semantic_page_total_counts_every_filtered_match(supabase):
+    page = SearchService(supabase).semantic_search_page(
+        'backend engineer',
+        location='berlin',
+        limit=10,
+        query_embeddings=query_embeddings(),
+        view=VIEW_SUMMARY
+    )
+
+    assert page.total == 1800
+    assert len(page.results) == 10
+    assert all(result.location == 'Berlin' for result in page.results)
+    assert page.next_cursor is not None
+
+
+def test_ranking_stops_at_the_limit_but_total_does_not(supabase):
+    service = SearchService(supabase)
+    cursor, seen = None, []
+    while True:
+        page = service.semantic_search_page(
+            'backend engineer',
+            location='berlin',
+            limit=250,
+            cursor=cursor,
+            query_embeddings=query_embeddings(),
+            view=VIEW_SUMMARY
+        )
+        seen.extend(result.id for result in page.results)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert page.total == 1800
+    assert len(seen) == len(set(seen)) == RANKED_RESULTS_LIMIT
+
+
+def test_lexical_page_total_counts_filtered_term_matches(supabase):
+    page = SearchService(supabase).semantic_search_page(
+        'python',
+        location='berlin',
+        education_level='Master',
+        mode='lexical',
+        view=VIEW_SUMMARY
+    )
+
+    assert page.total == 600
+
+
+def test_filter_candidates_applies_education_in_memory(supabase):
+    results = SearchService(supabase).filter_candidates(
+        location='berlin',
+        education_level='Master',
+        limit=10,
+        offset=1195,
+        view=VIEW_SUMMARY
+    )
+
+    assert [result.id for result in results] == [1196, 1197, 1198, 1199, 1200]
+
+
+def test_filter_pages_share_one_cached_match_list(supabase):
+    service = SearchService(supabase)
+    first = service.filter_candidates(location='berlin', limit=10, offset=0, view=VIEW_SUMMARY)
+    requests = len(supabase.requests)
+
+    second = service.filter_candidates(location='berlin', limit=10, offset=10, view=VIEW_SUMMARY)
+
+    assert [result.id for result in first] == list(range(1, 11))
+    assert [result.id for result in second] == list(range(11, 21))
+    # Only the hydration of the second page reached Supabase
+    assert supabase.requests[requests:] == ['candidates']
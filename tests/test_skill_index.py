@@ -0,0 +1,56 @@
+import threading
+import app.services.skill_index as skill_index
+from app.services.skill_index import SKILL_INDEX_REFRESH_SECONDS, get_skill_index
+from conftest import BlockingSupabase
+
+
+def make_supabase() -> BlockingSupabase:
+    return BlockingSupabase(
+        skills=[{'id': 1, 'name': 'python'}, {'id': 2, 'name': 'sql'}],
+        candidate_skills=[
+            {'candidate_id': 1, 'skill_id': 1},
+            {'candidate_id': 2, 'skill_id': 1},
+            {'candidate_id': 2, 'skill_id': 2}
+        ]
+    )
+
+
+def test_stale_index_is_served_while_refreshing_and_keeps_writes():
+    supabase = make_supabase()
+    first = get_skill_index(supabase)
+    assert first.candidates_with_all(['python', 'sql']).tolist() == [2]
+
+    first.loaded_at -= SKILL_INDEX_REFRESH_SECONDS + 1
+    supabase.release.clear()
+    assert get_skill_index(supabase) is first
+
+    # Writes made during the refresh land on the stale index and are replayed onto the fresh one
+    first.add_candidate_skills(3, ['sql'])
+    first.set_candidate_skills(2, ['python'])
+    first.remove_candidate(1)
+    supabase.release.set()
+    for thread in threading.enumerate():
+        if thread.name == 'skill-index-refresh':
+            thread.join(5)
+
+    fresh = get_skill_index(supabase)
+    assert fresh is not first
+    assert fresh.candidates_with_any(['sql']).tolist() == [3]
+    assert fresh.candidates_with_any(['python']).tolist() == [2]
+
+
+def test_failed_refresh_keeps_serving_the_stale_index(monkeypatch):
+    supabase = make_supabase()
+    first = get_skill_index(supabase)
+    first.loaded_at -= SKILL_INDEX_REFRESH_SECONDS + 1
+
+    def fail(self, supabase):
+        raise RuntimeError('supabase down')
+    monkeypatch.setattr(skill_index.SkillIndex, 'load_from_supabase', fail)
+    get_skill_index(supabase)
+    for thread in threading.enumerate():
+        if thread.name == 'skill-index-refresh':
+            thread.join(5)
+
+    assert skill_index._skill_index is first
+    assert first._journal is None
@@ -0,0 +1,57 @@
+import numpy as np
+from app.services.vector_index import EXHAUSTIVE_SHARE, CandidateVectorIndex
+
+
+def build_index(n_rows: int = 4000, dims: int = 16, n_probe: int = 1) -> CandidateVectorIndex:
+    rng = np.random.default_rng(0)
+    index = CandidateVectorIndex(n_lists=64, n_probe=n_probe)
+    index.build(
+        list(range(1, n_rows + 1)),
+        rng.normal(size=(n_rows, dims)).astype(np.float32),
+        rng.normal(size=(n_rows, dims)).astype(np.float32)
+    )
+    return index
+
+
+def query(dims: int = 16) -> np.ndarray:
+    return np.random.default_rng(1).normal(size=dims).astype(np.float32)
+
+
+def test_probe_widens_until_k_candidates_are_found():
+    index = build_index()
+    q = query()
+    k = 500
+    assert k * EXHAUSTIVE_SHARE < len(index)
+    # A single probed list per embedding holds far fewer than k candidates
+    single = np.union1d(
+        index._ivf['experience_embedding'].probe(q / np.linalg.norm(q), 1),
+        index._ivf['skills_embedding'].probe(q / np.linalg.norm(q), 1)
+    )
+    assert len(single) < k
+
+    results = index.search(q, q, k=k)
+
+    assert len(results) == k
+    assert len({candidate_id for candidate_id, _ in results}) == k
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_probe_skips_removed_candidates_when_widening():
+    index = build_index(n_rows=1000)
+    for candidate_id in range(1, 901):
+        index.remove(candidate_id)
+
+    results = index.search(query(), query(), k=50)
+
+    assert len(results) == 50
+    assert all(candidate_id > 900 for candidate_id, _ in results)
+
+
+def test_large_k_scores_the_whole_pool():
+    index = build_index()
+    q = query()
+
+    results = index.search(q, q, k=len(index) // EXHAUSTIVE_SHARE)
+
+    assert results == index.search(q, q, k=len(index) // EXHAUSTIVE_SHARE, exhaustive=True)